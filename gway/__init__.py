@@ -4,7 +4,7 @@
 
 from .gateway import Gateway, gw, PREFIXES
 from .console import cli_main, process, load_recipe
-from .sigils import Sigil, Resolver, Spool, __
+from .sigils import Sigil, Resolver, Spool, CompiledSigil, __
 from .structs import Results
 from .logging import setup_logging
 from ._env_bindings import resolve_env_bindings
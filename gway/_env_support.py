@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Dict
+import threading
+from typing import Dict, Tuple
 
 __all__ = [
     "get_base_client",
@@ -15,6 +16,13 @@ __all__ = [
 
 _LOGGER = logging.getLogger("gway.envs")
 
+# Parsed env files keyed by path, validated against (mtime_ns, size).
+_parsed: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+# What load_env last applied per (env_type, name, env_dir): the stamps of
+# the files involved and the primary values written to ``os.environ``.
+_applied: Dict[Tuple[str, str, str], tuple] = {}
+_lock = threading.Lock()
+
 
 def get_base_client() -> str:
     """Return the default client name, falling back to ``guest``.
@@ -56,13 +64,38 @@ def get_base_server() -> str:
     return os.environ.get("SERVER") or "localhost"
 
 
+def _stamp(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def parse_env_file(env_file: str) -> Dict[str, str]:
     """Return the key/value pairs contained in ``env_file``.
 
     Missing files simply return an empty mapping.  Any I/O errors are logged at
     ``WARNING`` level so that environment loading never aborts the process.
+    Results are cached until the file's mtime or size changes.
     """
 
+    return dict(_parse_cached(env_file, _stamp(env_file)))
+
+
+def _parse_cached(env_file: str, stamp) -> Dict[str, str]:
+    if stamp is None:
+        return {}
+    cached = _parsed.get(env_file)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    env_vars = _read_env_file(env_file)
+    with _lock:
+        _parsed[env_file] = (stamp, env_vars)
+    return env_vars
+
+
+def _read_env_file(env_file: str) -> Dict[str, str]:
     env_vars: Dict[str, str] = {}
     try:
         with open(env_file, "r", encoding="utf-8") as handle:
@@ -80,14 +113,10 @@ def parse_env_file(env_file: str) -> Dict[str, str]:
     return env_vars
 
 
-def _merge_base_environment(
-    env_type: str,
-    env_dir: str,
-    primary_env: Dict[str, str],
-) -> None:
+def _base_env_file(env_type: str, env_dir: str, primary_env: Dict[str, str]):
     base_env_name = primary_env.get("BASE_ENV")
     if not base_env_name:
-        return
+        return None
 
     base_env_file = os.path.join(env_dir, f"{base_env_name.lower()}.env")
     if not os.path.isfile(base_env_file):
@@ -98,10 +127,8 @@ def _merge_base_environment(
             base_env_name,
             base_env_file,
         )
-        return
-
-    for key, value in parse_env_file(base_env_file).items():
-        os.environ.setdefault(key, value)
+        return None
+    return base_env_file
 
 
 def load_env(env_type: str, name: str, env_root: str) -> None:
@@ -114,20 +141,46 @@ def load_env(env_type: str, name: str, env_root: str) -> None:
     assert env_type in {"client", "server"}, "env_type must be 'client' or 'server'"
 
     env_dir = os.path.join(env_root, f"{env_type}s")
-    os.makedirs(env_dir, exist_ok=True)
-
     env_file = os.path.join(env_dir, f"{name.lower()}.env")
-    if not os.path.isfile(env_file):
+    stamp = _stamp(env_file)
+    applied_key = (env_type, name, env_dir)
+
+    # Already in effect: same files, and os.environ still holds the values.
+    applied = _applied.get(applied_key)
+    if (
+        applied is not None
+        and stamp is not None
+        and applied[0] == stamp
+        and os.environ.get(env_type.upper()) == name
+        and all(os.environ.get(k) == v for k, v in applied[2].items())
+    ):
+        base_env_file, base_stamp = applied[1]
+        if base_env_file is None or _stamp(base_env_file) == base_stamp:
+            return
+
+    if stamp is None:
+        os.makedirs(env_dir, exist_ok=True)
         try:
             open(env_file, "a", encoding="utf-8").close()
         except OSError as exc:
             _LOGGER.warning("Unable to create %s file %s: %s", env_type, env_file, exc)
             return
-
-    primary_env = parse_env_file(env_file)
-    _merge_base_environment(env_type, env_dir, primary_env)
+        stamp = _stamp(env_file)
+
+    primary_env = _parse_cached(env_file, stamp)
+    base_env_file = _base_env_file(env_type, env_dir, primary_env)
+    base_stamp = None
+    if base_env_file is not None:
+        base_stamp = _stamp(base_env_file)
+        for key, value in _parse_cached(base_env_file, base_stamp).items():
+            os.environ.setdefault(key, value)
+    elif primary_env.get("BASE_ENV"):
+        # Watch for the declared base file showing up later.
+        base_env_file = os.path.join(env_dir, f"{primary_env['BASE_ENV'].lower()}.env")
 
     for key, value in primary_env.items():
         os.environ[key] = value
 
     os.environ[env_type.upper()] = name
+    with _lock:
+        _applied[applied_key] = (stamp, (base_env_file, base_stamp), dict(primary_env))
@@ -1,6 +1,5 @@
 import inspect
 import textwrap
-import ast
 import os
 import sqlite3
 __all__ = [
@@ -16,29 +15,6 @@ def help(*args, full: bool = False, list_flags: bool = False):
         return {"Test Flags": _list_flags()}
     gw.info(f"Help on {' '.join(args)} requested")
 
-    def extract_gw_refs(source: str):
-        refs = set()
-        try:
-            tree = ast.parse(source)
-        except SyntaxError:
-            return refs
-
-        class GwVisitor(ast.NodeVisitor):
-            def visit_Attribute(self, node):
-                parts = []
-                cur = node
-                while isinstance(cur, ast.Attribute):
-                    parts.append(cur.attr)
-                    cur = cur.value
-                if isinstance(cur, ast.Name) and cur.id == "gw":
-                    parts.append("gw")
-                    full_attr = ".".join(reversed(parts))[3:]
-                    refs.add(full_attr)
-                self.generic_visit(node)
-
-        GwVisitor().visit(tree)
-        return refs
-
     db_path = gw.resource("data", "help.sqlite")
     if not os.path.isfile(db_path):
         gw.help_db.build()
@@ -51,6 +27,7 @@ def help(*args, full: bool = False, list_flags: bool = False):
         cur0 = conn.cursor()
         cur0.execute("SELECT 1 FROM param_types LIMIT 1")
         cur0.execute("SELECT tests FROM help LIMIT 1")
+        cur0.execute("SELECT 1 FROM refs LIMIT 1")
     except sqlite3.OperationalError:
         gw.help_db.build(update=True)
         gw.sql.close_db(datafile=db_path)
@@ -118,8 +95,12 @@ def help(*args, full: bool = False, list_flags: bool = False):
                 "Project": project,
                 "Function": function,
                 "Sample CLI": prefix,
-                "References": sorted(extract_gw_refs(row["source"])),
             }
+            cur.execute(
+                "SELECT ref FROM refs WHERE project=? AND function=? ORDER BY ref",
+                (project, function),
+            )
+            entry["References"] = [r["ref"] for r in cur.fetchall()]
             cur.execute(
                 "SELECT name, type FROM param_types WHERE project=? AND function=?",
                 (project, function),
@@ -6,6 +6,7 @@ __all__ = [
     "run_recipe",
     "run",
     "repeat",
+    "benchmark_recipe",
 ]
 
 
@@ -130,3 +131,56 @@ def repeat(*, rest: float = 5.0, times: int | None = None) -> _RepeatDirective:
         extra={"rest": rest_value, "times": times_value},
     )
     return _RepeatDirective(rest=rest_value, times=times_value)
+
+
+def benchmark_recipe(recipe: str = "rfid_lcd_loop", *, loops: int = 10_000, cold_loops: int = 100):
+    """Time the per-loop dispatch cost of a recipe with and without caches.
+
+    Each loop loads the recipe, resolves every command and parses its
+    arguments without calling anything, so hardware-bound recipes such as
+    ``rfid_lcd_loop`` can be measured anywhere. The cold pass clears the
+    console caches before every loop, as happened before they existed.
+    """
+    import time
+    from gway import gw
+    from ..console import (
+        build_func_parser,
+        clear_caches,
+        join_unquoted_kwargs,
+        load_recipe,
+        normalize_token,
+    )
+    from ..routing import ROUTES
+
+    def dispatch():
+        commands, _ = load_recipe(recipe)
+        for entry in commands:
+            tokens = entry.get("tokens")
+            if not tokens:
+                continue
+            obj, args, path, _ = ROUTES.resolve(
+                gw, join_unquoted_kwargs(list(tokens)), normalize_token
+            )
+            if callable(obj):
+                build_func_parser(obj, ".".join(path)).parse_known_args(args)
+
+    def measure(count, cold):
+        start = time.perf_counter()
+        for _ in range(count):
+            if cold:
+                clear_caches()
+            dispatch()
+        return (time.perf_counter() - start) / max(count, 1)
+
+    clear_caches()
+    cold = measure(cold_loops, True)
+    warm = measure(loops, False)
+    result = {
+        "recipe": recipe,
+        "loops": loops,
+        "cold_ms": round(cold * 1000, 4),
+        "cached_ms": round(warm * 1000, 4),
+        "speedup": round(cold / warm, 1) if warm else None,
+    }
+    gw.info(f"[benchmark_recipe] {result}")
+    return result
@@ -114,32 +114,9 @@ def _looks_like_command(tokens: List[str]) -> bool:
         return False
 
     from gway import gw
+    from gway.routing import ROUTES
 
-    obj = gw
-    remaining = list(chunk)
-    path: list[str] = []
-
-    while remaining:
-        token = remaining[0]
-        normalized = normalize(token)
-        try:
-            obj = getattr(obj, normalized)
-            path.append(remaining.pop(0))
-            continue
-        except AttributeError:
-            matched = False
-            for size in range(len(remaining), 0, -1):
-                joined = "_".join(normalize(part) for part in remaining[:size])
-                try:
-                    obj = getattr(obj, joined)
-                    path.extend(remaining[:size])
-                    remaining = remaining[size:]
-                    matched = True
-                    break
-                except AttributeError:
-                    continue
-            if not matched:
-                break
+    obj, _, path, _ = ROUTES.resolve(gw, chunk, normalize)
 
     if callable(obj) and path:
         return True
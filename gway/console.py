@@ -10,18 +10,24 @@ import argparse
 import argcomplete
 import csv
 import difflib
+import functools
 import re
+import threading
+import weakref
 from concurrent.futures import ThreadPoolExecutor
 from typing import get_origin, get_args, Literal, Union, get_type_hints
 from types import UnionType
 
 from . import units
 
-from .logging import setup_logging
+from .logging import LOG_FORMATS, setup_logging
 from .builtins import abort
-from .builtins.recipes import _RepeatDirective
+from .builtins.recipes import _RepeatDirective, repeat as _repeat
 from .gateway import Gateway, gw
-from .sigils import Sigil, Spool, _replace_sigils
+from .routing import ROUTES
+from .profiling import PROFILER
+from .dag import DEFAULT_WORKERS, Node, default_sigils, link, run_graph, sigil_keys
+from .sigils import Sigil, Spool, compile_sigil, normalize_key
 
 
 def _should_enable_argcomplete(environ: dict[str, str] | None = None) -> bool:
@@ -130,6 +136,11 @@ def _format_unused_context(unused: dict[str, object]) -> str:
 
 def cli_main():
     """Main CLI entry point."""
+    with PROFILER.phase("cli"):
+        return _cli_main()
+
+
+def _cli_main():
     parser = argparse.ArgumentParser(prog="gway", description="Dynamic Project CLI", add_help=False)
 
     # Primary behavior flags
@@ -150,6 +161,15 @@ def cli_main():
         action="append",
         help="Execute one or more GWAY recipe (.gwr/.md) files.",
     )
+    add(
+        "--parallel",
+        dest="parallel",
+        type=int,
+        nargs="?",
+        const=DEFAULT_WORKERS,
+        metavar="N",
+        help="Run recipe lines that share no results concurrently on N threads.",
+    )
     add(
         "--section",
         dest="section",
@@ -162,6 +182,19 @@ def cli_main():
     add("-v", dest="verbose", action="store_true", help="Verbose mode (where supported)")
     add("-w", dest="wizard", action="store_true", help="Wizard mode.")
     add("-z", dest="silent", action="store_true", help="Suppress all non-critical output")
+    add(
+        "--log-format",
+        dest="log_format",
+        choices=LOG_FORMATS,
+        default=os.environ.get("GWAY_LOG_FORMAT", "text"),
+        help="Write the log file as text lines or JSON lines (env GWAY_LOG_FORMAT).",
+    )
+    add(
+        "--profile-startup",
+        dest="profile_startup",
+        action="store_true",
+        help="Profile imports and startup phases of the given command",
+    )
     if _should_enable_argcomplete():
         argcomplete.autocomplete(parser)
     def _print_main_help() -> None:
@@ -170,7 +203,17 @@ def cli_main():
         parser.print_help()
         print(file=sys.stdout)
 
-    args, unknown = parser.parse_known_args()
+    with PROFILER.phase("argparse"):
+        args, unknown = parser.parse_known_args()
+
+    if args.profile_startup:
+        from .profiling import profile_startup
+
+        argv = [arg for arg in sys.argv[1:] if arg != "--profile-startup"]
+        summary = profile_startup(argv)
+        print(f"Startup report: {summary['report']}", file=sys.stderr)
+        print(f"Flamegraph stacks: {summary['folded']}", file=sys.stderr)
+        sys.exit(summary["returncode"])
 
     recipe_args: list[str] = []
     if args.recipes:
@@ -189,27 +232,31 @@ def cli_main():
 
     # Setup logging
     logfile = f"{args.username}.log" if args.username else "gway.log"
-    setup_logging(
-        logfile=logfile,
-        loglevel="DEBUG" if args.debug else "INFO",
-        debug=args.debug,
-        verbose=args.verbose
-    )
+    with PROFILER.phase("logging setup"):
+        setup_logging(
+            logfile=logfile,
+            loglevel="DEBUG" if args.debug else "INFO",
+            debug=args.debug,
+            verbose=args.verbose,
+            log_format=args.log_format,
+            background=True,
+        )
     start_time = time.time() if args.timed else None
     
     # Init Gateway instance
-    gw_local = Gateway(
-        client=args.client,
-        server=args.server,
-        verbose=args.verbose,
-        silent=args.silent,
-        name=args.username or "gw",
-        project_path=args.projects,
-        debug=args.debug,
-        wizard=args.wizard,
-        interactive=args.interactive,
-        timed=args.timed
-    )
+    with PROFILER.phase("gateway init"):
+        gw_local = Gateway(
+            client=args.client,
+            server=args.server,
+            verbose=args.verbose,
+            silent=args.silent,
+            name=args.username or "gw",
+            project_path=args.projects,
+            debug=args.debug,
+            wizard=args.wizard,
+            interactive=args.interactive,
+            timed=args.timed
+        )
 
     gw_local.verbose(
         f"Saving detailed logs to [BASE_PATH]/logs/gway.log (this file)"
@@ -232,6 +279,8 @@ def cli_main():
         run_kwargs['wizard'] = True
     if args.timed:
         run_kwargs['timed'] = True
+    if args.parallel:
+        run_kwargs['parallel'] = args.parallel
     run_kwargs.update(extra_context)
 
     if args.section and not recipe_args:
@@ -334,18 +383,29 @@ def cli_main():
         suffix = f" -> {context_text}" if context_text else ""
         print(f"Nothing to do.{suffix}")
 
-def process(command_sources, callback=None, *, origin="line", gw_instance=None, **context):
-    """Shared logic for executing CLI or recipe commands with optional per-node callback."""
+def process(command_sources, callback=None, *, origin="line", gw_instance=None, parallel=None, **context):
+    """Shared logic for executing CLI or recipe commands with optional per-node callback.
+
+    With ``parallel`` (``True`` or a thread count) lines that share no
+    results run concurrently; see :mod:`gway.dag`.
+    """
+    from gway import gw as _global_gw
+
+    gw = gw_instance or (_global_gw.child(**context) if context else _global_gw)
+    with gw._activate():
+        return _process(
+            command_sources, callback, origin=origin, gw=gw, parallel=parallel, **context
+        )
+
+
+def _process(command_sources, callback, *, origin, gw, parallel, **context):
     import argparse
-    from gway import gw as _global_gw, Gateway
     from .builtins import abort
 
     all_results: list = []
     last_result = None
     executed_chunks: list[list[str]] = []
 
-    gw = gw_instance or (Gateway(**context) if context else _global_gw)
-
     if context:
         sanitized_context = {k: v for k, v in context.items() if v is not None}
         if sanitized_context:
@@ -415,51 +475,25 @@ def process(command_sources, callback=None, *, origin="line", gw_instance=None,
         callers surface import failures instead of showing a generic 'No project'
         message.
         """
-        path = []
-        obj = root
-        last_error = None
-
-        while tokens:
-            original = tokens[0]
-            normalized = normalize_token(original)
-            try:
-                obj = getattr(obj, normalized)
-                path.append(tokens.pop(0))
-                continue
-            except AttributeError as e:
-                last_error = e
-
-                if wizard_prompts:
-                    candidates = [a for a in dir(obj) if not a.startswith("_")]
-                    guess = difflib.get_close_matches(normalized, candidates, n=1)
-                    if guess:
-                        resp = input(
-                            f"Unrecognized name '{original}'. Did you mean '{guess[0]}'? [Y/n] "
-                        ).strip().lower()
-                        if resp in ("", "y", "yes"):
-                            obj = getattr(obj, guess[0])
-                            path.append(guess[0])
-                            tokens.pop(0)
-                            continue
-                        abort(
-                            f"Aborted on uncertain name '{original}'. Please be more specific."
-                        )
-
-            # Try to resolve composite function names from remaining tokens
-            for i in range(len(tokens), 0, -1):
-                joined = "_".join(normalize_token(t) for t in tokens[:i])
-                try:
-                    obj = getattr(obj, joined)
-                    path.extend(tokens[:i])
-                    tokens[:] = tokens[i:]
-                    return obj, tokens, path, last_error
-                except AttributeError as e:
-                    last_error = e
-                    continue
-            break  # No match found; exit lookup loop
-
+        on_miss = _suggest_name if wizard_prompts else None
+        obj, remaining, path, last_error = ROUTES.resolve(
+            root, tokens, normalize_token, on_miss
+        )
+        tokens[:] = remaining
         return obj, tokens, path, last_error
 
+    def _suggest_name(obj, original, normalized):
+        candidates = [a for a in dir(obj) if not a.startswith("_")]
+        guess = difflib.get_close_matches(normalized, candidates, n=1)
+        if not guess:
+            return None
+        resp = input(
+            f"Unrecognized name '{original}'. Did you mean '{guess[0]}'? [Y/n] "
+        ).strip().lower()
+        if resp in ("", "y", "yes"):
+            return getattr(obj, guess[0]), guess[0]
+        abort(f"Aborted on uncertain name '{original}'. Please be more specific.")
+
     def _coerce_chunk(entry):
         python_code = None
         if isinstance(entry, dict):
@@ -486,12 +520,101 @@ def process(command_sources, callback=None, *, origin="line", gw_instance=None,
             return value
 
         try:
-            return _replace_sigils(text, lookup)
+            return compile_sigil(text).resolve(lookup)
         except Exception:
             return text
 
     print_comments = origin == "recipe"
 
+    def _apply_callback(tokens, python_code):
+        """Return the tokens to run, or ``None`` to skip the chunk."""
+        callback_target = list(tokens) if tokens else (["<python>"] if python_code is not None else [])
+        callback_result = callback(callback_target)
+        if callback_result is False:
+            gw.debug(f"Skipping chunk due to callback: {callback_target}")
+            return None
+        elif isinstance(callback_result, list):
+            gw.debug(f"Callback replaced chunk: {callback_result}")
+            return list(callback_result)
+        elif callback_result is None or callback_result is True:
+            return tokens
+        abort(f"Invalid callback return value for chunk: {callback_result}")
+
+    def plan_graph(entries):
+        """Build the dependency graph of *entries*, or return ``None`` when
+        they have to run in order (``repeat`` replays earlier lines)."""
+        nodes = []
+        project, project_name = last_project, last_project_name
+        for entry in entries:
+            entry = dict(entry)
+            tokens, comment_text, python_code = entry["tokens"], entry["comment"], entry["python"]
+            comment = [str(comment_text)] if print_comments and comment_text else []
+            if python_code is not None:
+                nodes.append(Node(len(nodes), entry, barrier=True))
+                continue
+            if not tokens:
+                nodes.append(Node(len(nodes), entry, reads=sigil_keys(comment)))
+                continue
+
+            chunk_tokens = join_unquoted_kwargs(list(tokens))
+            obj, _, path, error = resolve_nested_object(gw, list(chunk_tokens))
+            if error is not None and not path and project is not None:
+                obj2, _, path2, error2 = resolve_nested_object(project, list(chunk_tokens))
+                if path2 or error2 is None:
+                    # Spell out the project so the line also runs on its own.
+                    obj, path, error = obj2, [project_name] + path2, error2
+                    entry["tokens"] = [project_name] + list(tokens)
+
+            if getattr(obj, "__wrapped__", None) is _repeat:
+                return None
+            call_plan = getattr(obj, "_call_plan", None) if callable(obj) else None
+            if call_plan is None or call_plan.is_builtin:
+                # Builtins, recipe fallbacks and errors keep their place.
+                nodes.append(Node(len(nodes), entry, barrier=True))
+            else:
+                subject = call_plan.subject
+                reads = sigil_keys([*chunk_tokens, *comment, *default_sigils(call_plan)])
+                if reads is not None and any(p[5] for p in call_plan.params):
+                    reads.add(normalize_key(subject))
+                writes = {normalize_key(subject)} if subject else ()
+                nodes.append(Node(len(nodes), entry, reads=reads, writes=writes))
+            if path and callable(obj):
+                project_name = path[0]
+                project = getattr(gw, normalize_token(project_name), None)
+
+        # Keys already set before the run (env, context) are not waited on.
+        return link(nodes, known=lambda key: gw.find_variant(key) is not None)
+
+    callback_applied = False
+    if parallel and not interactive_enabled:
+        entries = []
+        for raw_chunk in command_sources:
+            tokens, comment_text, python_code = _coerce_chunk(raw_chunk)
+            if not tokens and not comment_text and python_code is None:
+                continue
+            if callback:
+                tokens = _apply_callback(tokens, python_code)
+                if tokens is None:
+                    continue
+            entries.append({"tokens": tokens, "comment": comment_text, "python": python_code})
+        with PROFILER.phase("recipe graph"):
+            graph = plan_graph(entries)
+        if graph is None:
+            gw.debug("[parallel] repeat found; running lines in order")
+            command_sources, callback_applied = entries, True
+        else:
+            workers = DEFAULT_WORKERS if parallel is True else int(parallel)
+            gw.debug(f"[parallel] {len(graph)} lines on {workers} threads: {graph}")
+
+            def run_node(node):
+                return process([node.chunk], origin=origin, gw_instance=gw, **context)
+
+            for node_results, node_last in run_graph(graph, run_node, workers=workers):
+                if node_results:
+                    all_results.extend(node_results)
+                    last_result = node_last
+            return all_results, last_result
+
     for raw_chunk in command_sources:
         tokens, comment_text, python_code = _coerce_chunk(raw_chunk)
         if not tokens and not comment_text and python_code is None:
@@ -505,19 +628,10 @@ def process(command_sources, callback=None, *, origin="line", gw_instance=None,
                 print(rendered_comment)
 
         # Invoke callback if provided
-        if callback:
-            callback_target = list(tokens) if tokens else (["<python>"] if python_code is not None else [])
-            callback_result = callback(callback_target)
-            if callback_result is False:
-                gw.debug(f"Skipping chunk due to callback: {callback_target}")
+        if callback and not callback_applied:
+            tokens = _apply_callback(tokens, python_code)
+            if tokens is None:
                 continue
-            elif isinstance(callback_result, list):
-                gw.debug(f"Callback replaced chunk: {callback_result}")
-                tokens = list(callback_result)
-            elif callback_result is None or callback_result is True:
-                pass
-            else:
-                abort(f"Invalid callback return value for chunk: {callback_result}")
 
         if python_code is not None:
             local_ns = {"gw": gw}
@@ -541,21 +655,22 @@ def process(command_sources, callback=None, *, origin="line", gw_instance=None,
         chunk_tokens = list(chunk)
 
         # Resolve nested project/function path
-        resolved_obj, func_args, path, attr_error = resolve_nested_object(
-            gw, list(chunk_tokens)
-        )
-        # Retry resolution relative to the last project when the initial
-        # lookup fails without consuming any path components. This allows
-        # successive chained calls to omit the project name.
-        if attr_error is not None and not path and last_project is not None:
-            resolved_obj, func_args, path2, attr_error = resolve_nested_object(
-                last_project, list(chunk_tokens)
+        with PROFILER.phase("project resolution"):
+            resolved_obj, func_args, path, attr_error = resolve_nested_object(
+                gw, list(chunk_tokens)
             )
-            if not path2 and attr_error is not None:
-                # retain original failure if nothing could be resolved
-                pass
-            else:
-                path = [last_project_name] + path2
+            # Retry resolution relative to the last project when the initial
+            # lookup fails without consuming any path components. This allows
+            # successive chained calls to omit the project name.
+            if attr_error is not None and not path and last_project is not None:
+                resolved_obj, func_args, path2, attr_error = resolve_nested_object(
+                    last_project, list(chunk_tokens)
+                )
+                if not path2 and attr_error is not None:
+                    # retain original failure if nothing could be resolved
+                    pass
+                else:
+                    path = [last_project_name] + path2
 
         if not callable(resolved_obj):
             if attr_error is not None and not path and chunk_tokens:
@@ -594,29 +709,29 @@ def process(command_sources, callback=None, *, origin="line", gw_instance=None,
             abort(f"No project with name '{chunk_tokens[0]}'")
 
         # Parse function arguments, using parse_known_args if **kwargs present
-        func_parser = argparse.ArgumentParser(prog=".".join(path))
-        add_func_args(
-            func_parser,
-            resolved_obj,
-            interactive=interactive_enabled,
-            wizard=wizard_prompts,
-        )
+        with PROFILER.phase("function arguments"):
+            func_parser = build_func_parser(
+                resolved_obj,
+                ".".join(path),
+                interactive=interactive_enabled,
+                wizard=wizard_prompts,
+            )
 
-        var_kw_name = getattr(resolved_obj, "__var_keyword_name__", None)
-        var_pos_name = getattr(resolved_obj, "__var_positional_name__", None)
-        if var_kw_name:
-            parsed_args, unknown = func_parser.parse_known_args(func_args)
-            # stash the raw unknown tokens for prepare
-            setattr(parsed_args, var_kw_name, unknown)
-        elif var_pos_name:
-            parsed_args, unknown = func_parser.parse_known_args(func_args)
-            existing = getattr(parsed_args, var_pos_name, []) or []
-            if not isinstance(existing, list):
-                existing = list(existing)
-            existing.extend(unknown)
-            setattr(parsed_args, var_pos_name, existing)
-        else:
-            parsed_args = func_parser.parse_args(func_args)
+            var_kw_name = getattr(resolved_obj, "__var_keyword_name__", None)
+            var_pos_name = getattr(resolved_obj, "__var_positional_name__", None)
+            if var_kw_name:
+                parsed_args, unknown = func_parser.parse_known_args(func_args)
+                # stash the raw unknown tokens for prepare
+                setattr(parsed_args, var_kw_name, unknown)
+            elif var_pos_name:
+                parsed_args, unknown = func_parser.parse_known_args(func_args)
+                existing = getattr(parsed_args, var_pos_name, []) or []
+                if not isinstance(existing, list):
+                    existing = list(existing)
+                existing.extend(unknown)
+                setattr(parsed_args, var_pos_name, existing)
+            else:
+                parsed_args = func_parser.parse_args(func_args)
 
         if interactive_enabled:
             parsed_args = prompt_for_missing(
@@ -632,7 +747,8 @@ def process(command_sources, callback=None, *, origin="line", gw_instance=None,
             final_args, final_kwargs = prepare(parsed_args, resolved_obj)
 
         try:
-            result = resolved_obj(*final_args, **final_kwargs)
+            with PROFILER.phase(f"call {'.'.join(path)}"):
+                result = resolved_obj(*final_args, **final_kwargs)
             if isinstance(result, _RepeatDirective):
                 handle_repeat(result)
                 continue
@@ -679,7 +795,7 @@ def prepare(parsed_args, func_obj):
     func_kwargs = {}
     extra_kwargs = {}
 
-    sig = inspect.signature(func_obj, eval_str=True)
+    sig = _signature(func_obj)
     params = sig.parameters
     expected_names = set(params.keys())
 
@@ -761,7 +877,7 @@ def prompt_for_missing(parsed_args, func_obj, *, required_only=False):
 
     When ``required_only`` is True, optional parameters that already have
     defaults are skipped."""
-    sig = inspect.signature(func_obj, eval_str=True)
+    sig = _signature(func_obj)
 
     for name, param in sig.parameters.items():
         if param.kind in (inspect.Parameter.VAR_POSITIONAL,
@@ -881,13 +997,83 @@ def show_functions(functions: dict) -> str:
 
     return "\n".join(lines)
 
+# Per-function caches; entries go away with the function object.
+_signatures = weakref.WeakKeyDictionary()
+_parsers = weakref.WeakKeyDictionary()
+_parsers_lock = threading.Lock()
+
+
+def _signature(func_obj):
+    """``inspect.signature(func_obj, eval_str=True)``, computed once per function."""
+    try:
+        return _signatures[func_obj]
+    except (KeyError, TypeError):
+        pass
+    sig = inspect.signature(func_obj, eval_str=True)
+    try:
+        _signatures[func_obj] = sig
+    except TypeError:
+        pass
+    return sig
+
+
+def clear_caches():
+    """Forget compiled recipes, routes, signatures and argument parsers."""
+    with _parsers_lock:
+        _parsers.clear()
+        _signatures.clear()
+    with _recipes_lock:
+        _recipes.clear()
+        _recipe_paths.clear()
+    _unit_converters.cache_clear()
+    ROUTES.invalidate()
+
+
+def _has_dynamic_defaults(sig) -> bool:
+    """Whether parser defaults depend on the gateway state at build time."""
+    for param in sig.parameters.values():
+        default = param.default
+        if isinstance(default, str) and default.startswith("%[") and default.endswith("]"):
+            return True
+        if isinstance(default, (Sigil, Spool)) and getattr(default, "is_eager", False):
+            return True
+    return False
+
+
+def build_func_parser(func_obj, prog, *, interactive=False, wizard=False):
+    """Return an argument parser for *func_obj*, reusing one built before.
+
+    Parsers are cached per function object and ``(prog, interactive, wizard)``.
+    Functions whose defaults are eager sigils get a fresh parser every time so
+    those defaults still see the current context.
+    """
+    key = (prog, interactive, wizard)
+    try:
+        cached = _parsers.get(func_obj)
+    except TypeError:
+        cached = None
+    if cached is not None and key in cached:
+        return cached[key]
+
+    parser = argparse.ArgumentParser(prog=prog)
+    add_func_args(parser, func_obj, interactive=interactive, wizard=wizard)
+    if _has_dynamic_defaults(_signature(func_obj)):
+        return parser
+    with _parsers_lock:
+        try:
+            _parsers.setdefault(func_obj, {})[key] = parser
+        except TypeError:
+            pass
+    return parser
+
+
 def add_func_args(subparser, func_obj, *, interactive=False, wizard=False):
     """Add the function's arguments to the CLI subparser.
 
     ``interactive`` relaxes required parameters so they can be asked for later.
     When ``wizard`` is also True, optional parameters are treated the same way
     so the wizard can prompt for extra details."""
-    sig = inspect.signature(func_obj, eval_str=True)
+    sig = _signature(func_obj)
     try:
         hints = get_type_hints(func_obj)
     except Exception:
@@ -1069,6 +1255,7 @@ def get_arg_opts(arg_name, param, gw=None):
     return opts
 
 
+@functools.lru_cache(maxsize=None)
 def _unit_converters(param_name: str):
     """Return (alt_name, function) pairs for conversions to *param_name*."""
     suffix = f"_to_{param_name}"
@@ -1077,7 +1264,7 @@ def _unit_converters(param_name: str):
         if name.endswith(suffix) and name != suffix:
             alt = name[: -len(suffix)]
             converters.append((alt, func))
-    return converters
+    return tuple(converters)
 
 
 ...
@@ -1099,11 +1286,13 @@ def load_recipe(recipe_filename, *, strict=True, section: str | None = None):
     import os
     from gway import gw
 
-    commands: list[dict[str, object]] = []
-    comments: list[str] = []
     recipe_path = None
 
-    # --- Recipe file resolution (unchanged) ---
+    # --- Recipe file resolution ---
+    located = _recipe_paths.get((recipe_filename, os.getcwd()))
+    if located is not None and os.path.isfile(located):
+        return _compiled_recipe(located, section)
+
     if not os.path.isabs(recipe_filename):
         candidate_names = []
         base_names: list[str] = []
@@ -1158,8 +1347,46 @@ def load_recipe(recipe_filename, *, strict=True, section: str | None = None):
         if not os.path.isfile(recipe_path):
             raise FileNotFoundError(f"Recipe not found: {recipe_path}")
 
-    gw.info(f"Loading commands from recipe: {recipe_path}")
-    
+    _recipe_paths[(recipe_filename, os.getcwd())] = recipe_path
+    return _compiled_recipe(recipe_path, section)
+
+
+# Parsed recipes keyed by (absolute path, section), checked against the
+# file's mtime and size on every load.
+_recipes: dict[tuple[str, str | None], tuple] = {}
+_recipes_lock = threading.Lock()
+# Where each recipe name was found, per working directory.
+_recipe_paths: dict[tuple[str, str], str] = {}
+
+
+def _compiled_recipe(recipe_path, section):
+    """Return ``(commands, comments)`` for *recipe_path*, parsing it only when
+    the file changed since the last load."""
+    stat = os.stat(recipe_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (os.path.abspath(recipe_path), section)
+    cached = _recipes.get(key)
+    if cached is None or cached[0] != stamp:
+        gw.info(f"Loading commands from recipe: {recipe_path}")
+        commands, comments = _parse_recipe(recipe_path, section)
+        cached = (stamp, tuple(commands), tuple(comments))
+        with _recipes_lock:
+            _recipes[key] = cached
+    # Callers may edit the chunks they get back; keep the cached ones intact.
+    commands = []
+    for chunk in cached[1]:
+        chunk = dict(chunk)
+        if "tokens" in chunk:
+            chunk["tokens"] = list(chunk["tokens"])
+        commands.append(chunk)
+    return commands, list(cached[2])
+
+
+def _parse_recipe(recipe_path, section: str | None = None):
+    """Parse the commands and comments of the recipe file at *recipe_path*."""
+    commands: list[dict[str, object]] = []
+    comments: list[str] = []
+
     command_chunks: list[dict[str, object]] = []
     last_prefix = ""
     colon_prefix = None
@@ -1275,7 +1502,7 @@ def load_recipe(recipe_filename, *, strict=True, section: str | None = None):
         colon_suffix = ""
 
     def _process_stream(lines: list[str], *, markdown_enabled: bool) -> None:
-        nonlocal markdown_fence
+        nonlocal markdown_fence, colon_prefix
         continuation = None
 
         def process_line(line: str):
@@ -0,0 +1,172 @@
+# file: gway/dag.py
+
+"""Dependency graphs for running recipe lines concurrently.
+
+A recipe line *writes* the result subject of the function it calls (the key
+:meth:`Gateway.subject` derives and :meth:`Results.insert` stores) and
+*reads* every key its ``[sigils]`` refer to, plus the subject parameter the
+gateway injects from context. :func:`link` turns those sets into edges that
+keep each read after the write it needs and each write after the reads
+that must not see it; :func:`run_graph` then runs ready lines on a bounded
+thread pool and hands back their outputs in recipe order.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .sigils import Sigil, Spool, compile_sigil, normalize_key
+
+# Threads used by ``--parallel`` when no count is given.
+DEFAULT_WORKERS = 8
+
+
+class Node:
+    """One recipe line of a graph.
+
+    ``reads`` is a set of normalized keys, or ``None`` when the keys cannot
+    be known before running (computed sigils). ``barrier`` nodes wait for
+    every earlier node and every later node waits for them.
+    """
+
+    __slots__ = ("index", "chunk", "reads", "writes", "barrier", "deps")
+
+    def __init__(self, index, chunk, *, reads=(), writes=(), barrier=False):
+        self.index = index
+        self.chunk = chunk
+        self.reads = None if reads is None else set(reads)
+        self.writes = set(writes)
+        self.barrier = barrier
+        self.deps = set()
+
+    def __repr__(self):
+        return f"Node({self.index}, deps={sorted(self.deps)})"
+
+
+def _placeholder_keys(placeholder):
+    if placeholder.quoted:
+        return set()
+    if placeholder.nested is not None or placeholder.base_nested is not None:
+        return None
+    keys = {normalize_key(placeholder.parts[0])}
+    if placeholder.fallback:
+        for sub in placeholder.fallback.placeholders:
+            found = _placeholder_keys(sub)
+            if found is None:
+                return None
+            keys |= found
+    return keys
+
+
+def sigil_keys(texts):
+    """Normalized root keys referenced by ``[sigils]`` in *texts*.
+
+    Returns ``None`` if a key is itself built from a sigil.
+    """
+    keys = set()
+    for text in texts:
+        if not isinstance(text, str) or "[" not in text:
+            continue
+        for placeholder in compile_sigil(text).placeholders:
+            found = _placeholder_keys(placeholder)
+            if found is None:
+                return None
+            keys |= found
+    return keys
+
+
+def default_sigils(plan):
+    """Sigil texts used as parameter defaults in a ``_CallPlan``."""
+    texts = []
+    for param in plan.params:
+        default = param[2]
+        if isinstance(default, Spool):
+            texts.extend(s.text for s in default.sigils)
+        elif isinstance(default, Sigil):
+            texts.append(default.text)
+    return texts
+
+
+def link(nodes, known=lambda key: False):
+    """Fill in ``node.deps`` for *nodes*, given in recipe order.
+
+    A key that no earlier node writes and for which ``known(key)`` is false
+    may come from a dict result, so its reader waits for everything before
+    it.
+    """
+    last_writer = {}
+    readers = {}
+    unknown_readers = []
+    barrier = None
+    for i, node in enumerate(nodes):
+        deps = set()
+        if node.barrier or node.reads is None:
+            deps.update(range(i))
+        else:
+            if barrier is not None:
+                deps.add(barrier)
+            for key in node.reads:
+                if key in last_writer:
+                    deps.add(last_writer[key])
+                elif not known(key):
+                    deps.update(range(i))
+                    break
+        for key in node.writes:
+            deps.update(readers.get(key, ()))
+            deps.update(unknown_readers)
+            if key in last_writer:
+                deps.add(last_writer[key])
+        deps.discard(i)
+        node.deps = deps
+
+        if node.barrier:
+            barrier = i
+        if node.reads is None:
+            unknown_readers.append(i)
+        else:
+            for key in node.reads:
+                readers.setdefault(key, []).append(i)
+        for key in node.writes:
+            last_writer[key] = i
+    return nodes
+
+
+def run_graph(nodes, run, *, workers=DEFAULT_WORKERS):
+    """Call ``run(node)`` once each node's dependencies have finished.
+
+    At most *workers* nodes run at a time. Returns the outputs in node
+    order. After a failure no further nodes start; once the running ones
+    finish, the error of the earliest failed node is raised.
+    """
+    pending = {i: set(node.deps) for i, node in enumerate(nodes)}
+    dependents = {}
+    for i, node in enumerate(nodes):
+        for dep in node.deps:
+            dependents.setdefault(dep, []).append(i)
+    outputs = {}
+    errors = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers))) as pool:
+        def submit_ready():
+            for i in sorted(i for i, deps in pending.items() if not deps):
+                del pending[i]
+                running[pool.submit(run, nodes[i])] = i
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                try:
+                    outputs[i] = future.result()
+                except BaseException as e:  # abort() raises SystemExit
+                    errors[i] = e
+                    continue
+                for j in dependents.get(i, ()):
+                    if j in pending:
+                        pending[j].discard(i)
+            if not errors:
+                submit_ready()
+
+    if errors:
+        raise errors[min(errors)]
+    return [outputs[i] for i in range(len(nodes))]
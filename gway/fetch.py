@@ -0,0 +1,84 @@
+# file: gway/fetch.py
+
+"""Pooled HTTP for watchers and other repeated requests.
+
+:func:`http_session` returns one process-wide ``requests.Session`` whose
+connections are kept alive, so a watcher polling the same host does not
+pay a new TCP and TLS handshake every time.
+
+:class:`ConditionalGet` remembers the ``ETag`` and ``Last-Modified`` of a
+URL and sends them back; an unchanged resource then answers ``304 Not
+Modified`` without a body. :meth:`ConditionalGet.status` asks for the
+status only (``HEAD``, or a one byte range where HEAD is refused).
+"""
+
+import threading
+
+POOL_SIZE = 8
+TIMEOUT = 5
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    """Return the shared keep-alive ``requests.Session``."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+class ConditionalGet:
+    """Repeated GETs of one URL that skip the body when it did not change."""
+
+    def __init__(self, url, *, session=None, timeout=TIMEOUT):
+        self.url = url
+        self.session = session
+        self.timeout = timeout
+        self.etag = None
+        self.last_modified = None
+        self.head_allowed = True
+
+    def _session(self):
+        return self.session if self.session is not None else http_session()
+
+    def get(self):
+        """Return ``(response, modified)``; ``modified`` is false on ``304``."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        response = self._session().get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return response, False
+        if 200 <= response.status_code < 300:
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+        return response, True
+
+    def status(self):
+        """Return the status code without downloading the body."""
+        session = self._session()
+        if self.head_allowed:
+            response = session.head(self.url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code not in (405, 501):
+                return response.status_code
+            self.head_allowed = False
+        response = session.get(
+            self.url, headers={"Range": "bytes=0-0"}, timeout=self.timeout, stream=True
+        )
+        if response.status_code == 206:
+            response.content  # one byte; lets the connection go back to the pool
+        response.close()
+        return response.status_code
@@ -9,9 +9,10 @@ import logging
 import threading
 import importlib
 import functools
+import contextlib
+import contextvars
 import time
 from pathlib import Path
-from types import MethodType
 
 from ._env_bindings import resolve_env_bindings
 from .sigils import (
@@ -22,8 +23,12 @@ from .sigils import (
     _split_outside_brackets,
     _split_outside_brackets_once,
 )
-from .structs import Results, Project, Null
+from .structs import Results, Project, Null, IndexedDict
+from .manifest import ProjectManifest
 from .runner import Runner
+from .routing import ROUTES
+from .registry import ProjectRegistry
+from .profiling import PROFILER
 
 _ENV_BINDINGS = resolve_env_bindings()
 load_env = _ENV_BINDINGS.load_env
@@ -34,8 +39,134 @@ get_base_server = _ENV_BINDINGS.get_base_server
 PREFIXES: tuple[str, ...] = ("view_", "api_", "render_")
 
 
+_POSITIONAL = "positional"
+_VAR_POSITIONAL = "var_positional"
+_KEYWORD_ONLY = "keyword_only"
+_VAR_KEYWORD = "var_keyword"
+
+_PARAM_KINDS = {
+    inspect.Parameter.POSITIONAL_ONLY: _POSITIONAL,
+    inspect.Parameter.POSITIONAL_OR_KEYWORD: _POSITIONAL,
+    inspect.Parameter.VAR_POSITIONAL: _VAR_POSITIONAL,
+    inspect.Parameter.KEYWORD_ONLY: _KEYWORD_ONLY,
+    inspect.Parameter.VAR_KEYWORD: _VAR_KEYWORD,
+}
+
+_SENSITIVE_SUBJECT_WORDS = ("password", "secret", "token", "key")
+
+# Gateway whose mode flags (verbose, timed, debug) apply to wrapped calls in
+# the current context. Wrapped callables are shared between a gateway and its
+# children, so they cannot take the flags from the gateway that wrapped them.
+_ACTIVE_GATEWAY = contextvars.ContextVar("gway_active_gateway", default=None)
+
+
+class _CallPlan:
+    """Signature details for a wrapped function, compiled once at wrap time.
+
+    ``params`` holds one ``(name, kind, default, coercer, eager, auto_inject)``
+    tuple per parameter so calls never need :func:`inspect.signature`.
+    """
+
+    __slots__ = (
+        "signature", "params", "subject", "is_coroutine", "sensitive", "is_builtin",
+        "_positional", "_keywords", "_var_defaults", "_simple",
+    )
+
+    def __init__(self, func_obj, subject, *, is_builtin=False):
+        sig = inspect.signature(func_obj)
+        self.signature = sig
+        self.subject = subject
+        self.is_builtin = is_builtin
+        self.is_coroutine = inspect.iscoroutinefunction(func_obj)
+        self.sensitive = bool(subject) and any(
+            word in subject for word in _SENSITIVE_SUBJECT_WORDS
+        )
+
+        params = []
+        positional = []
+        keywords = set()
+        var_defaults = {}
+        for name, param in sig.parameters.items():
+            kind = _PARAM_KINDS[param.kind]
+            default = param.default
+            ann = param.annotation
+            coercer = ann if ann in (int, float, str, bool) else None
+            eager = isinstance(default, (Sigil, Spool)) and getattr(default, "is_eager", False)
+            auto_inject = subject is not None and name == subject and not is_builtin
+            params.append((name, kind, default, coercer, eager, auto_inject))
+
+            if param.kind is inspect.Parameter.VAR_POSITIONAL:
+                var_defaults[name] = ()
+            elif param.kind is inspect.Parameter.VAR_KEYWORD:
+                var_defaults[name] = {}
+            else:
+                if kind is _POSITIONAL:
+                    positional.append(name)
+                if param.kind is not inspect.Parameter.POSITIONAL_ONLY:
+                    keywords.add(name)
+
+        self.params = tuple(params)
+        self._positional = tuple(positional)
+        self._keywords = frozenset(keywords)
+        self._var_defaults = var_defaults
+        # Without *args/**kwargs a call maps straight onto parameter names.
+        self._simple = not var_defaults
+
+    def bind(self, args, kwargs):
+        """Return a ``{name: value}`` mapping of the explicitly passed arguments."""
+        if (
+            self._simple
+            and len(args) <= len(self._positional)
+            and self._keywords.issuperset(kwargs)
+        ):
+            arguments = dict(zip(self._positional, args))
+            if not kwargs:
+                return arguments
+            if len(args) == 0 or arguments.keys().isdisjoint(kwargs):
+                arguments.update(kwargs)
+                return arguments
+        # Slow path: let inspect produce the canonical binding (and errors).
+        bound = self.signature.bind_partial(*args, **kwargs)
+        arguments = bound.arguments
+        for name, value in self._var_defaults.items():
+            arguments.setdefault(name, value)
+        return arguments
+
+
+class _CallText:
+    """Argument text of a call, rendered only if the log record is emitted."""
+
+    __slots__ = ("args", "kwargs")
+
+    def __init__(self, args, kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        parts = [f"'{x}'" for x in self.args]
+        parts.extend(f"{k}='{v}'" for k, v in self.kwargs.items())
+        return ', '.join(parts)
+
+
+class _ShortRepr:
+    """``repr(value)`` cut to *limit* characters, rendered on demand."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit=100):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        text = repr(self.value)
+        if len(text) > self.limit:
+            text = text[:self.limit] + "...[truncated]"
+        return text
+
+
 class Gateway(Resolver, Runner):
     _builtins = None  # Class-level: stores all discovered builtins only once
+    _manifest = None  # Class-level: shared project manifest index
     _thread_local = threading.local()
     defaults = {}
     prefixes = PREFIXES
@@ -57,8 +188,8 @@ class Gateway(Resolver, Runner):
                 verbose=None, silent=None, debug=None, wizard=None, interactive=None,
                 timed=None, quantity=1, expression_mode=False, **kwargs
             ):
-        self._cache = {}
-        self._async_threads = []
+        self._cache = ProjectRegistry()
+        self._init_async()
         self.uuid = uuid.uuid4()
         self.quantity = quantity
 
@@ -68,18 +199,50 @@ class Gateway(Resolver, Runner):
         self.logger = logging.getLogger(name)
         self.expression_mode_enabled = expression_mode
 
+        self._configure_modes(
+            debug=debug, silent=silent, verbose=verbose,
+            wizard=wizard, interactive=interactive, timed=timed,
+        )
+
+        client_name = client or get_base_client()
+        server_name = server or get_base_server()
+
+        self._bind_thread_state()
+
+        # self.defaults is class-level, already initialized above
+
+        super().__init__([
+            ('results', self.results),
+            ('context', self.context),
+            ('env', os.environ),
+        ])
+
+        with PROFILER.phase("env load"):
+            self._load_envs(client_name, server_name)
+
+        # Load builtins ONCE, at class level
+        if Gateway._builtins is None:
+            with PROFILER.phase("builtins scan"):
+                builtins_module = importlib.import_module("gway.builtins")
+                builtins = {}
+                for name, obj in inspect.getmembers(builtins_module):
+                    if not inspect.isfunction(obj) or name.startswith("_"):
+                        continue
+                    mod = inspect.getmodule(obj)
+                    if mod and mod.__name__.startswith("gway.builtins"):
+                        builtins[name] = obj
+                Gateway._builtins = builtins
+
+    def _configure_modes(self, **modes):
         # --- Mode propagation logic: Set global flags via classmethod ---
-        explicit_modes = {}
-        for flag in ('debug', 'silent', 'verbose', 'wizard', 'interactive', 'timed'):
-            val = locals()[flag]
-            if val is not None:
-                explicit_modes[flag] = val
+        explicit_modes = {flag: val for flag, val in modes.items() if val is not None}
         if explicit_modes:
             type(self).update_modes(**explicit_modes)
 
         # Set instance mode flags to match class-level (which may have just changed)
         for flag in ('debug', 'silent', 'verbose', 'wizard', 'interactive'):
             setattr(self, f"{flag}_enabled", getattr(type(self), flag))
+        timed = modes.get('timed')
         self.timed_enabled = timed if timed is not None else getattr(type(self), 'timed', False)
 
         # Instance-level log helpers: always use self.<flag>() to log
@@ -88,11 +251,9 @@ class Gateway(Resolver, Runner):
         self.verbose = (lambda msg, *a, **k: self.logger.info(msg, *a, stacklevel=2, **k)) if self.verbose_enabled else Null
         self.wizard = (lambda msg, *a, **k: self.logger.debug(msg, *a, stacklevel=2, **k)) if self.wizard_enabled else Null
 
-        client_name = client or get_base_client()
-        server_name = server or get_base_server()
-
+    def _bind_thread_state(self):
         if not hasattr(Gateway._thread_local, "context"):
-            Gateway._thread_local.context = {}
+            Gateway._thread_local.context = IndexedDict()
         if not hasattr(Gateway._thread_local, "results"):
             Gateway._thread_local.results = Results()
 
@@ -106,28 +267,75 @@ class Gateway(Resolver, Runner):
         self.context['SYS'] = sys_namespace
         self.sys = sys_namespace
 
-        # self.defaults is class-level, already initialized above
-
-        super().__init__([
-            ('results', self.results),
-            ('context', self.context),
-            ('env', os.environ),
-        ])
-
+    def _load_envs(self, client_name, server_name):
         env_root = os.path.join(self.base_path, "envs")
         load_env("client", client_name, env_root)
         load_env("server", server_name, env_root)
 
-        # Load builtins ONCE, at class level
-        if Gateway._builtins is None:
-            builtins_module = importlib.import_module("gway.builtins")
-            Gateway._builtins = {}
-            for name, obj in inspect.getmembers(builtins_module):
-                if not inspect.isfunction(obj) or name.startswith("_"):
-                    continue
-                mod = inspect.getmodule(obj)
-                if mod and mod.__name__.startswith("gway.builtins"):
-                    Gateway._builtins[name] = obj
+    # Constructor arguments a child cannot take over from its parent.
+    _CHILD_FIXED = ('name', 'base_path', 'project_path', 'quantity', 'expression_mode')
+    _CHILD_KEYWORDS = frozenset(_CHILD_FIXED + (
+        'client', 'server', 'debug', 'silent', 'verbose', 'wizard', 'interactive', 'timed',
+    ))
+
+    def child(self, **context):
+        """Return a lightweight gateway that shares this one's state.
+
+        The child reuses the builtins table, the loaded projects and the
+        already-applied env files; only mode flags, ``client``/``server``
+        and the remaining *context* values are applied on top. Arguments
+        that change which projects are visible (``project_path``,
+        ``base_path``, ...) still build a full :class:`Gateway`.
+        """
+        current = {
+            'name': self.name,
+            'base_path': self.base_path,
+            'project_path': self.project_path,
+            'quantity': self.quantity,
+            'expression_mode': self.expression_mode_enabled,
+        }
+        if any(
+            key in context and context[key] is not None and context[key] != current[key]
+            for key in self._CHILD_FIXED
+        ):
+            return type(self)(**context)
+
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child.uuid = uuid.uuid4()
+        child._configure_modes(**{
+            flag: context.get(flag)
+            for flag in ('debug', 'silent', 'verbose', 'wizard', 'interactive', 'timed')
+        })
+        child._bind_thread_state()
+        Resolver.__init__(child, [
+            ('results', child.results),
+            ('context', child.context),
+            ('env', os.environ),
+        ])
+        client, server = context.get('client'), context.get('server')
+        if client or server:
+            with PROFILER.phase("env load"):
+                child._load_envs(client or get_base_client(), server or get_base_server())
+        child.context.update({
+            key: value for key, value in context.items()
+            if value is not None and key not in self._CHILD_KEYWORDS
+        })
+        return child
+
+    @contextlib.contextmanager
+    def _activate(self):
+        """Apply this gateway's mode flags to wrapped calls made in the block.
+
+        Projects loaded by a parent are shared with its children, so the
+        wrappers read ``verbose``/``timed``/``debug`` from the active gateway
+        rather than from the one that loaded them.
+        """
+        token = _ACTIVE_GATEWAY.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_GATEWAY.reset(token)
 
     def find_value(self, key: str, fallback: str = None, exec: bool = False) -> str:
         sentinel = object()
@@ -356,7 +564,7 @@ class Gateway(Resolver, Runner):
 
         result = set(discover_projects(projects_path))
         sorted_result = sorted(result)
-        self.verbose(f"[projects] Discovered projects: {sorted_result}")
+        self.verbose("[projects] Discovered projects: %s", sorted_result)
         return sorted_result
 
     def builtins(self):
@@ -376,142 +584,111 @@ class Gateway(Resolver, Runner):
                     break
             title = base.replace("_", " ").replace("-", " ").title()
 
+        # Introspection happens once here; calls only walk the compiled plan.
+        plan = _CallPlan(func_obj, self.subject(func_name), is_builtin=is_builtin)
+        subject = plan.subject
+        empty = inspect.Parameter.empty
+
         @functools.wraps(func_obj)
         def wrap(*args, **kwargs):
             try:
-                start_time = time.perf_counter() if self.timed_enabled else None
-                kwarg_txt = ', '.join(f"{k}='{v}'" for k, v in kwargs.items())
-                arg_txt = ', '.join(f"'{x}'" for x in args)
-                if kwarg_txt and arg_txt:
-                    arg_txt = f"{arg_txt}, "
-                if not (is_builtin and not self.verbose):
-                    self.verbose(f"-> {func_name}({arg_txt}{kwarg_txt})")
-
-                sig = inspect.signature(func_obj)
-                bound_args = sig.bind_partial(*args, **kwargs)
-                bound_args.apply_defaults()
-                subject = self.subject(func_name)
+                modes = _ACTIVE_GATEWAY.get() or self
+                start_time = time.perf_counter() if modes.timed_enabled else None
+                verbose = modes.verbose
+                # Messages are %-style with lazy arguments: nothing is
+                # rendered unless a handler actually emits the record.
+                if verbose:
+                    verbose("-> %s(%s)", func_name, _CallText(args, kwargs),
+                            extra={"function": func_name, "subject": subject})
+
+                arguments = plan.bind(args, kwargs)
+                defaults = type(self).defaults
 
                 call_args = []
                 call_kwargs = {}
 
-                # --- NEW: defaults injection ---
-                # 1. Start with the provided args/kwargs
-                # 2. For any missing kwarg (not given by caller or bound by positional), inject from
-                #    context/results/env as before, then finally from Gateway.defaults
-
-                for name, param in sig.parameters.items():
-                    has_explicit = name in bound_args.arguments and (
-                        param.default is inspect.Parameter.empty or
-                        bound_args.arguments[name] is not param.default
-                    )
-
-                    can_auto_inject = (subject is not None) and (name == subject) and not is_builtin
-
-                    if name == "_title" and not has_explicit:
+                # Explicit arguments win; the subject parameter is then pulled
+                # from context/results/env, other gaps from eager sigil
+                # defaults and finally from Gateway.defaults.
+                for name, kind, default, coercer, eager, auto_inject in plan.params:
+                    if name in arguments and (
+                        default is empty or arguments[name] is not default
+                    ):
+                        value = arguments[name]
+                    elif name == "_title":
                         value = title
-                    elif has_explicit:
-                        value = bound_args.arguments[name]
-                    elif can_auto_inject:
+                    elif auto_inject:
                         value = self.find_value(name)
                         if value is None:
-                            default_val = bound_args.arguments.get(name, param.default)
-                            if isinstance(default_val, (Sigil, Spool)) and getattr(default_val, 'is_eager', False):
-                                value = default_val.resolve(self)
-                            else:
-                                value = default_val
+                            value = default.resolve(self) if eager else default
                     else:
-                        # Check for context/env first
-                        default_val = bound_args.arguments.get(name, param.default)
-                        if isinstance(default_val, (Sigil, Spool)) and getattr(default_val, 'is_eager', False):
-                            value = default_val.resolve(self)
-                        else:
-                            value = default_val
-
-                        # -- Here's the new part: If still empty, pull from class-level defaults --
-                        if (value is inspect.Parameter.empty or value is None) and name in type(self).defaults:
-                            value = type(self).defaults[name]
-                            if self.verbose:
-                                self.verbose(f"[wrap_callable] Injected default {name}={value!r} from Gateway.defaults")
-
-                    ann = param.annotation
-                    if ann in (int, float, str, bool) and value is not None and not isinstance(value, ann):
+                        value = default.resolve(self) if eager else default
+                        if (value is empty or value is None) and name in defaults:
+                            value = defaults[name]
+                            if verbose:
+                                verbose("[wrap_callable] Injected default %s=%r from Gateway.defaults",
+                                        name, value)
+
+                    if coercer is not None and value is not None and not isinstance(value, coercer):
                         try:
-                            value = ann(value)
+                            value = coercer(value)
                         except Exception:
-                            if ann is bool and isinstance(value, str):
+                            if coercer is bool and isinstance(value, str):
                                 value = value.lower() in ("1", "true", "yes", "on")
                             else:
                                 raise
 
-                    if can_auto_inject:
+                    if auto_inject:
                         self.context[name] = value
 
-                    if param.kind == param.POSITIONAL_ONLY:
-                        call_args.append(value)
-                    elif param.kind == param.POSITIONAL_OR_KEYWORD:
+                    if kind is _POSITIONAL:
                         call_args.append(value)
-                    elif param.kind == param.VAR_POSITIONAL:
+                    elif kind is _VAR_POSITIONAL:
                         call_args.extend(value if isinstance(value, (list, tuple)) else [value])
-                    elif param.kind == param.KEYWORD_ONLY:
+                    elif kind is _KEYWORD_ONLY:
                         call_kwargs[name] = value
-                    elif param.kind == param.VAR_KEYWORD:
+                    else:
                         call_kwargs.update(value if isinstance(value, dict) else {})
 
-                # Async handling unchanged
-                if inspect.iscoroutinefunction(func_obj):
-                    thread = threading.Thread(
-                        target=self.run_coroutine,
-                        args=(func_name, func_obj, call_args, call_kwargs),
-                        daemon=True
-                    )
-                    self._async_threads.append(thread)
-                    thread.start()
+                if plan.is_coroutine:
+                    task = self.run_coroutine(func_name, func_obj, call_args, call_kwargs)
                     if start_time is not None:
-                        self.log(f"[timed] {func_name} dispatch took {time.perf_counter() - start_time:.3f}s")
-                    return f"ASYNC task started for {func_name}"
+                        self._log_timed("%s dispatch", func_name, subject, start_time)
+                    return task
 
                 result = func_obj(*call_args, **call_kwargs)
 
                 if inspect.iscoroutine(result):
-                    thread = threading.Thread(
-                        target=self.run_coroutine,
-                        args=(func_name, result),
-                        daemon=True
-                    )
-                    self._async_threads.append(thread)
-                    thread.start()
+                    task = self.run_coroutine(func_name, result)
                     if start_time is not None:
-                        self.log(f"[timed] {func_name} dispatch took {time.perf_counter() - start_time:.3f}s")
-                    return f"ASYNC coroutine started for {func_name}"
+                        self._log_timed("%s dispatch", func_name, subject, start_time)
+                    return task
 
                 # ---- Result storage logic ----
                 if not is_builtin and subject and result is not None:
-                    log_value = repr(result)
-                    if len(log_value) > 100:
-                        log_value = log_value[:100] + "...[truncated]"
-                    sensitive_keywords = ("password", "secret", "token", "key")
-                    if any(word in subject for word in sensitive_keywords):
-                        log_value = "[redacted]"
-
-                    self.verbose(f"<- result['{subject}'] == {log_value}")
+                    if verbose:
+                        verbose("<- result['%s'] == %s", subject,
+                                "[redacted]" if plan.sensitive else _ShortRepr(result),
+                                extra={"function": func_name, "subject": subject})
                     self.results.insert(subject, result)
 
                     if isinstance(result, dict):
                         self.context.update(result)
 
                 if start_time is not None:
-                    self.log(f"[timed] {func_name} took {time.perf_counter() - start_time:.3f}s")
+                    self._log_timed("%s", func_name, subject, start_time)
 
                 return result
 
             except Exception as e:
-                self.error(f"Error in '{func_name}': {e}")
-                if self.debug:
+                self.error("Error in '%s': %s", func_name, e,
+                           extra={"function": func_name, "subject": subject})
+                if (_ACTIVE_GATEWAY.get() or self).debug:
                     self.exception(e)
                 raise
 
         wrap._title = title
+        wrap._call_plan = plan
         return wrap
 
     def __getattr__(self, name):
@@ -525,15 +702,16 @@ class Gateway(Resolver, Runner):
             setattr(self, name, func)
             return func
 
-        if name in self._cache:
-            return self._cache[name]
+        cached = self._cache.lookup(name, reload=lambda: self._build_project(name))
+        if cached is not None:
+            return cached
 
         try:
             project_obj = self.load_project(project_name=name)
             return project_obj
         except FileNotFoundError as e:
             # Avoid noisy stack traces for expected missing modules
-            self.debug(f"Project not found for attribute '{name}': {e}")
+            self.debug("Project not found for attribute '%s': %s", name, e)
             raise AttributeError(f"Unable to find GWAY attribute ({str(e)})")
         except Exception as e:
             self.exception(e)
@@ -542,36 +720,47 @@ class Gateway(Resolver, Runner):
     def load_project(self, project_name: str, *, root: str = "projects"):
         """
         Attempt to load a project by name from all supported project locations.
+
+        Concurrent calls for the same project share a single load.
         """
+        return self._cache.load(
+            project_name, lambda: self._build_project(project_name, root=root)
+        )
+
+    def _build_project(self, project_name: str, *, root: str = "projects"):
+        """Build the namespace for *project_name*; returns ``(ns, source path)``."""
         def try_path(base_dir):
             base = gw.resource(base_dir, *project_name.split("."))
-            self.verbose(f"{project_name} <- Project('{base}')")
+            self.verbose("%s <- Project('%s')", project_name, base)
 
             def load_module_ns(py_path: str, dotted: str):
-                mod = self._load_py_file(
+                ns = self._module_ns(
                     py_path,
                     dotted,
                     module_name=f"gway_proj_{dotted}" if dotted == "django" else None,
                 )
-                funcs = {}
-                for fname, obj in inspect.getmembers(mod, inspect.isfunction):
-                    if not fname.startswith("_"):
-                        funcs[fname] = self.wrap_callable(f"{dotted}.{fname}", obj)
-                ns = Project(dotted, funcs, self)
-                if hasattr(mod, "__getattr__"):
-                    ns.__getattr__ = MethodType(mod.__getattr__, ns)
                 self._cache[dotted] = ns
                 return ns
 
-            if os.path.isdir(base):
-                return self._recurse_ns(base, project_name)
-
-            base_path = Path(base)
-            py_file = base_path if base_path.suffix == ".py" else base_path.with_suffix(".py")
-            if py_file.is_file():
-                return load_module_ns(str(py_file), project_name)
-
-            return None
+            try:
+                if os.path.isdir(base):
+                    source = str(base)
+                    ns = self._recurse_ns(base, project_name)
+                else:
+                    base_path = Path(base)
+                    py_file = base_path if base_path.suffix == ".py" else base_path.with_suffix(".py")
+                    if not py_file.is_file():
+                        return None
+                    source = str(py_file)
+                    ns = load_module_ns(source, project_name)
+            finally:
+                self._project_manifest().save()
+
+            if not ns:
+                return None
+            # Remembered command routes may have missed this project.
+            ROUTES.invalidate()
+            return ns, source
 
         # 1. Use user-specified project_path if set
         if self.project_path:
@@ -596,6 +785,18 @@ class Gateway(Resolver, Runner):
             f"base_path/projects, env var, site-packages, and '{root}'."
         )
 
+    def project_stats(self):
+        """Load time, reload and hit counts for the projects loaded so far."""
+        return self._cache.stats()
+
+    def hot_reload(self, enabled: bool = True, *, interval: float | None = None):
+        """Reload projects whose source files change, checking at most every
+        *interval* seconds per project. ``GWAY_HOT_RELOAD=1`` turns it on at
+        startup."""
+        self._cache.hot_reload = enabled
+        if interval is not None:
+            self._cache.interval = interval
+
     def find_project(self, *project_names: str, root: str = "projects"):
         """Return the first successfully loaded project from ``project_names``.
 
@@ -667,71 +868,97 @@ class Gateway(Resolver, Runner):
             raise
         return mod
     
+    def _project_manifest(self):
+        """Return the shared on-disk index of project functions."""
+        if Gateway._manifest is None:
+            Gateway._manifest = ProjectManifest(
+                os.path.join(self.base_path, "work", "project_manifest.json")
+            )
+        return Gateway._manifest
+
+    def _module_loader(self, py_path: str, dotted: str, *, module_name: str | None = None):
+        """Return a loader that imports *py_path* and wraps its public functions."""
+        def load():
+            mod = self._load_py_file(py_path, dotted, module_name=module_name)
+            funcs = {}
+            for fname, obj in inspect.getmembers(mod, inspect.isfunction):
+                if not fname.startswith("_"):
+                    funcs[fname] = self.wrap_callable(f"{dotted}.{fname}", obj)
+            return mod, funcs
+        return load
+
+    def _module_names(self, py_path: str):
+        """Public function names and other bound names in *py_path* per the
+        manifest, or ``None`` when the module must be imported eagerly
+        (unparsable or it defines a module-level ``__getattr__``)."""
+        entry = self._project_manifest().entry(py_path)
+        if entry is None or entry.get("getattr"):
+            return None
+        return list(entry["functions"]), entry.get("aliases", [])
+
+    def _module_ns(self, py_path: str, dotted: str, *, module_name: str | None = None):
+        """Build a ``Project`` for a single file whose functions load on first use."""
+        loader = self._module_loader(py_path, dotted, module_name=module_name)
+        ns = Project(dotted, {}, self)
+        names = self._module_names(py_path)
+        functions, aliases = names or ((), ())
+        ns._defer(functions, loader, aliases=aliases)
+        if names is None:
+            ns._materialize(loader)
+        return ns
+
     def _recurse_ns(self, current_path: str, dotted_prefix: str):
         """
         Recursively loads a project namespace. If a file matching the directory name
         exists (e.g. 'dummy/dummy.py'), its functions become root-level (e.g. gw.dummy.func).
         Subprojects (e.g. 'dummy/app.py') are loaded as gw.dummy.app.func, possibly
         shadowing root names (warn on conflicts).
+
+        Modules are not imported here: each namespace holds lazy entries from
+        the project manifest and imports its module on first access.
         """
-        funcs = {}
         subprojects = {}
         dir_basename = os.path.basename(current_path)
         root_file = os.path.join(current_path, f"{dir_basename}.py")
 
-        # 1. Load submodules (files and directories)
+        # 1. Collect submodules (files and directories)
         for entry in os.listdir(current_path):
             full = os.path.join(current_path, entry)
             if entry.endswith(".py") and not entry.startswith("__"):
                 subname = entry[:-3]
                 if subname == dir_basename:
-                    continue  # defer loading the root file until later
+                    continue  # the root file is handled below
                 dotted = f"{dotted_prefix}.{subname}"
-                mod = self._load_py_file(full, dotted)
-                sub_funcs = {}
-                for fname, obj in inspect.getmembers(mod, inspect.isfunction):
-                    if not fname.startswith("_"):
-                        sub_funcs[fname] = self.wrap_callable(f"{dotted}.{fname}", obj)
-                sub_proj = Project(dotted, sub_funcs, self)
-                if hasattr(mod, "__getattr__"):
-                    sub_proj.__getattr__ = MethodType(mod.__getattr__, sub_proj)
-                subprojects[subname] = sub_proj
+                subprojects[subname] = self._module_ns(full, dotted)
             elif os.path.isdir(full) and not entry.startswith("__"):
                 dotted = f"{dotted_prefix}.{entry}"
                 subprojects[entry] = self._recurse_ns(full, dotted)
 
-        # 2. Load the root file (e.g., web/web.py) if present
-        root_funcs = {}
-        root_mod = None
+        ns = Project(dotted_prefix, subprojects, self)
+
+        # 2. Register the root file (e.g., web/web.py) if present
         if os.path.isfile(root_file):
-            root_mod = self._load_py_file(root_file, dotted_prefix)
-            for fname, obj in inspect.getmembers(root_mod, inspect.isfunction):
-                if not fname.startswith("_"):
-                    root_funcs[fname] = self.wrap_callable(f"{dotted_prefix}.{fname}", obj)
-
-        # 3. Merge root funcs and subprojects; warn on override
-        for k, v in root_funcs.items():
-            if k in subprojects:
-                self.warning(
-                    f"Name conflict in project '{dotted_prefix}': "
-                    f"root-level '{k}' from '{root_file}' is shadowed by subproject '{k}'."
-                )
-            funcs[k] = v
-        # Insert subprojects
-        for k, v in subprojects.items():
-            if k in funcs:
-                self.warning(
-                    f"Name conflict in project '{dotted_prefix}': "
-                    f"subproject '{k}' overrides root-level function '{k}'."
-                )
-            funcs[k] = v
+            loader = self._module_loader(root_file, dotted_prefix)
+            root_names = self._module_names(root_file)
+            functions, aliases = root_names or ((), ())
+            for k in functions:
+                if k in subprojects:
+                    self.warning(
+                        f"Name conflict in project '{dotted_prefix}': "
+                        f"subproject '{k}' overrides root-level function '{k}'."
+                    )
+            ns._defer(functions, loader, aliases=aliases)
+            if root_names is None:
+                ns._materialize(loader)
 
-        ns = Project(dotted_prefix, funcs, self)
-        if root_mod and hasattr(root_mod, "__getattr__"):
-            ns.__getattr__ = MethodType(root_mod.__getattr__, ns)
         self._cache[dotted_prefix] = ns
         return ns
 
+    def _log_timed(self, what, func_name, subject, start_time):
+        duration = time.perf_counter() - start_time
+        self.log(f"[timed] {what} took %.3fs", func_name, duration,
+                 extra={"function": func_name, "subject": subject, "duration": duration})
+
     def log(self, *args, **kwargs):
         if not self.silent:
             if self.debug:
@@ -4,12 +4,17 @@
 
 import os
 import sys
+import copy
+import json
+import queue
+import atexit
 import logging
 import logging.handlers
 import traceback
 import random
 import string
 import threading
+from functools import lru_cache
 from contextlib import contextmanager
 
 def _random_id(length=4):
@@ -17,11 +22,31 @@ def _random_id(length=4):
 
 GWAY_LOG_ID = _random_id()
 
-def _get_thread_shortid():
+def _get_thread_shortid(tid=None):
     # Uses 4 most significant hex digits of thread id (zero-padded)
-    tid = threading.get_ident()
+    if tid is None:
+        tid = threading.get_ident()
     return f"{tid:0>4x}"[-4:]
 
+@lru_cache(maxsize=1024)
+def _display_name(name, tid):
+    """``gw.mod`` logged from thread *tid* shows as ``gw:<log id>:<tid>.mod``."""
+    if name == "gw":
+        return f"gw:{GWAY_LOG_ID}:{_get_thread_shortid(tid)}"
+    if name.startswith("gw."):
+        return f"gw:{GWAY_LOG_ID}:{_get_thread_shortid(tid)}" + name[2:]
+    return name
+
+# Fields of a JSON log line, in order. The first seven match the named
+# groups of the text pattern (see ``sql.DEFAULT_LOG_MASK``); ``function``,
+# ``subject`` and ``duration`` are filled in by Gateway calls.
+JSON_LOG_FIELDS = (
+    "time", "level", "name", "func", "file", "line", "msg",
+    "log_id", "thread", "function", "subject", "duration",
+)
+
+LOG_FORMATS = ("text", "json")
+
 # ---- Store config as globals ----
 _last_logging_config = {}
 
@@ -58,24 +83,98 @@ class FilteredFormatter(logging.Formatter):
         formatted.extend(traceback.format_exception_only(exc_type, exc_value))
         return ''.join(formatted)
 
+    def formatMessage(self, record):
+        # Format a view of the record instead of renaming it, so other
+        # handlers still see the real logger name. ``record.thread`` is the
+        # thread that logged, also when a background writer formats it.
+        name = _display_name(record.name, record.thread)
+        if name == record.name:
+            return super().formatMessage(record)
+        view = copy.copy(record)
+        view.name = name
+        return super().formatMessage(view)
+
+
+class JsonFormatter(FilteredFormatter):
+    """One JSON object per line with the fields in :data:`JSON_LOG_FIELDS`."""
+
     def format(self, record):
-        name = record.name
-        thread_shortid = _get_thread_shortid()
-        if name == "gw":
-            record.name = f"gw:{GWAY_LOG_ID}:{thread_shortid}"
-        elif name.startswith("gw."):
-            record.name = f"gw:{GWAY_LOG_ID}:{thread_shortid}" + name[2:]
-        else:
-            # Leave non-gw loggers as is
-            pass
-        return super().format(record)
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "name": record.name,
+            "func": record.funcName,
+            "file": record.filename,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+            "log_id": GWAY_LOG_ID,
+            "thread": _get_thread_shortid(record.thread),
+        }
+        for field in ("function", "subject", "duration"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread after rendering what must be
+    rendered now: the message (its arguments may change later) and the
+    traceback (the frames go away), using the file formatter so internal
+    frames are still filtered."""
+
+    def __init__(self, q, formatter):
+        super().__init__(q)
+        self.file_formatter = formatter
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.file_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener = None
+
+def _stop_listener():
+    """Flush queued records and stop the background writer, if any."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+atexit.register(_stop_listener)
+
+def flush_logging():
+    """Block until the background writer has written every queued record."""
+    if _listener is not None:
+        _listener.queue.join()
 
 def setup_logging(*,
                   logfile=None, logdir="logs", prog_name="gway", debug=False,
                   loglevel="INFO", pattern=None, backup_count=7,
-                  verbose=False):
-    """Globally configure logging, and remember config for restoration."""
+                  verbose=False, log_format="text", background=False):
+    """Globally configure logging, and remember config for restoration.
+
+    ``log_format="json"`` writes one JSON object per line instead of
+    ``pattern``. With ``background=True`` records are queued and written by
+    a listener thread, so callers never wait on disk I/O.
+    """
     loglevel = getattr(logging, str(loglevel).upper(), logging.INFO)
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"log_format must be one of {LOG_FORMATS}")
 
     if logfile:
         os.makedirs(logdir, exist_ok=True)
@@ -85,11 +184,15 @@ def setup_logging(*,
     pattern = pattern or '%(asctime)s %(levelname)s [%(name)s] %(funcName)s %(filename)s:%(lineno)d  # %(message)s '
 
     root = logging.getLogger()
+    _stop_listener()
     for h in root.handlers[:]:
         root.removeHandler(h)
     root.setLevel(loglevel)
     root.addHandler(logging.NullHandler())
-    formatter = FilteredFormatter(pattern, datefmt='%H:%M:%S', debug=debug)
+    if log_format == "json":
+        formatter = JsonFormatter(datefmt='%H:%M:%S', debug=debug)
+    else:
+        formatter = FilteredFormatter(pattern, datefmt='%H:%M:%S', debug=debug)
 
     if logfile:
         file_h = logging.handlers.TimedRotatingFileHandler(
@@ -98,12 +201,24 @@ def setup_logging(*,
         )
         file_h.setLevel(loglevel)
         file_h.setFormatter(formatter)
-        root.addHandler(file_h)
+        if background:
+            global _listener
+            log_queue = queue.Queue()
+            _listener = logging.handlers.QueueListener(
+                log_queue, file_h, respect_handler_level=True
+            )
+            _listener.start()
+            queue_h = _QueueHandler(log_queue, formatter)
+            queue_h.setLevel(loglevel)
+            root.addHandler(queue_h)
+        else:
+            root.addHandler(file_h)
 
     sep = "-" * len(' '.join(sys.argv[1:])) + "-------"
     cmd_args = " ".join(sys.argv[1:])
-    root.info(f"\n\n> {prog_name} {cmd_args}\n{sep}")
-    root.info(f"Loglevel set to {loglevel} ({logging.getLevelName(loglevel)}), log id: {GWAY_LOG_ID}")
+    root.info("\n\n> %s %s\n%s", prog_name, cmd_args, sep)
+    root.info("Loglevel set to %s (%s), log id: %s",
+              loglevel, logging.getLevelName(loglevel), GWAY_LOG_ID)
 
     # Silencing non-gw loggers unless verbose is true
     if not verbose:
@@ -123,7 +238,8 @@ def setup_logging(*,
     # ---- Save config for restoration ----
     _save_config(dict(
         logfile=logfile, logdir=logdir, prog_name=prog_name, debug=debug,
-        loglevel=loglevel, pattern=pattern, backup_count=backup_count, verbose=verbose
+        loglevel=loglevel, pattern=pattern, backup_count=backup_count, verbose=verbose,
+        log_format=log_format, background=background,
     ))
 
     return root
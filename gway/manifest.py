@@ -0,0 +1,266 @@
+# file: gway/manifest.py
+
+import os
+import ast
+import json
+import hashlib
+import threading
+
+MANIFEST_VERSION = 3
+
+
+def _iter_statements(body):
+    """Yield module-level statements, descending into ``if``/``try``/``with``."""
+    for node in body:
+        if isinstance(node, ast.If):
+            yield from _iter_statements(node.body)
+            yield from _iter_statements(node.orelse)
+        elif isinstance(node, ast.Try):
+            yield from _iter_statements(node.body)
+            for handler in node.handlers:
+                yield from _iter_statements(handler.body)
+            yield from _iter_statements(node.orelse)
+            yield from _iter_statements(node.finalbody)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            yield from _iter_statements(node.body)
+        else:
+            yield node
+
+
+def iter_functions(body):
+    """Yield the function definitions of a module body.
+
+    Definitions nested in module-level ``if``/``try``/``with`` blocks count,
+    as they do when the module is imported.
+    """
+    for node in _iter_statements(body):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield node
+
+
+def _bound_names(body) -> dict:
+    """Public names bound at module level by ``from ... import`` or by a
+    plain assignment that could hold a function (``a = b``, ``a = m.b``,
+    ``a = lambda: ...``). Maps each name to the assigned name for ``a = b``
+    and to ``None`` otherwise."""
+    names = {}
+    for node in _iter_statements(body):
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                name = alias.asname or alias.name
+                if name != "*" and not name.startswith("_"):
+                    names[name] = None
+        elif isinstance(node, ast.Assign) and isinstance(
+            node.value, (ast.Name, ast.Attribute, ast.Lambda)
+        ):
+            source = node.value.id if isinstance(node.value, ast.Name) else None
+            for target in node.targets:
+                if isinstance(target, ast.Name) and not target.id.startswith("_"):
+                    names[target.id] = source
+    return names
+
+
+def _binds_getattr(body) -> bool:
+    """Whether a module-level assignment or import binds ``__getattr__``."""
+    for node in _iter_statements(body):
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if any(isinstance(t, ast.Name) and t.id == "__getattr__" for t in targets):
+                return True
+        elif isinstance(node, ast.ImportFrom):
+            if any((a.asname or a.name) == "__getattr__" for a in node.names):
+                return True
+    return False
+
+
+def scan_module(path: str) -> dict | None:
+    """Describe the public functions of a project file without importing it.
+
+    Aliases of a function defined in the file (``sense = sense_motion``) are
+    listed as functions. ``aliases`` holds the other names bound by
+    ``from ... import`` or by assignment, which may turn out to be functions
+    once the module is imported. Returns ``None`` when
+    the file cannot be parsed so callers can fall back to a regular import
+    (which will surface the real error).
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        tree = ast.parse(data, filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    functions = {}
+    has_getattr = _binds_getattr(tree.body)
+    for node in iter_functions(tree.body):
+        if node.name == "__getattr__":
+            has_getattr = True
+        elif not node.name.startswith("_"):
+            functions[node.name] = {
+                "signature": f"({ast.unparse(node.args)})",
+                "async": isinstance(node, ast.AsyncFunctionDef),
+                "doc": (ast.get_docstring(node) or "").strip().split("\n", 1)[0],
+                "lineno": node.lineno,
+            }
+
+    aliases = []
+    for name, source in sorted(_bound_names(tree.body).items()):
+        if name in functions:
+            continue
+        if source in functions:
+            functions[name] = dict(functions[source])
+        else:
+            aliases.append(name)
+
+    return {
+        "hash": hashlib.sha256(data).hexdigest(),
+        "functions": functions,
+        "aliases": aliases,
+        "getattr": has_getattr,
+    }
+
+
+def _gw_refs(node) -> list:
+    """Return the ``gw.*`` attribute paths used inside *node*."""
+    refs = set()
+    for sub in ast.walk(node):
+        if not isinstance(sub, ast.Attribute):
+            continue
+        parts = []
+        cur = sub
+        while isinstance(cur, ast.Attribute):
+            parts.append(cur.attr)
+            cur = cur.value
+        if isinstance(cur, ast.Name) and cur.id == "gw":
+            refs.add(".".join(reversed(parts)))
+    return sorted(refs)
+
+
+def describe_module(path: str) -> dict | None:
+    """Full help details of the public functions in *path*, by AST only.
+
+    Besides what :func:`scan_module` records, each function carries its
+    complete docstring, source (decorators included) and the ``gw.*``
+    references it makes. ``all`` is the module's literal ``__all__`` if it
+    has one. Returns ``None`` when the file cannot be parsed.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        tree = ast.parse(data, filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+    exported = None
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets)
+        ):
+            try:
+                exported = [str(name) for name in ast.literal_eval(node.value)]
+            except ValueError:
+                pass
+
+    functions = []
+    for node in iter_functions(tree.body):
+        if node.name.startswith("_"):
+            continue
+        start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        signature = f"({ast.unparse(node.args)})"
+        if node.returns is not None:
+            signature += f" -> {ast.unparse(node.returns)}"
+        functions.append({
+            "name": node.name,
+            "signature": signature,
+            "doc": ast.get_docstring(node) or "",
+            "source": "".join(lines[start - 1:node.end_lineno]),
+            "refs": _gw_refs(node),
+        })
+
+    return {
+        "hash": hashlib.sha256(data).hexdigest(),
+        "all": exported,
+        "functions": functions,
+    }
+
+
+class ProjectManifest:
+    """On-disk index of project functions keyed by file path.
+
+    Entries are invalidated per file whenever its mtime or size changes, so
+    an edited project is rescanned without touching the rest of the tree.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                entries = data.get("files") or {}
+        except (OSError, ValueError, AttributeError):
+            pass
+        self._entries = entries
+        return entries
+
+    def entry(self, py_path: str) -> dict | None:
+        """Return the manifest entry for *py_path*, rescanning it if stale."""
+        py_path = os.path.abspath(py_path)
+        try:
+            st = os.stat(py_path)
+        except OSError:
+            return None
+        with self._lock:
+            entries = self._load()
+            cached = entries.get(py_path)
+            if (
+                cached
+                and cached.get("mtime") == st.st_mtime_ns
+                and cached.get("size") == st.st_size
+            ):
+                return cached
+            scanned = scan_module(py_path)
+            if scanned is None:
+                entries.pop(py_path, None)
+                return None
+            scanned["mtime"] = st.st_mtime_ns
+            scanned["size"] = st.st_size
+            entries[py_path] = scanned
+            self._dirty = True
+            return scanned
+
+    def save(self):
+        """Persist the manifest if it changed. Write failures are ignored."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return False
+            payload = {"version": MANIFEST_VERSION, "files": self._entries}
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return False
+            self._dirty = False
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
@@ -0,0 +1,203 @@
+# file: gway/profiling.py
+
+"""Startup profiling for the ``gway`` CLI.
+
+``gway --profile-startup <command>`` runs the command again in a child
+interpreter started with ``-X importtime`` and :data:`PROFILE_ENV` set.
+The child records the time spent in each startup phase and the parent
+merges those phases with the per-module import times into a text report
+and a folded-stacks file that ``flamegraph.pl`` or speedscope can read.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+
+PROFILE_ENV = "GWAY_PROFILE_STARTUP"
+
+# Modules ``import gway`` must not pull in; they are imported on first use.
+DEFERRED_IMPORTS = ("requests", "asyncio", "urllib3", "ssl")
+
+
+class StartupProfiler:
+    """Collect nested phase timings when :data:`PROFILE_ENV` names a file."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.enabled = bool(path)
+        self.phases = []  # (stack, seconds)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if self.enabled:
+            atexit.register(self.save)
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        path = tuple(stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                self.phases.append((path, elapsed))
+
+    def save(self):
+        with self._lock:
+            data = [{"stack": list(stack), "seconds": seconds} for stack, seconds in self.phases]
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+PROFILER = StartupProfiler(os.environ.get(PROFILE_ENV))
+
+
+def parse_importtime(lines):
+    """Turn ``-X importtime`` lines into a forest of import nodes.
+
+    Each node is a dict with ``name``, ``self_us``, ``total_us`` and
+    ``children``. The interpreter reports children before their parent,
+    indented two spaces per level.
+    """
+    pending = {}
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        raw = fields[2].rstrip("\n")
+        name = raw.lstrip(" ")
+        depth = (len(raw) - len(name) - 1) // 2
+        node = {
+            "name": name,
+            "self_us": int(fields[0]),
+            "total_us": int(fields[1]),
+            "children": pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def _walk(nodes, prefix=()):
+    for node in nodes:
+        path = prefix + (node["name"],)
+        yield path, node
+        yield from _walk(node["children"], path)
+
+
+def _phase_self_times(phases):
+    """Subtract direct children from each phase's total."""
+    totals = {}
+    for entry in phases:
+        stack = tuple(entry["stack"])
+        totals[stack] = totals.get(stack, 0.0) + entry["seconds"]
+    self_times = dict(totals)
+    for stack, seconds in totals.items():
+        if len(stack) > 1 and stack[:-1] in self_times:
+            self_times[stack[:-1]] -= seconds
+    return totals, self_times
+
+
+def folded_stacks(imports, phases):
+    """Lines of ``frame;frame;... microseconds`` for flamegraph tools."""
+    lines = []
+    for path, node in _walk(imports):
+        if node["self_us"]:
+            lines.append(f"import;{';'.join(path)} {node['self_us']}")
+    _, self_times = _phase_self_times(phases)
+    for stack, seconds in self_times.items():
+        micros = int(max(seconds, 0.0) * 1_000_000)
+        if micros:
+            lines.append(f"phase;{';'.join(stack)} {micros}")
+    return lines
+
+
+def profile_startup(argv, *, output_dir=None, top=25):
+    """Run ``gway <argv>`` in a child interpreter and profile its startup.
+
+    Returns a summary dict with the report paths, the wall time, the time
+    spent importing ``gway``, the top imports and the phase totals.
+    """
+    import subprocess
+    from gway import gw
+
+    output_dir = output_dir or gw.resource("work", "profile", dir=True)
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    phases_path = os.path.join(output_dir, f"startup-{stamp}.phases.json")
+    report_path = os.path.join(output_dir, f"startup-{stamp}.txt")
+    folded_path = os.path.join(output_dir, f"startup-{stamp}.folded")
+
+    env = dict(os.environ, **{PROFILE_ENV: phases_path})
+    cmd = [sys.executable, "-X", "importtime", "-m", "gway", *argv]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - start
+
+    import_lines = []
+    for line in proc.stderr.splitlines(keepends=True):
+        if line.startswith("import time:"):
+            import_lines.append(line)
+        else:
+            sys.stderr.write(line)
+    imports = parse_importtime(import_lines)
+    try:
+        with open(phases_path, encoding="utf-8") as f:
+            phases = json.load(f)
+    except (OSError, ValueError):
+        phases = []
+
+    flat = sorted(
+        (node for _, node in _walk(imports)), key=lambda n: n["total_us"], reverse=True
+    )
+    gway_node = next((n for n in imports if n["name"] == "gway"), None)
+    loaded = {node["name"] for _, node in _walk(imports)}
+    totals, self_times = _phase_self_times(phases)
+
+    report = [
+        f"gway {' '.join(argv)}",
+        f"exit code: {proc.returncode}",
+        f"wall time: {wall * 1000:.1f} ms",
+        f"import gway: {(gway_node['total_us'] if gway_node else 0) / 1000:.1f} ms",
+        f"deferred modules loaded: {', '.join(m for m in DEFERRED_IMPORTS if m in loaded) or 'none'}",
+        "",
+        "Phases (total / self ms):",
+    ]
+    for stack in sorted(totals):
+        report.append(
+            f"  {'  ' * (len(stack) - 1)}{stack[-1]}: "
+            f"{totals[stack] * 1000:.2f} / {self_times[stack] * 1000:.2f}"
+        )
+    report += ["", f"Top {top} imports (cumulative / self ms):"]
+    for node in flat[:top]:
+        report.append(
+            f"  {node['name']}: {node['total_us'] / 1000:.2f} / {node['self_us'] / 1000:.2f}"
+        )
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(report) + "\n")
+    with open(folded_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(folded_stacks(imports, phases)) + "\n")
+
+    return {
+        "returncode": proc.returncode,
+        "wall_ms": round(wall * 1000, 1),
+        "import_ms": round((gway_node["total_us"] if gway_node else 0) / 1000, 1),
+        "deferred_loaded": [m for m in DEFERRED_IMPORTS if m in loaded],
+        "top_imports": [(n["name"], n["total_us"] / 1000) for n in flat[:top]],
+        "phases": {";".join(k): round(v * 1000, 3) for k, v in totals.items()},
+        "report": report_path,
+        "folded": folded_path,
+    }
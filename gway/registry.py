@@ -0,0 +1,155 @@
+# file: gway/registry.py
+
+import os
+import time
+import threading
+
+# Seconds between source checks for a project when hot reload is on.
+RELOAD_INTERVAL = 1.0
+
+
+def _source_stamps(path):
+    """``{file: (mtime_ns, size)}`` for every ``.py`` file making up *path*."""
+    stamps = {}
+    if os.path.isdir(path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if not d.startswith("__")]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    full = os.path.join(dirpath, filename)
+                    try:
+                        st = os.stat(full)
+                    except OSError:
+                        continue
+                    stamps[full] = (st.st_mtime_ns, st.st_size)
+    else:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return stamps
+        stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+class _Entry:
+    __slots__ = ("path", "stamps", "checked", "seconds", "loads", "reloads", "hits", "loaded_at")
+
+    def __init__(self):
+        self.path = None
+        self.stamps = {}
+        self.checked = 0.0
+        self.seconds = 0.0
+        self.loads = 0
+        self.reloads = 0
+        self.hits = 0
+        self.loaded_at = None
+
+
+class ProjectRegistry(dict):
+    """Project namespaces of a gateway, keyed by dotted name.
+
+    Reads are plain dict lookups. :meth:`load` runs a loader at most once
+    per name at a time: threads asking for a project that is being loaded
+    wait for that load instead of importing the modules again. With
+    ``hot_reload`` on, :meth:`lookup` re-checks the source files of a
+    project every ``interval`` seconds and swaps in a freshly loaded
+    namespace when they changed; callers keep the old one until then.
+    """
+
+    def __init__(self, *, hot_reload=None, interval=None):
+        super().__init__()
+        if hot_reload is None:
+            hot_reload = os.environ.get("GWAY_HOT_RELOAD", "").lower() not in ("", "0", "false", "no")
+        self.hot_reload = hot_reload
+        self.interval = RELOAD_INTERVAL if interval is None else interval
+        self._lock = threading.Lock()
+        self._flights = {}  # name -> RLock held while loading
+        self._entries = {}  # name -> _Entry
+
+    def _entry(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.setdefault(name, _Entry())
+        return entry
+
+    def _flight(self, name):
+        with self._lock:
+            flight = self._flights.get(name)
+            if flight is None:
+                flight = self._flights[name] = threading.RLock()
+            return flight
+
+    def lookup(self, name, reload=None):
+        """Return the cached namespace for *name*, or ``None``.
+
+        When hot reload is on and the project's files changed, ``reload()``
+        is called to build the replacement.
+        """
+        ns = self.get(name)
+        if ns is None:
+            return None
+        entry = self._entries.get(name)
+        if entry is None:
+            return ns
+        entry.hits += 1
+        if not (self.hot_reload and reload and entry.path):
+            return ns
+        now = time.monotonic()
+        if now - entry.checked < self.interval:
+            return ns
+        entry.checked = now
+        if _source_stamps(entry.path) == entry.stamps:
+            return ns
+        with self._flight(name):
+            # Another thread may have reloaded while we waited.
+            if self.get(name) is not ns:
+                return self.get(name)
+            if _source_stamps(entry.path) == entry.stamps:
+                return ns
+            return self._run(name, reload, reloading=True)
+
+    def load(self, name, loader):
+        """Return the namespace for *name*, running ``loader()`` only if no
+        other thread loaded it first."""
+        ns = self.get(name)
+        if ns is not None:
+            return ns
+        with self._flight(name):
+            ns = self.get(name)
+            if ns is not None:
+                return ns
+            return self._run(name, loader)
+
+    def _run(self, name, loader, reloading=False):
+        start = time.perf_counter()
+        ns, path = loader()
+        elapsed = time.perf_counter() - start
+        entry = self._entry(name)
+        entry.path = path
+        entry.stamps = _source_stamps(path) if path else {}
+        entry.checked = time.monotonic()
+        entry.seconds = elapsed
+        entry.loaded_at = time.time()
+        if reloading:
+            entry.reloads += 1
+        else:
+            entry.loads += 1
+        self[name] = ns
+        return ns
+
+    def stats(self):
+        """Load metrics for every project loaded through this registry."""
+        return [
+            {
+                "project": name,
+                "path": entry.path,
+                "files": len(entry.stamps),
+                "load_ms": round(entry.seconds * 1000, 3),
+                "loads": entry.loads,
+                "reloads": entry.reloads,
+                "hits": entry.hits,
+                "loaded_at": entry.loaded_at,
+            }
+            for name, entry in sorted(self._entries.items())
+        ]
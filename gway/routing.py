@@ -0,0 +1,158 @@
+# file: gway/routing.py
+
+import threading
+from collections import OrderedDict
+
+ROUTE_CACHE_SIZE = 2048
+
+
+class RouteCache:
+    """Shared memo for resolving command tokens to gateway attributes.
+
+    :meth:`resolve` performs the console's greedy lookup (one token per
+    attribute, falling back to ``_``-joined composites from longest to
+    shortest) and remembers the outcome per token sequence. Routes store the
+    attribute *names* that matched rather than the objects, so replaying one
+    always reads the current attribute. Names that raised ``AttributeError``
+    are remembered per object so repeated lines skip the probes that would
+    otherwise search the filesystem for projects again.
+
+    Both caches are dropped by :meth:`invalidate`, which the gateway calls
+    whenever a project is loaded.
+    """
+
+    def __init__(self, size: int = ROUTE_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # (id(root), tokens) -> (root, names, consumed, final, error)
+        self._routes = OrderedDict()
+        self._missing = {}  # id(obj) -> (obj, {name: error message})
+
+    def invalidate(self):
+        with self._lock:
+            self._routes.clear()
+            self._missing.clear()
+
+    def getattr(self, obj, name):
+        """``getattr`` that remembers which names an object does not have."""
+        entry = self._missing.get(id(obj))
+        if entry is not None and entry[0] is obj and name in entry[1]:
+            # Names assigned since the miss (setattr, mock.patch) still win.
+            attrs = getattr(obj, "__dict__", None)
+            if not (isinstance(attrs, dict) and name in attrs):
+                raise AttributeError(entry[1][name])
+        try:
+            return getattr(obj, name)
+        except AttributeError as e:
+            # Only dynamic lookups (gateway, project namespaces) are costly
+            # enough to remember; plain objects fail fast on their own.
+            if not hasattr(type(obj), "__getattr__"):
+                raise
+            with self._lock:
+                if len(self._missing) >= self.size:
+                    self._missing.clear()
+                entry = self._missing.get(id(obj))
+                if entry is None or entry[0] is not obj:
+                    entry = self._missing[id(obj)] = (obj, {})
+                entry[1][name] = str(e)
+            raise
+
+    def resolve(self, root, tokens, normalize, on_miss=None):
+        """Resolve ``tokens`` to a nested attribute of ``root``.
+
+        Returns ``(obj, remaining, path, error)`` where ``path`` holds the
+        consumed tokens and ``error`` the last ``AttributeError`` met.
+        ``on_miss(obj, token, name)`` may return an ``(obj, name)`` pair to
+        use instead of a missing name; routes using it are not cached.
+        """
+        tokens = tuple(tokens)
+        key = (id(root), tokens)
+        obj, names, consumed = root, [], 0
+        route = self._routes.get(key)
+        if route is not None and route[0] is root:
+            try:
+                for name in route[1]:
+                    obj = getattr(obj, name)
+            except AttributeError:
+                obj = root
+                with self._lock:
+                    self._routes.pop(key, None)
+            else:
+                names, consumed, final, error = list(route[1]), *route[2:]
+                with self._lock:
+                    self.hits += 1
+                    if key in self._routes:
+                        self._routes.move_to_end(key)
+                if final:
+                    error = AttributeError(error) if error is not None else None
+                    return obj, list(tokens[consumed:]), list(tokens[:consumed]), error
+        else:
+            with self._lock:
+                self.misses += 1
+
+        # Partial routes are walked again from where they stopped: the
+        # negative cache keeps that cheap while still noticing new names.
+        obj, consumed, last_error, final, prompted = self._walk(
+            obj, tokens, consumed, names, normalize, on_miss
+        )
+        if not prompted:
+            with self._lock:
+                error = str(last_error) if last_error is not None else None
+                self._routes[key] = (root, tuple(names), consumed, final, error)
+                self._routes.move_to_end(key)
+                while len(self._routes) > self.size:
+                    self._routes.popitem(last=False)
+        return obj, list(tokens[consumed:]), list(tokens[:consumed]), last_error
+
+    def _walk(self, obj, tokens, consumed, names, normalize, on_miss):
+        last_error = None
+        prompted = False
+        final = True
+        while consumed < len(tokens):
+            original = tokens[consumed]
+            name = normalize(original)
+            try:
+                obj = self.getattr(obj, name)
+                names.append(name)
+                consumed += 1
+                continue
+            except AttributeError as e:
+                last_error = e
+                if on_miss is not None:
+                    picked = on_miss(obj, original, name)
+                    if picked is not None:
+                        obj, name = picked
+                        names.append(name)
+                        consumed += 1
+                        prompted = True
+                        continue
+
+            # Composite names ("a b" -> "a_b") end the lookup when they match
+            for i in range(len(tokens), consumed, -1):
+                joined = "_".join(normalize(t) for t in tokens[consumed:i])
+                try:
+                    obj = self.getattr(obj, joined)
+                except AttributeError as e:
+                    last_error = e
+                    continue
+                names.append(joined)
+                consumed = i
+                break
+            else:
+                # Nothing matched: later calls re-check from this point.
+                final = False
+            break
+        return obj, consumed, last_error, final, prompted
+
+    def stats(self):
+        return {
+            "routes": len(self._routes),
+            "missing": sum(len(entry[1]) for entry in self._missing.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+ROUTES = RouteCache()
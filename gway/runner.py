@@ -2,12 +2,113 @@
 
 import os
 import time
-import asyncio
 import hashlib
 import threading
+from concurrent.futures import FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
 
-import requests
+from .scheduler import Scheduler
+
+# asyncio and requests are imported where used: together they are most of
+# the time ``import gway`` would otherwise spend importing (see ``gway
+# --profile-startup``).
+
+
+class EventLoopThread:
+    """An asyncio event loop running forever on a daemon thread.
+
+    The loop is created on first use, so gateways that never call a
+    coroutine never start the thread or import :mod:`asyncio`.
+    """
+
+    def __init__(self, name="gway-loop"):
+        self.name = name
+        self.loop = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the running loop, starting it if needed."""
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            return loop
+        import asyncio
+
+        with self._lock:
+            if self.loop is None or self.loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self.thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self.thread.start()
+                ready.wait()
+                self.loop = loop
+            return self.loop
+
+    def submit(self, coro):
+        """Schedule *coro* on the loop; returns a ``concurrent.futures.Future``."""
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coro, self.get())
+
+    def stop(self):
+        """Stop the loop and wait for its thread; a later :meth:`get` restarts it."""
+        with self._lock:
+            loop, thread = self.loop, self.thread
+            self.loop = self.thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            loop.close()
+
+
+class AsyncTask:
+    """Handle for a coroutine function called through the gateway.
+
+    Wraps the ``concurrent.futures.Future`` of the scheduled coroutine:
+    block on it with :meth:`result` or ``await`` it from any event loop.
+    """
+
+    __slots__ = ("name", "future")
+
+    def __init__(self, name, future):
+        self.name = name
+        self.future = future
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def exception(self, timeout=None):
+        return self.future.exception(timeout)
+
+    def done(self):
+        return self.future.done()
+
+    def cancel(self):
+        return self.future.cancel()
+
+    def __await__(self):
+        import asyncio
+
+        return asyncio.wrap_future(self.future).__await__()
+
+    def __repr__(self):
+        if not self.future.done():
+            state = "running"
+        elif self.future.cancelled():
+            state = "cancelled"
+        elif self.future.exception() is not None:
+            state = "failed"
+        else:
+            state = "done"
+        return f"<AsyncTask {self.name} {state}>"
 
 
 # Extract all async/thread/coroutine runner logic into Runner,
@@ -15,11 +116,33 @@ import requests
 class Runner:
     """
     Runner provides async/threading/coroutine management for Gateway.
+
+    Coroutines share one background event loop per gateway (see
+    :class:`EventLoopThread`) and periodic work shares one
+    :class:`~gway.scheduler.Scheduler`. ``_async_threads`` tracks the
+    threads and scheduled tasks :meth:`until` waits for.
     """
     def __init__(self, *args, **kwargs):
-        self._async_threads = []
+        self._init_async()
         super().__init__(*args, **kwargs)
 
+    def _init_async(self):
+        self._async_threads = []
+        self._async_futures = []
+        self._event_loop = EventLoopThread()
+        self._scheduler = Scheduler(
+            on_error=self._scheduled_error, on_saturated=self._scheduler_saturated,
+        )
+
+    def _scheduled_error(self, task, exc):
+        if hasattr(self, "warn"):
+            self.warn("[schedule] %s failed: %s", task.name, exc)
+
+    def _scheduler_saturated(self, task, workers):
+        if hasattr(self, "warn"):
+            self.warn("[schedule] all %d workers are busy; %s runs on an extra thread",
+                      workers, task.name)
+
     def _resolve_callable(self, name):
         """Return a callable from a dotted/space path or via gw lookup."""
         import re
@@ -43,57 +166,86 @@ class Runner:
             obj = getattr(obj, part)
         return obj
 
+    def event_loop(self):
+        """Return this gateway's background event loop, starting it if needed."""
+        return self._event_loop.get()
+
     def run_coroutine(self, func_name, coro_or_func, args=None, kwargs=None):
-        try:
-            start_time = time.perf_counter() if getattr(self, 'timed_enabled', False) else None
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        """Schedule a coroutine (or coroutine function) on the background loop.
 
-            if asyncio.iscoroutine(coro_or_func):
-                result = loop.run_until_complete(coro_or_func)
-            else:
-                result = loop.run_until_complete(coro_or_func(*(args or ()), **(kwargs or {})))
-
-            # Insert result into results if available (only if called from Gateway)
-            if hasattr(self, "results"):
-                self.results.insert(func_name, result)
-                if isinstance(result, dict) and hasattr(self, "context"):
-                    self.context.update(result)
-        except Exception as e:
-            if hasattr(self, "error"):
-                self.error(f"Async error in {func_name}: {e}")
-                if hasattr(self, "exception"):
-                    self.exception(e)
-        finally:
-            loop.close()
-            if start_time is not None:
-                if hasattr(self, 'log'):
-                    self.log(f"[timed] {func_name} (async) took {time.perf_counter() - start_time:.3f}s")
+        The result is stored like a regular call's once it completes.
+        Returns an :class:`AsyncTask`; :meth:`until` waits for pending tasks.
+        """
+        import asyncio
 
-    def every(self, target, *args, interval=60, daemon=True, **kwargs):
-        """Run ``target`` periodically every ``interval`` seconds."""
+        async def runner():
+            start_time = time.perf_counter() if getattr(self, 'timed_enabled', False) else None
+            try:
+                if asyncio.iscoroutine(coro_or_func):
+                    result = await coro_or_func
+                else:
+                    result = await coro_or_func(*(args or ()), **(kwargs or {}))
+
+                # Insert result into results if available (only if called from Gateway)
+                if hasattr(self, "results"):
+                    self.results.insert(func_name, result)
+                    if isinstance(result, dict) and hasattr(self, "context"):
+                        self.context.update(result)
+                return result
+            except Exception as e:
+                if hasattr(self, "error"):
+                    self.error("Async error in %s: %s", func_name, e)
+                    if hasattr(self, "exception"):
+                        self.exception(e)
+                raise
+            finally:
+                if start_time is not None:
+                    if hasattr(self, '_log_timed'):
+                        self._log_timed("%s (async)", func_name, None, start_time)
+
+        future = self._event_loop.submit(runner())
+        self._async_futures.append(future)
+        return AsyncTask(func_name, future)
+
+    def every(self, target, *args, interval=60, daemon=True, delay=0.0, jitter=0.0,
+              backoff=None, max_backoff=None, concurrency=1, missed="skip",
+              dedicated=False, **kwargs):
+        """Run ``target`` periodically every ``interval`` seconds.
+
+        The call is registered with the gateway's shared scheduler; the
+        returned :class:`~gway.scheduler.ScheduledTask` can be cancelled and
+        reports run statistics. ``jitter`` adds up to that many random
+        seconds per run, ``backoff`` multiplies the wait after each
+        consecutive failure (capped by ``max_backoff``), ``concurrency``
+        limits overlapping runs and ``missed`` ("skip" or "catchup") decides
+        what happens to runs missed while falling behind. ``dedicated``
+        gives each run a thread of its own instead of a pool worker, for
+        targets that may block for long. ``daemon`` is accepted for
+        compatibility; the scheduler thread is always a daemon.
+        """
         func = self._resolve_callable(target)
-
-        def loop():
-            while True:
-                try:
-                    func(*args, **kwargs)
-                except Exception as e:
-                    if hasattr(self, "warn"):
-                        self.warn(f"[every] {target} failed: {e}")
-                time.sleep(interval)
-
-        t = threading.Thread(target=loop, daemon=daemon)
-        t.start()
-        self._async_threads.append(t)
-        return t
+        task = self.schedule(
+            func, interval, args=args, kwargs=kwargs, name=str(target), delay=delay,
+            jitter=jitter, backoff=backoff, max_backoff=max_backoff,
+            concurrency=concurrency, missed=missed, dedicated=dedicated,
+        )
+        self._async_threads.append(task)
+        return task
+
+    def schedule(self, func, interval, **options):
+        """Register ``func`` with the shared scheduler (see :meth:`Scheduler.schedule`)."""
+        return self._scheduler.schedule(func, interval, **options)
+
+    def schedule_stats(self):
+        """Run statistics of every task registered with the scheduler."""
+        return self._scheduler.stats()
 
     def until(self, *, file=None, url=None, pypi=False, version=False, build=False,
               done=False, notify=False, notify_only=False, abort=False,
               minor=False, major=False):
         assert file or url or pypi or version or build or done, "Use --done for unconditional looping."
 
-        if not self._async_threads and hasattr(self, "critical"):
+        if not (self._async_threads or self._async_futures) and hasattr(self, "critical"):
             self.critical("No async threads detected before entering loop.")
 
         from gway import gw
@@ -119,6 +271,9 @@ class Runner:
                 abort_triggered = True
                 abort_message = message
             self._async_threads.clear()
+            for future in self._async_futures:
+                future.cancel()
+            self._async_futures.clear()
 
         watchers = []
         if version:
@@ -148,13 +303,18 @@ class Runner:
                 events.append(watcher(target, on_change=lambda r=reason: shutdown(r)))
         try:
             while True:
-                # Discard finished threads
+                # Discard finished threads and coroutines
                 self._async_threads[:] = [t for t in self._async_threads if t.is_alive()]
+                self._async_futures[:] = [f for f in self._async_futures if not f.done()]
 
                 if self._async_threads:
                     time.sleep(0.1)
                     continue
 
+                if self._async_futures:
+                    wait(list(self._async_futures), timeout=0.1, return_when=FIRST_COMPLETED)
+                    continue
+
                 # Keep looping if any watcher is still active
                 if any(e and not e.is_set() for e in events):
                     time.sleep(0.1)
@@ -164,6 +324,9 @@ class Runner:
         except KeyboardInterrupt:
             if hasattr(self, "critical"):
                 self.critical("KeyboardInterrupt received. Exiting immediately.")
+            # os._exit skips atexit, so write out queued log records first.
+            from .logging import flush_logging
+            flush_logging()
             os._exit(1)
         finally:
             for e in events:
@@ -173,227 +336,183 @@ class Runner:
             gw.abort(abort_message or "Async shutdown", exit_code=1)
 
 
-def watch_file(*filepaths, on_change, interval=10.0, hash=False, resource=True):
+def watch_file(*filepaths, on_change, interval=10.0, hash=False, resource=True, backend=None):
+    """Call ``on_change()`` once when one of *filepaths* changes.
+
+    Directories are watched recursively. Uses inotify where available and
+    polls every ``interval`` seconds otherwise (see :mod:`gway.watchers`).
+    Returns the stop event.
+    """
     from gway import gw
+    from .watchers import watch_paths
 
-    paths = []
-    for path in filepaths:
-        resolved = gw.resource(path) if resource else path
-        if os.path.isdir(resolved):
-            for root, _, files in os.walk(resolved):
-                for file in files:
-                    paths.append(os.path.join(root, file))
-        else:
-            paths.append(resolved)
+    paths = [gw.resource(path) if resource else path for path in filepaths]
 
-    stop_event = threading.Event()
+    def handler(changed):
+        on_change()
+        return True
 
-    def _watch():
-        last_mtimes = {}
-        last_hashes = {}
+    return watch_paths(paths, handler, interval=interval, hash=hash, backend=backend)
 
-        for path in paths:
-            try:
-                last_mtimes[path] = os.path.getmtime(path)
-                if hash:
-                    with open(path, 'rb') as f:
-                        last_hashes[path] = hashlib.md5(f.read()).hexdigest()
-            except FileNotFoundError:
-                pass
 
-        while not stop_event.is_set():
-            for path in paths:
-                try:
-                    current_mtime = os.path.getmtime(path)
-                    if hash:
-                        if path not in last_mtimes or current_mtime != last_mtimes[path]:
-                            with open(path, 'rb') as f:
-                                current_hash = hashlib.md5(f.read()).hexdigest()
-                            if path in last_hashes and current_hash != last_hashes[path]:
-                                on_change()
-                                stop_event.set()
-                                return
-                            last_hashes[path] = current_hash
-                        last_mtimes[path] = current_mtime
-                    else:
-                        if path in last_mtimes and current_mtime != last_mtimes[path]:
-                            on_change()
-                            stop_event.set()
-                            return
-                        last_mtimes[path] = current_mtime
-                except FileNotFoundError:
-                    pass
-            time.sleep(interval)
+def _parse_version(vstr):
+    parts = [p or '0' for p in vstr.strip().split('.')]
+    while len(parts) < 3:
+        parts.append('0')
+    try:
+        return [int(p) for p in parts[:3]]
+    except Exception:
+        return [0, 0, 0]
 
-    thread = threading.Thread(target=_watch, daemon=True)
-    thread.start()
-    return stop_event
+
+def _read_version(path):
+    try:
+        with open(path) as f:
+            return _parse_version(f.read())
+    except FileNotFoundError:
+        return None
 
 
-def watch_version(path, on_change, *, interval=10.0, part=None):
+def watch_version(path, on_change, *, interval=10.0, part=None, backend=None):
     """Watch VERSION file and trigger only on specific version part changes."""
     from gway import gw
+    from .watchers import watch_paths
 
     resolved = gw.resource(path)
-    stop_event = threading.Event()
+    last_version = _read_version(resolved)
 
-    def parse_version(vstr):
-        parts = [p or '0' for p in vstr.strip().split('.')]
-        while len(parts) < 3:
-            parts.append('0')
-        try:
-            return [int(p) for p in parts[:3]]
-        except Exception:
-            return [0, 0, 0]
+    def handler(changed):
+        nonlocal last_version
+        current_version = _read_version(resolved)
+        if current_version is None:
+            return False
+        if last_version is None:
+            changed = False
+        elif part == 'minor':
+            changed = current_version[1] != last_version[1]
+        elif part == 'major':
+            changed = current_version[0] != last_version[0]
+        else:
+            changed = current_version != last_version
+        last_version = current_version
+        if changed:
+            on_change()
+        return changed
 
-    def _watch():
-        try:
-            last_mtime = os.path.getmtime(resolved)
-            with open(resolved) as f:
-                last_version = parse_version(f.read())
-        except FileNotFoundError:
-            last_mtime = None
-            last_version = None
-
-        while not stop_event.is_set():
-            try:
-                current_mtime = os.path.getmtime(resolved)
-                if last_mtime is None or current_mtime != last_mtime:
-                    with open(resolved) as f:
-                        current_version = parse_version(f.read())
-                    changed = False
-                    if last_version is not None:
-                        if part == 'minor':
-                            changed = current_version[1] != last_version[1]
-                        elif part == 'major':
-                            changed = current_version[0] != last_version[0]
-                        else:
-                            changed = current_version != last_version
-                    last_mtime = current_mtime
-                    last_version = current_version
-                    if changed:
-                        on_change()
-                        stop_event.set()
-                        return
-            except FileNotFoundError:
-                pass
-            time.sleep(interval)
+    return watch_paths([resolved], handler, interval=interval, backend=backend, created=True)
 
-    thread = threading.Thread(target=_watch, daemon=True)
-    thread.start()
-    return stop_event
 
+class _WatchStop(threading.Event):
+    """Stop event of a scheduled watcher; setting it cancels the task."""
 
-def _retry_loop(fn, *, interval, stop_event, label):
-    """Retry wrapper that logs and silently recovers from errors."""
-    from gway import gw
-    while not stop_event.is_set():
-        try:
-            fn()
-        except Exception as e:
-            gw.warn(f"[Watcher] {label} error: {e}")
-        time.sleep(interval)
+    def __init__(self):
+        super().__init__()
+        self.task = None
+
+    def set(self):
+        super().set()
+        if self.task is not None:
+            self.task.cancel()
+
+
+def _schedule_watch(check, *, interval, label, scheduler=None, jitter=0.0):
+    """Run ``check(stop_event)`` on the shared scheduler until it sets the event."""
+    if scheduler is None:
+        from gway import gw
+        scheduler = gw._scheduler
+
+    stop_event = _WatchStop()
+
+    def run():
+        if not stop_event.is_set():
+            check(stop_event)
+
+    stop_event.task = scheduler.schedule(run, interval, name=label, jitter=jitter)
+    return stop_event
 
 
 def watch_url(url, on_change, *,
-              interval=300.0, event="change", resend=False, value=None):
-    stop_event = threading.Event()
-
-    def _check():
-        response = requests.get(url, timeout=5)
-        content = response.content
-        status_ok = 200 <= response.status_code < 400
-
-        if event == "up":
-            if status_ok:
-                on_change()
-                stop_event.set()
-                return
-        elif event == "down":
-            if not status_ok:
-                on_change()
-                stop_event.set()
-                return
-        elif event == "has" and isinstance(value, str):
-            if value.lower() in content.decode(errors="ignore").lower():
-                on_change()
-                stop_event.set()
-                return
-        elif event == "lacks" and isinstance(value, str):
-            if value.lower() not in content.decode(errors="ignore").lower():
-                on_change()
-                stop_event.set()
-                return
-        else:  # event == "change"
-            response.raise_for_status()
-            nonlocal last_hash
-            current_hash = hashlib.sha256(content).hexdigest()
-            if last_hash is not None and current_hash != last_hash:
-                on_change()
-                stop_event.set()
-                return
-            last_hash = current_hash
+              interval=300.0, event="change", resend=False, value=None, scheduler=None):
+    from .fetch import ConditionalGet
+
+    fetch = ConditionalGet(url)
+
+    def _check(stop_event):
+        nonlocal last_hash
+        if event in ("up", "down"):
+            # Only the status matters: HEAD (or a one byte range) is enough.
+            status_ok = 200 <= fetch.status() < 400
+            triggered = status_ok if event == "up" else not status_ok
+        else:
+            response, modified = fetch.get()
+            if not modified:
+                return  # 304: same content as the last check
+            content = response.content
+            if event == "has" and isinstance(value, str):
+                triggered = value.lower() in content.decode(errors="ignore").lower()
+            elif event == "lacks" and isinstance(value, str):
+                triggered = value.lower() not in content.decode(errors="ignore").lower()
+            else:  # event == "change"
+                response.raise_for_status()
+                # Servers without validators still answer 200; compare bodies.
+                current_hash = hashlib.sha256(content).hexdigest()
+                triggered = last_hash is not None and current_hash != last_hash
+                last_hash = current_hash
+        if triggered:
+            on_change()
+            stop_event.set()
 
     last_hash = None
-    thread = threading.Thread(target=lambda: _retry_loop(
-        _check, interval=interval, stop_event=stop_event, label=f"url:{url}"), daemon=True)
-    thread.start()
-    return stop_event
+    return _schedule_watch(_check, interval=interval, label=f"url:{url}", scheduler=scheduler)
 
 
 # Default interval (in seconds) for PyPI version polling.
 DEFAULT_PYPI_INTERVAL = 30 * 60
 
 
-def watch_pypi_package(package_name, on_change, *, interval=DEFAULT_PYPI_INTERVAL):
-    stop_event = threading.Event()
-    url = f"https://pypi.org/pypi/{package_name}/json"
-
-    def _check():
-        nonlocal last_version
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        current_version = data["info"]["version"]
-        if last_version is not None and current_version != last_version:
-            on_change()
-            stop_event.set()
-            return
-        last_version = current_version
+def watch_pypi_package(package_name, on_change, *, interval=DEFAULT_PYPI_INTERVAL, scheduler=None):
+    from gway import gw
+    from .fetch import ConditionalGet
 
+    url = f"https://pypi.org/pypi/{package_name}/json"
     last_version = None
-    label = f"pypi:{package_name}"
 
-    def _loop():
-        from gway import gw
+    auto_info = None
+    if package_name == "gway":
+        auto_info = gw.sys.setdefault("auto_upgrade", {})
+        auto_info.setdefault("package", package_name)
+        auto_info["interval_seconds"] = interval
 
-        auto_info = None
-        if package_name == "gway":
-            auto_info = gw.sys.setdefault("auto_upgrade", {})
-            auto_info.setdefault("package", package_name)
-            auto_info["interval_seconds"] = interval
-
-        while not stop_event.is_set():
-            try:
-                _check()
-                if auto_info is not None:
-                    auto_info["last_check"] = datetime.now().isoformat(timespec="seconds")
-                    auto_info.pop("last_error", None)
-            except Exception as exc:  # pragma: no cover - network failures are best-effort
-                gw.warn(f"[Watcher] {label} error: {exc}")
-                if auto_info is not None:
-                    auto_info["last_error"] = str(exc)
-
-            if stop_event.is_set():
-                break
+    fetch = ConditionalGet(url)
 
+    def _check(stop_event):
+        nonlocal last_version
+        try:
+            response, modified = fetch.get()
+            if modified:
+                response.raise_for_status()
+                current_version = response.json()["info"]["version"]
+            else:
+                current_version = last_version
+        except Exception as exc:  # pragma: no cover - network failures are best-effort
+            if auto_info is not None:
+                auto_info["last_error"] = str(exc)
+            raise
+        finally:
             if auto_info is not None:
                 next_run = datetime.now() + timedelta(seconds=interval)
                 auto_info["next_check"] = next_run.isoformat(timespec="seconds")
+        if auto_info is not None:
+            auto_info["last_check"] = datetime.now().isoformat(timespec="seconds")
+            auto_info.pop("last_error", None)
+        if last_version is not None and current_version != last_version:
+            on_change()
+            stop_event.set()
+            return
+        last_version = current_version
 
-            if stop_event.wait(interval):
-                break
-
-    thread = threading.Thread(target=_loop, daemon=True)
-    thread.start()
-    return stop_event
+    # A little jitter keeps a fleet of devices from polling PyPI in lockstep.
+    return _schedule_watch(
+        _check, interval=interval, label=f"pypi:{package_name}",
+        scheduler=scheduler, jitter=min(60.0, interval * 0.05),
+    )
@@ -0,0 +1,298 @@
+# file: gway/scheduler.py
+
+"""One timer thread for all periodic work of a gateway.
+
+:class:`Scheduler` keeps every periodic task in a heap ordered by next run
+time. A single daemon thread sleeps until the earliest one is due and
+hands it to a small worker pool, so dozens of ``every`` jobs, URL/PyPI
+watchers and monitors cost one sleeping thread instead of one each. When
+every worker is busy a due run gets an extra thread of its own rather than
+waiting, and tasks that block for long can ask for a ``dedicated`` thread
+per run so they never occupy the pool.
+
+Each :class:`ScheduledTask` supports random jitter, exponential backoff
+after failures, a cap on overlapping runs and a missed-run policy:
+``"skip"`` resumes at the next slot after falling behind, ``"catchup"``
+runs every missed slot back to back.
+"""
+
+import heapq
+import random
+import threading
+import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEDULER_WORKERS = 8
+
+MISSED_POLICIES = ("skip", "catchup")
+
+
+class ScheduledTask:
+    """A periodic call registered with a :class:`Scheduler`."""
+
+    def __init__(self, scheduler, func, interval, *, name=None, args=(), kwargs=None,
+                 jitter=0.0, backoff=None, max_backoff=None, concurrency=1,
+                 missed="skip", dedicated=False):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if missed not in MISSED_POLICIES:
+            raise ValueError(f"missed must be one of {MISSED_POLICIES}")
+        self.scheduler = scheduler
+        self.func = func
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.name = name or getattr(func, "__name__", repr(func))
+        self.interval = float(interval)
+        self.jitter = float(jitter or 0.0)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.concurrency = max(1, int(concurrency))
+        self.missed = missed
+        self.dedicated = bool(dedicated)
+        self.cancelled = False
+
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.skipped = 0
+        self.running = 0
+        self.total_seconds = 0.0
+        self.last_duration = None
+        self.last_started = None
+        self.last_error = None
+        self.next_run = None  # time.monotonic() of the next run
+
+        self._base = None  # unjittered slot of the next run
+        self._version = 0
+        self._backlog = 0  # catch-up runs waiting for a free slot
+
+    def cancel(self):
+        """Stop scheduling this task; a run in progress finishes."""
+        self.scheduler.cancel(self)
+
+    def run_now(self):
+        """Run as soon as possible, then continue every ``interval``."""
+        self.scheduler.reschedule(self, time.monotonic())
+
+    def is_alive(self):
+        # Lets tasks sit next to threads in ``Runner._async_threads``.
+        return not self.cancelled
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "running": self.running,
+            "dedicated": self.dedicated,
+            "avg_ms": round(self.total_seconds / self.runs * 1000, 3) if self.runs else None,
+            "last_ms": None if self.last_duration is None else round(self.last_duration * 1000, 3),
+            "last_started": self.last_started,
+            "last_error": self.last_error,
+            "next_in": None if self.next_run is None or self.cancelled else round(self.next_run - now, 3),
+            "cancelled": self.cancelled,
+        }
+
+    def __repr__(self):
+        return f"<ScheduledTask {self.name} every {self.interval}s>"
+
+
+class Scheduler:
+    """Heap-based scheduler running due tasks on a thread pool.
+
+    The timer thread and the pool start with the first task. Up to
+    ``workers`` runs share the pool; a run that comes due while all of them
+    are busy starts on an extra thread, and ``on_saturated(task, workers)``
+    is called once each time the pool fills up. ``on_error`` is called as
+    ``on_error(task, exc)`` when a run raises. Neither callback may call
+    back into the scheduler.
+    """
+
+    def __init__(self, *, workers=SCHEDULER_WORKERS, on_error=None, on_saturated=None,
+                 name="gway-scheduler"):
+        self.workers = workers
+        self.on_error = on_error
+        self.on_saturated = on_saturated
+        self.name = name
+        self.tasks = []
+        self.overflows = 0  # runs started outside the pool because it was full
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._pool = None
+        self._busy = 0
+        self._saturated = False
+        self._stopping = False
+
+    def schedule(self, func, interval, *, delay=0.0, **options):
+        """Call ``func`` every ``interval`` seconds, first after ``delay``.
+
+        ``options`` are those of :class:`ScheduledTask` (``name``, ``args``,
+        ``kwargs``, ``jitter``, ``backoff``, ``max_backoff``,
+        ``concurrency``, ``missed``, ``dedicated``).
+        """
+        task = ScheduledTask(self, func, interval, **options)
+        with self._cond:
+            self.tasks.append(task)
+            self._start()
+            self._push(task, time.monotonic() + max(0.0, float(delay)))
+        return task
+
+    def cancel(self, task):
+        with self._cond:
+            task.cancelled = True
+            task._version += 1
+            if task in self.tasks:
+                self.tasks.remove(task)
+            self._cond.notify()
+
+    def reschedule(self, task, when):
+        with self._cond:
+            if not task.cancelled:
+                self._push(task, when)
+
+    def stats(self):
+        with self._cond:
+            return [task.stats() for task in self.tasks]
+
+    def stop(self):
+        """Cancel every task and end the timer thread; running calls finish."""
+        with self._cond:
+            for task in list(self.tasks):
+                task.cancelled = True
+                task._version += 1
+            self.tasks.clear()
+            self._heap.clear()
+            self._stopping = True
+            thread, pool = self._thread, self._pool
+            self._thread = self._pool = None
+            self._cond.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix=f"{self.name}-run"
+            )
+            self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _push(self, task, base):
+        """Queue *task* for the slot *base* (plus jitter). Caller holds the lock."""
+        task._version += 1
+        task._base = base
+        when = base + (random.uniform(0, task.jitter) if task.jitter else 0.0)
+        task.next_run = when
+        heapq.heappush(self._heap, (when, next(self._seq), task._version, task))
+        self._cond.notify()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    while self._heap and self._heap[0][2] != self._heap[0][3]._version:
+                        heapq.heappop(self._heap)  # cancelled or rescheduled
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    wait = self._heap[0][0] - now
+                    if wait > 0:
+                        self._cond.wait(wait)
+                        continue
+                    task = heapq.heappop(self._heap)[3]
+                    break
+                self._dispatch(task, now)
+
+    def _dispatch(self, task, now):
+        """Queue the next slot of *task*, then start this run. Lock held."""
+        slot = task._base + task.interval
+        if task.missed == "skip" and slot <= now:
+            behind = int((now - slot) // task.interval) + 1
+            task.skipped += behind
+            slot += behind * task.interval
+        self._push(task, slot)
+
+        if task.running >= task.concurrency:
+            if task.missed == "catchup":
+                task._backlog += 1
+            else:
+                task.skipped += 1
+            return
+        self._start_run(task)
+
+    def _start_run(self, task):
+        """Run *task* on the pool, or on a thread of its own. Lock held."""
+        task.running += 1
+        if not task.dedicated:
+            if self._busy < self.workers:
+                self._busy += 1
+                self._pool.submit(self._execute, task, True)
+                return
+            self.overflows += 1
+            if not self._saturated:
+                self._saturated = True
+                if self.on_saturated is not None:
+                    try:
+                        self.on_saturated(task, self.workers)
+                    except Exception:
+                        pass
+        threading.Thread(
+            target=self._execute, args=(task, False),
+            name=f"{self.name}-{task.name}", daemon=True,
+        ).start()
+
+    def _execute(self, task, pooled=False):
+        start = time.monotonic()
+        task.last_started = time.time()
+        error = None
+        try:
+            task.func(*task.args, **task.kwargs)
+        except Exception as e:
+            error = e
+        duration = time.monotonic() - start
+
+        with self._cond:
+            if pooled:
+                self._busy -= 1
+                if self._busy < self.workers:
+                    self._saturated = False
+            task.running -= 1
+            task.runs += 1
+            task.total_seconds += duration
+            task.last_duration = duration
+            if error is None:
+                task.consecutive_failures = 0
+                task.last_error = None
+            else:
+                task.failures += 1
+                task.consecutive_failures += 1
+                task.last_error = str(error)
+                if task.backoff and not task.cancelled:
+                    delay = task.interval * task.backoff ** task.consecutive_failures
+                    if task.max_backoff is not None:
+                        delay = min(delay, task.max_backoff)
+                    retry = time.monotonic() + delay
+                    if retry > task._base:
+                        self._push(task, retry)
+                    task._backlog = 0
+            if task._backlog and not task.cancelled and self._pool is not None:
+                task._backlog -= 1
+                self._start_run(task)
+
+        if error is not None and self.on_error is not None:
+            try:
+                self.on_error(task, error)
+            except Exception:
+                pass
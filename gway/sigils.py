@@ -3,6 +3,7 @@
 import re
 import os
 import json
+import functools
 
 class Sigil:
     """Represent a ``[sigil]`` placeholder or plain text."""
@@ -23,13 +24,18 @@ class Sigil:
         return self.original[1:] if self.is_eager else self.original
 
     def _make_lookup(self, finder):
+        if isinstance(finder, Resolver):
+            def lookup(key):
+                # One indexed probe per source covers every spelling of key.
+                val = finder.find_variant(key)
+                if val is None:
+                    val = finder.find_value(key, None, exec=True)
+                return val
+            return lookup
+
         def lookup(key):
             # Try all dash/underscore/case variants
-            variants = {
-                key, key.replace('-', '_'), key.replace('_', '-'),
-                key.lower(), key.upper()
-            }
-            for variant in variants:
+            for variant in _key_variants(key):
                 val = None
                 if isinstance(finder, dict):
                     val = finder.get(variant)
@@ -44,7 +50,7 @@ class Sigil:
         return lookup
 
     def resolve(self, finder):
-        return _replace_sigils(self.text, self._make_lookup(finder))
+        return compile_sigil(self.text).resolve(self._make_lookup(finder))
 
     def list_sigils(self):
         return [match.group(0) for match in self._pattern.finditer(self.text)]
@@ -59,61 +65,142 @@ class Sigil:
         return f"Sigil({self.original!r})"
 
 
+@functools.lru_cache(maxsize=1024)
+def _key_variants(key):
+    """Distinct dash/underscore/case spellings of *key*, exact spelling first."""
+    return tuple(dict.fromkeys((
+        key, key.replace('-', '_'), key.replace('_', '-'), key.lower(), key.upper()
+    )))
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_key(key):
+    """Case- and dash-insensitive form shared by every spelling in :func:`_key_variants`."""
+    return key.lower().replace('-', '_')
+
+
+class _EnvIndex:
+    """Snapshot of ``os.environ`` names grouped by :func:`normalize_key`.
+
+    Only names are cached (values are always read live); the snapshot is
+    rebuilt whenever the number of variables changes or :meth:`refresh` is
+    called.
+    """
+
+    def __init__(self):
+        self._size = -1
+        self._names = {}
+
+    def refresh(self):
+        self._size = -1
+
+    def names(self, norm):
+        if len(os.environ) != self._size:
+            names = {}
+            for name in os.environ:
+                names.setdefault(normalize_key(name), set()).add(name)
+            self._names = names
+            self._size = len(os.environ)
+        return self._names.get(norm, ())
+
+
+ENV_INDEX = _EnvIndex()
+
+
 def _unquote(val):
     if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
         return val[1:-1]
     return val
 
-def _resolve_single(raw, lookup_fn):
-    """Resolve a single sigil value and return it without string conversion."""
-    from gway import gw
-
-    raw = raw.strip()
-    original_raw = raw
-    wrap_with_brackets = raw.startswith('[') and raw.endswith(']')
-    quoted = (raw.startswith('"') and raw.endswith('"')) or (raw.startswith("'") and raw.endswith("'"))
-
-    fallback_spec = None
-    fallback_quoted = False
-    if not quoted:
-        fallback_split = _split_outside_brackets_once(raw, '|')
-        if fallback_split:
-            raw, fallback_spec = fallback_split
-            raw = raw.strip()
-            if fallback_spec is not None:
+def _is_quoted(val):
+    return (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'"))
+
+
+_GW_PREFIX = re.compile(r"^(gw|gway)[. ]+")
+_PATH_SPLIT = re.compile(r"[. ]+")
+
+
+class _Placeholder:
+    """A single ``[...]`` sigil body, parsed once.
+
+    Holds the lookup key, its dotted path, the fallback spec after ``|`` and
+    nested templates for keys that contain sigils themselves.
+    """
+
+    __slots__ = (
+        "raw", "key", "parts", "quoted", "wrap_with_brackets",
+        "nested", "base_nested", "fallback", "fallback_source",
+    )
+
+    def __init__(self, raw):
+        raw = raw.strip()
+        self.raw = raw
+        self.wrap_with_brackets = raw.startswith('[') and raw.endswith(']')
+        quoted = _is_quoted(raw)
+        self.quoted = quoted
+
+        fallback_spec = None
+        if not quoted:
+            fallback_split = _split_outside_brackets_once(raw, '|')
+            if fallback_split:
+                raw, fallback_spec = fallback_split
+                raw = raw.strip()
                 fallback_spec = fallback_spec.strip()
-                fallback_quoted = (
-                    (fallback_spec.startswith('"') and fallback_spec.endswith('"'))
-                    or (fallback_spec.startswith("'") and fallback_spec.endswith("'"))
-                )
 
-    key = _unquote(raw) if quoted else raw
-    key = re.sub(r"^(gw|gway)[. ]+", "", key)
+        # ``fallback`` is a compiled template, "" for an empty fallback, or None.
+        self.fallback = None
+        self.fallback_source = None
+        if fallback_spec is not None:
+            source = _unquote(fallback_spec) if _is_quoted(fallback_spec) else fallback_spec
+            self.fallback_source = source
+            self.fallback = compile_sigil(source) if source else ""
+
+        key = _unquote(raw) if quoted else raw
+        key = _GW_PREFIX.sub("", key)
+        self.key = key
+        self.nested = None
+        if not quoted and '[' in key and ']' in key:
+            self.nested = compile_sigil(key)
+        self.parts = tuple(_PATH_SPLIT.split(key))
+        self.base_nested = None
+        if len(self.parts) > 1 and not quoted and '[' in self.parts[0] and ']' in self.parts[0]:
+            self.base_nested = compile_sigil(self.parts[0])
+
+    def resolve(self, lookup_fn):
+        """Resolve this sigil and return the value without string conversion."""
+        from gway import gw
 
-    if not quoted and '[' in key and ']' in key:
-        try:
-            nested = _replace_sigils(key, lookup_fn)
-        except KeyError:
-            nested = key
-        else:
-            if wrap_with_brackets:
-                if isinstance(nested, str):
-                    return f"[{nested}]"
-                return f"[{json.dumps(nested, default=str)}]"
-            if not isinstance(nested, str):
-                gw.verbose(f"Resolved nested sigil [{raw}] → {nested}")
-                return nested
-            key = nested
-
-    val = lookup_fn(key)
-    if val is None:
-        parts = re.split(r"[. ]+", key)
-        if len(parts) > 1:
+        key = self.key
+        parts = self.parts
+        base_nested = self.base_nested
+
+        if self.nested is not None:
+            try:
+                nested = self.nested.resolve(lookup_fn)
+            except KeyError:
+                pass
+            else:
+                if self.wrap_with_brackets:
+                    if isinstance(nested, str):
+                        return f"[{nested}]"
+                    return f"[{json.dumps(nested, default=str)}]"
+                if not isinstance(nested, str):
+                    if gw.verbose:
+                        gw.verbose(f"Resolved nested sigil [{self.raw}] → {nested}")
+                    return nested
+                key = nested
+                parts = tuple(_PATH_SPLIT.split(key))
+                base_nested = None
+                if len(parts) > 1 and '[' in parts[0] and ']' in parts[0]:
+                    base_nested = compile_sigil(parts[0])
+
+        val = lookup_fn(key)
+        if val is None and len(parts) > 1:
             base_key = parts[0]
             base = lookup_fn(base_key)
-            if base is None and not quoted and '[' in base_key and ']' in base_key:
+            if base is None and base_nested is not None:
                 try:
-                    resolved_base = _replace_sigils(base_key, lookup_fn)
+                    resolved_base = base_nested.resolve(lookup_fn)
                 except KeyError:
                     resolved_base = None
                 else:
@@ -127,27 +214,34 @@ def _resolve_single(raw, lookup_fn):
                 except KeyError:
                     val = None
 
-    if val is not None:
-        gw.verbose(f"Resolved sigil [{original_raw}] → {val}")
-        return val
+        if val is not None:
+            if gw.verbose:
+                gw.verbose(f"Resolved sigil [{self.raw}] → {val}")
+            return val
 
-    if fallback_spec is not None:
-        fallback_source = _unquote(fallback_spec) if fallback_quoted else fallback_spec
-        if fallback_source:
-            try:
-                fallback_value = _replace_sigils(fallback_source, lookup_fn)
-            except KeyError:
-                fallback_value = fallback_source
-        else:
-            fallback_value = ""
-        gw.verbose(f"Sigil [{original_raw}] not resolved, using fallback {fallback_value!r}")
-        return fallback_value
+        if self.fallback is not None:
+            if self.fallback:
+                try:
+                    fallback_value = self.fallback.resolve(lookup_fn)
+                except KeyError:
+                    fallback_value = self.fallback_source
+            else:
+                fallback_value = ""
+            if gw.verbose:
+                gw.verbose(f"Sigil [{self.raw}] not resolved, using fallback {fallback_value!r}")
+            return fallback_value
+
+        if self.quoted:
+            if gw.verbose:
+                gw.verbose(f"Sigil [{self.raw}] not resolved, using quoted literal '{key}'")
+            return key
 
-    if quoted:
-        gw.verbose(f"Sigil [{original_raw}] not resolved, using quoted literal '{key}'")
-        return key
+        raise KeyError(f"Unresolved sigil: [{self.raw}]")
 
-    raise KeyError(f"Unresolved sigil: [{original_raw}]")
+
+def _resolve_single(raw, lookup_fn):
+    """Resolve a single sigil value and return it without string conversion."""
+    return _Placeholder(raw).resolve(lookup_fn)
 
 def _follow_path(value, parts, lookup_fn=None):
     for part in parts:
@@ -165,14 +259,19 @@ def _follow_path(value, parts, lookup_fn=None):
             if part in value:
                 value = value[part]
                 continue
-            if isinstance(part, str):
-                normalized = part.lower().replace('-', '_')
+            if isinstance(part, str) and hasattr(value, "normalized"):
+                names = value.normalized(normalize_key(part))
+                if names:
+                    value = value[names[0]]
+                    continue
+            elif isinstance(part, str):
+                normalized = normalize_key(part)
                 sentinel = object()
                 resolved = sentinel
                 for key, candidate in value.items():
                     if not isinstance(key, str):
                         continue
-                    key_normalized = key.lower().replace('-', '_')
+                    key_normalized = normalize_key(key)
                     if key_normalized == normalized:
                         resolved = candidate
                         break
@@ -218,28 +317,92 @@ def _is_single_sigil(text: str) -> bool:
     return depth == 0
 
 
-def _replace_sigils(text, lookup_fn):
-    """
-    Replace all sigils in the text, raising if any sigil is unresolved.
+class CompiledSigil:
+    """A sigil template parsed once into literal and placeholder segments.
+
+    Resolution walks the segments without rescanning the text. Instances are
+    immutable and shared through :func:`compile_sigil`.
     """
 
-    if isinstance(text, str) and text.startswith('%') and _is_single_sigil(text[1:]):
-        return _resolve_single(text[2:-1], lookup_fn)
+    __slots__ = ("text", "single", "segments")
 
-    if _is_single_sigil(text):
-        return _resolve_single(text[1:-1], lookup_fn)
+    def __init__(self, text):
+        self.text = text
+        self.single = None
+        self.segments = ()
+
+        if isinstance(text, str) and text.startswith('%') and _is_single_sigil(text[1:]):
+            self.single = _Placeholder(text[2:-1])
+            return
+
+        if _is_single_sigil(text):
+            self.single = _Placeholder(text[1:-1])
+            return
+
+        matches = list(Sigil._pattern.finditer(text))
+        if len(matches) == 1 and matches[0].span() == (0, len(text)):
+            self.single = _Placeholder(matches[0].group(1))
+            return
+
+        segments = []
+        pos = 0
+        for match in matches:
+            start, end = match.span()
+            if start > pos:
+                segments.append(text[pos:start])
+            segments.append(_Placeholder(match.group(1)))
+            pos = end
+        if pos < len(text):
+            segments.append(text[pos:])
+        if matches:
+            self.segments = tuple(segments)
 
-    matches = list(Sigil._pattern.finditer(text))
-    if len(matches) == 1 and matches[0].span() == (0, len(text)):
-        return _resolve_single(matches[0].group(1), lookup_fn)
+    @property
+    def placeholders(self):
+        if self.single is not None:
+            return (self.single,)
+        return tuple(seg for seg in self.segments if isinstance(seg, _Placeholder))
+
+    def resolve(self, lookup_fn):
+        """Replace all sigils, raising ``KeyError`` if any is unresolved."""
+        if self.single is not None:
+            return self.single.resolve(lookup_fn)
+        if not self.segments:
+            return self.text
+        out = []
+        for seg in self.segments:
+            if seg.__class__ is str:
+                out.append(seg)
+                continue
+            val = seg.resolve(lookup_fn)
+            out.append(val if isinstance(val, str) else json.dumps(val, default=str))
+        return "".join(out)
 
-    def replacer(match):
-        val = _resolve_single(match.group(1), lookup_fn)
-        if isinstance(val, str):
-            return val
-        return json.dumps(val, default=str)
+    def __repr__(self):
+        return f"CompiledSigil({self.text!r})"
+
+
+# Bounded LRU of parsed templates keyed by their source text.
+SIGIL_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=SIGIL_CACHE_SIZE)
+def _compile_cached(text: str) -> CompiledSigil:
+    return CompiledSigil(text)
 
-    return re.sub(Sigil._pattern, replacer, text)
+
+def compile_sigil(text) -> CompiledSigil:
+    """Return the (cached) :class:`CompiledSigil` for *text*."""
+    if isinstance(text, str):
+        return _compile_cached(text)
+    return CompiledSigil(text)
+
+
+def _replace_sigils(text, lookup_fn):
+    """
+    Replace all sigils in the text, raising if any sigil is unresolved.
+    """
+    return compile_sigil(text).resolve(lookup_fn)
 
 
 def _split_outside_brackets(text: str, delimiter: str) -> list[str]:
@@ -300,7 +463,7 @@ class Resolver:
             try:
                 sigil = arg if isinstance(arg, Sigil) else Sigil(str(arg))
                 lookup = lambda key: self.find_value(key, None, exec=True)
-                result = _replace_sigils(sigil.original, lookup)
+                result = compile_sigil(sigil.original).resolve(lookup)
                 return result
             except KeyError as e:
                 gw.verbose(f"Could not resolve sigil(s) in '{arg}': {e}")
@@ -322,6 +485,10 @@ class Resolver:
                     return val
             elif isinstance(source, dict) and key in source:
                 return source[key]
+            elif hasattr(source, "normalized"):
+                val = source.get(key)
+                if val is not None:
+                    return val
             elif hasattr(source, "__getitem__"):
                 try:
                     val = source[key]
@@ -383,6 +550,45 @@ class Resolver:
 
         return fallback
 
+    def find_variant(self, key: str):
+        """Return the first non-``None`` value stored under any spelling of *key*.
+
+        Spellings are tried in :func:`_key_variants` order against each
+        source, as if :meth:`find_value` were called per variant, but every
+        indexed source (``Results``, ``IndexedDict`` and the environment) is
+        probed once by its normalized key, so a miss costs one dict hit each.
+        """
+        norm = normalize_key(key)
+        hits = []
+        for name, source in self._search_order:
+            if name == "env":
+                names = ENV_INDEX.names(norm)
+            elif hasattr(source, "normalized"):
+                names = source.normalized(norm)
+            else:
+                names = None
+            if names is None or names:
+                hits.append((name, source, names))
+        if not hits:
+            return None
+        for variant in _key_variants(key):
+            for name, source, names in hits:
+                if name == "env":
+                    upper = variant.upper()
+                    val = os.environ.get(upper) if upper in names else None
+                elif names is not None:
+                    val = source.get(variant) if variant in names else None
+                elif isinstance(source, dict):
+                    val = source.get(variant)
+                else:
+                    try:
+                        val = source[variant]
+                    except Exception:
+                        val = None
+                if val is not None:
+                    return val
+        return None
+
     def _resolve_key(self, key: str, fallback: str = None) -> str:
         key = key.strip()
         key = re.sub(r"^(gw|gway)[. ]+", "", key)
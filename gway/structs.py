@@ -2,7 +2,96 @@
 
 import threading
 import collections
-from types import SimpleNamespace
+from types import MethodType, SimpleNamespace
+
+from .sigils import normalize_key
+
+
+class IndexedDict(dict):
+    """dict with a mutation counter and a normalized-key index.
+
+    ``version`` increases on every mutation made through the dict API, so
+    callers can tell cheaply whether cached lookups are still valid.
+    :meth:`normalized` returns the keys whose :func:`normalize_key` form
+    matches, letting every case/dash spelling of a key be found with a
+    single dict hit. The index is built on first use and kept up to date
+    incrementally afterwards.
+    """
+
+    __slots__ = ("version", "_index")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self._index = None
+
+    def normalized(self, norm):
+        index = self._index
+        if index is None:
+            index = {}
+            for key in self:
+                if isinstance(key, str):
+                    index.setdefault(normalize_key(key), []).append(key)
+            self._index = index
+        return index.get(norm, ())
+
+    def _indexed(self, key):
+        if self._index is not None and isinstance(key, str):
+            self._index.setdefault(normalize_key(key), []).append(key)
+
+    def _unindexed(self, key):
+        if self._index is not None and isinstance(key, str):
+            names = self._index.get(normalize_key(key))
+            if names:
+                names.remove(key)
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._indexed(key)
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._unindexed(key)
+        self.version += 1
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = super().pop(key)
+            self._unindexed(key)
+            self.version += 1
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._unindexed(key)
+        self.version += 1
+        return key, value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._index = None
+        self.version += 1
+
+    def __reduce__(self):
+        # pickle and copy would otherwise restore items through __setitem__
+        # before the slots exist.
+        return type(self), (dict(self),)
 
 
 class Results(collections.ChainMap):
@@ -14,7 +103,7 @@ class Results(collections.ChainMap):
     def __init__(self):
         """Initialize the ChainMap with thread-local storage."""
         if not hasattr(self._thread_local, 'maps'):
-            self._thread_local.maps = [{}]  # Initialize an empty dict for the current thread
+            self._thread_local.maps = [IndexedDict()]  # Initialize an empty dict for the current thread
         
         # Call the parent constructor with the thread-local storage map
         super().__init__(*self._thread_local.maps)
@@ -49,6 +138,15 @@ class Results(collections.ChainMap):
     def get_results(self):
         """Return the current results stored for the thread."""
         return self.maps[0]
+
+    @property
+    def version(self):
+        """Mutation counter of the current map."""
+        return self.maps[0].version
+
+    def normalized(self, norm):
+        """Keys of the current map matching a :func:`normalize_key` form."""
+        return self.maps[0].normalized(norm)
     
 
 class Project(SimpleNamespace):
@@ -62,6 +160,53 @@ class Project(SimpleNamespace):
         self._name = name
         # _default_func is no longer used for guessing
         self._default_func = None
+        # Lazily loaded functions: name -> loader for the defining module.
+        self._lazy = {}
+        self._aliases = {}
+        self._pending = []
+        self._lazy_lock = threading.RLock()
+
+    def _defer(self, names, loader, aliases=()):
+        """Register *names* as functions provided by *loader* on first access.
+
+        ``loader`` is called without arguments and must return a
+        ``(module, funcs)`` pair where ``funcs`` maps names to wrapped callables.
+        ``aliases`` are other names the module binds (imports, assignments);
+        they are not listed by ``dir()`` but looking one up loads the module
+        in case it is a function.
+        """
+        self._pending.append(loader)
+        for name in names:
+            if name not in self.__dict__:
+                self._lazy[name] = loader
+        for name in aliases:
+            if name not in self.__dict__:
+                self._aliases.setdefault(name, loader)
+
+    def _materialize(self, loader):
+        with self._lazy_lock:
+            if loader not in self._pending:
+                return
+            mod, funcs = loader()
+            self._pending.remove(loader)
+            for lazy in (self._lazy, self._aliases):
+                for name in [n for n, l in lazy.items() if l is loader]:
+                    del lazy[name]
+            for name, func in funcs.items():
+                # Subprojects keep precedence over same-named root functions.
+                if isinstance(self.__dict__.get(name), Project):
+                    continue
+                setattr(self, name, func)
+            if hasattr(mod, "__getattr__"):
+                self.__getattr__ = MethodType(mod.__getattr__, self)
+
+    def _load_all(self):
+        """Import every module still pending in this namespace."""
+        for loader in list(self.__dict__.get("_pending", ())):
+            self._materialize(loader)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__dict__.get("_lazy", ())))
 
     def __call__(self, *args, **kwargs):
         """
@@ -71,6 +216,8 @@ class Project(SimpleNamespace):
         from gway import gw
         from gway.console import show_functions
 
+        self._load_all()
+
         # Gather all callables in this namespace
         functions = {
             name: func
@@ -89,6 +236,21 @@ class Project(SimpleNamespace):
         ``AttributeError`` we fall back to the standard verb-based lookup.
         """
 
+        if self.__dict__.get("_pending") and not (name.startswith("__") and name.endswith("__")):
+            # Modules with their own ``__getattr__`` are never deferred, so a
+            # name the manifest does not know cannot appear by loading more.
+            lazy = self._lazy
+            loader = lazy.get(name) or self._aliases.get(name)
+            if loader is None and "_" not in name and "-" not in name:
+                loader = lazy.get(f"{name}_{self._name.rsplit('.', 1)[-1]}")
+            if loader is not None:
+                try:
+                    self._materialize(loader)
+                except Exception as e:
+                    raise AttributeError(f"Unable to load {self._name}.{name} ({e})") from e
+                if name in self.__dict__:
+                    return self.__dict__[name]
+
         custom = self.__dict__.get("__getattr__")
         if custom is not None and custom is not Project.__getattr__:
             try:
@@ -0,0 +1,366 @@
+# file: gway/watchers.py
+
+"""File change notification for ``gw.until`` and long-running viewers.
+
+:func:`watch_paths` watches files and directory trees on a daemon thread
+and calls a handler with the set of paths that really changed. On Linux
+it blocks on inotify (through ``ctypes``), so changes are seen within
+milliseconds and an idle watcher costs nothing; elsewhere, or when
+inotify is unavailable, it falls back to polling ``os.stat`` every
+``interval`` seconds.
+
+Either way a path only counts as changed when its ``(mtime, size)``
+differs from the last one seen, and with ``hash=True`` when its BLAKE2
+digest differs as well. Files are hashed only after their stat changed.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import hashlib
+import threading
+
+# How often a blocked watcher checks its stop event.
+STOP_CHECK = 0.25
+# Events arriving this close together are handled as one batch...
+SETTLE = 0.05
+# ...for at most this long, so a constantly written file still reports.
+MAX_SETTLE = 0.5
+
+_HASH_CHUNK = 1 << 20
+
+_MISSING = object()
+
+
+class Watch(threading.Event):
+    """Stop event of a running watcher; ``set()`` ends it."""
+
+    def __init__(self):
+        super().__init__()
+        self.thread = None
+        self.backend = None
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_CHUNK), b""):
+                h.update(block)
+    except OSError:
+        return None
+    return h.digest()
+
+
+def _walk(root, files=True):
+    """Yield directories (and files) under *root* using ``os.scandir``."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        yield current
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                stack.append(entry.path)
+            elif files:
+                yield entry.path
+
+
+class _Tracker:
+    """Last known ``(stat, digest)`` per path and the rules for "changed".
+
+    Explicit files behave like the old pollers: a file that appears after
+    the watch started only sets the baseline (unless ``created``), and a
+    deleted file keeps its last stat so that recreating it counts. Inside
+    watched directories any added, removed or modified file is a change.
+    """
+
+    def __init__(self, paths, *, hash=False, preload=False, created=False):
+        self.hash = hash
+        self.created = created
+        self.files = set()
+        self.dirs = set()
+        self.known = {}
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self.dirs.add(path)
+            else:
+                self.files.add(path)
+                self.known[path] = self._entry(path)
+        # Polling (and hashing) need a baseline for every file under the
+        # directories; inotify without hashing does not.
+        if preload or hash:
+            for root in self.dirs:
+                for path in _walk(root):
+                    if path not in self.dirs and not os.path.isdir(path):
+                        self.known[path] = self._entry(path)
+
+    def _entry(self, path):
+        sig = _stat(path)
+        return sig, (_digest(path) if self.hash and sig else None)
+
+    def changed(self, path):
+        sig = _stat(path)
+        old = self.known.get(path, _MISSING)
+        in_dir = path not in self.files
+        if old is _MISSING:
+            self.known[path] = (sig, _digest(path) if self.hash and sig else None)
+            return in_dir
+        old_sig, old_digest = old
+        if sig == old_sig:
+            return False
+        if sig is None:
+            if in_dir:
+                self.known[path] = (None, None)
+            return in_dir
+        digest = _digest(path) if self.hash else None
+        self.known[path] = (sig, digest)
+        if old_sig is None:
+            return in_dir or self.created
+        return not self.hash or digest != old_digest
+
+    def candidates(self):
+        """Every path a poll has to look at."""
+        paths = set(self.files)
+        paths.update(self.known)
+        for root in self.dirs:
+            for path in _walk(root):
+                if path not in self.dirs and not os.path.isdir(path):
+                    paths.add(path)
+        return paths
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        _libc = libc
+    return _libc
+
+
+def inotify_available():
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = _load_libc()
+        return hasattr(libc, "inotify_init1")
+    except (OSError, AttributeError):
+        return False
+
+
+class Inotify:
+    """Minimal inotify wrapper: directory watches and batched event reads."""
+
+    def __init__(self):
+        import ctypes
+
+        self._libc = _load_libc()
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+        self.dirs = {}  # wd -> directory path
+        self.watched = set()
+
+    def add(self, directory):
+        import ctypes
+
+        if directory in self.watched:
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(err, os.strerror(err), directory)
+        self.dirs[wd] = directory
+        self.watched.add(directory)
+
+    def read(self, timeout):
+        """Return ``[(directory, name, mask), ...]`` or ``[]`` after *timeout*."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self.dirs.get(wd)
+            if mask & IN_IGNORED:
+                if directory is not None:
+                    self.dirs.pop(wd, None)
+                    self.watched.discard(directory)
+                continue
+            events.append((directory, os.fsdecode(name), mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _inotify_watch(tracker, ino):
+    """Add the watches for *tracker*; returns ``{directory: recursive}``."""
+    roots = {}
+    for root in tracker.dirs:
+        for directory in _walk(root, files=False):
+            ino.add(directory)
+            roots[directory] = True
+    # Files are watched through their directory so that editors replacing
+    # them by rename are still seen.
+    for path in tracker.files:
+        parent = os.path.dirname(path)
+        ino.add(parent)
+        if parent not in ino.watched:
+            raise OSError(errno.ENOENT, "cannot watch directory", parent)
+        roots.setdefault(parent, False)
+    return roots
+
+
+def _inotify_loop(tracker, handler, stop, ino, roots):
+    def batch_paths(events):
+        paths = set()
+        for directory, name, mask in events:
+            if mask & IN_Q_OVERFLOW:
+                paths.update(tracker.candidates())
+                continue
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR:
+                if roots.get(directory) and mask & (IN_CREATE | IN_MOVED_TO):
+                    for sub in _walk(path, files=False):
+                        ino.add(sub)
+                        roots[sub] = True
+                    paths.update(p for p in _walk(path) if not os.path.isdir(p))
+                continue
+            if path in tracker.files or roots.get(directory):
+                paths.add(path)
+        return paths
+
+    while not stop.is_set():
+        events = ino.read(STOP_CHECK)
+        if not events:
+            continue
+        deadline = time.monotonic() + MAX_SETTLE
+        while time.monotonic() < deadline:
+            more = ino.read(SETTLE)
+            if not more:
+                break
+            events.extend(more)
+        changed = {path for path in batch_paths(events) if tracker.changed(path)}
+        if changed and handler(changed):
+            break
+
+
+def _poll_loop(tracker, handler, stop, interval):
+    while not stop.wait(interval):
+        changed = {path for path in tracker.candidates() if tracker.changed(path)}
+        if changed and handler(changed):
+            break
+
+
+def watch_paths(paths, handler, *, interval=10.0, hash=False, backend=None,
+                created=False, stop_event=None):
+    """Watch *paths* and call ``handler(changed_paths)`` for each batch of changes.
+
+    Directories are watched recursively. The watch ends when the handler
+    returns true or the returned :class:`Watch` (or *stop_event*) is set.
+    ``backend`` is ``"inotify"``, ``"poll"`` or ``None`` to pick inotify
+    when available; ``GWAY_WATCH_BACKEND`` overrides the automatic choice.
+    ``interval`` only applies to polling.
+    """
+    stop = stop_event if stop_event is not None else Watch()
+    backend = backend or os.environ.get("GWAY_WATCH_BACKEND") or (
+        "inotify" if inotify_available() else "poll"
+    )
+    tracker = _Tracker(paths, hash=hash, preload=backend != "inotify", created=created)
+    ino = roots = None
+    if backend == "inotify":
+        try:
+            ino = Inotify()
+            roots = _inotify_watch(tracker, ino)
+        except OSError:
+            # No inotify, or out of watches (fs.inotify.max_user_watches)
+            if ino is not None:
+                ino.close()
+                ino = None
+            backend = "poll"
+            tracker = _Tracker(paths, hash=hash, preload=True, created=created)
+
+    def run():
+        try:
+            if ino is not None:
+                try:
+                    _inotify_loop(tracker, handler, stop, ino, roots)
+                finally:
+                    ino.close()
+            else:
+                _poll_loop(tracker, handler, stop, interval)
+        finally:
+            stop.set()
+
+    thread = threading.Thread(target=run, name="gway-watch", daemon=True)
+    if isinstance(stop, Watch):
+        stop.thread = thread
+        stop.backend = backend
+    thread.start()
+    return stop
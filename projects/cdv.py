@@ -1,9 +1,24 @@
 # projects/cdv.py
 
 import os
+import time
+import threading
+from contextlib import contextmanager
 from gway import gw
 from urllib.parse import quote, unquote
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Updates append the full record as a new line (the last line for an id wins,
+# so the file stays valid CDV). Once superseded lines make up more than
+# COMPACT_RATIO of a file with at least COMPACT_MIN_LINES lines, it is
+# rewritten with one line per record.
+COMPACT_RATIO = 0.5
+COMPACT_MIN_LINES = 1000
+
 
 def _encode(val):
     # Only encode if non-empty string
@@ -19,6 +34,136 @@ def _resolve_path(pathlike):
     return gw.resource(pathlike)
 
 
+def _iter_table(path):
+    """Yield ``(entry, fields)`` for each record line of a CDV file."""
+    with open(path, "r") as f:
+        yield from parse_records(f)
+
+
+def parse_records(lines):
+    """Yield ``(entry_id, fields)`` for each record in an iterable of CDV lines.
+
+    Lets a caller make several passes over one open file handle, which keeps
+    reading the same file even if the table is rewritten in the meantime.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or ":" not in line:
+            continue
+        parts = line.split(":")
+        entry = parts[0].strip()
+        fields = {}
+        for part in parts[1:]:
+            if "=" in part:
+                k, v = part.split("=", 1)
+                fields[k.strip()] = _decode(v.strip())
+        yield entry, fields
+
+
+def _format_line(entry_id, fields):
+    return entry_id + "".join(f":{k}={_encode(v)}" for k, v in fields.items()) + "\n"
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class _TableIndex:
+    """Parsed records of one CDV file plus the stamp they were read at."""
+
+    __slots__ = ("records", "stamp", "lines")
+
+    def __init__(self, path, records=None):
+        self.stamp = _file_stamp(path)
+        if records is not None:
+            self.records = dict(records)
+            self.lines = len(records)
+            return
+        self.records = {}
+        self.lines = 0
+        if self.stamp is None:
+            return
+        for entry, fields in _iter_table(path):
+            self.records[entry] = fields
+            self.lines += 1
+
+
+_indexes = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _index(path):
+    """Return the warm index for ``path``, re-reading the file if it changed."""
+    path = str(path)
+    idx = _indexes.get(path)
+    if idx is None or idx.stamp != _file_stamp(path):
+        idx = _indexes[path] = _TableIndex(path)
+    return idx
+
+
+def _path_lock(path):
+    with _registry_lock:
+        return _locks.setdefault(str(path), threading.RLock())
+
+
+@contextmanager
+def _locked(path):
+    """Serialize writers to ``path`` across threads and processes."""
+    path = str(path)
+    with _path_lock(path):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{path}.lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _append(path, idx, records):
+    """Append ``records`` ({id: fields}) as log lines and update the index."""
+    path = str(path)
+    with open(path, "a+b") as f:
+        data = "".join(_format_line(e, fields) for e, fields in records.items())
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = "\n" + data
+        f.write(data.encode())
+    idx.records.update(records)
+    idx.lines += len(records)
+    idx.stamp = _file_stamp(path)
+    if idx.lines >= COMPACT_MIN_LINES and idx.lines - len(idx.records) > idx.lines * COMPACT_RATIO:
+        _rewrite(path, idx.records)
+
+
+def _rewrite(path, records):
+    """Atomically replace ``path`` with one line per record (temp file + rename)."""
+    path = str(path)
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            f.writelines(_format_line(e, fields) for e, fields in records.items())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _indexes[path] = _TableIndex(path, records)
+
+
 def _read_table(path):
     """Read and parse a CDV table file."""
     if not path:
@@ -26,31 +171,15 @@ def _read_table(path):
     if not os.path.exists(path):
         gw.error(f"Table file not found: {path}")
         return {}
-    result = {}
-    with open(path, "r") as f:
-        for lineno, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line or ":" not in line:
-                continue
-            parts = line.split(":")
-            entry = parts[0].strip()
-            fields = {}
-            for part in parts[1:]:
-                if "=" in part:
-                    k, v = part.split("=", 1)
-                    fields[k.strip()] = _decode(v.strip())
-            result[entry] = fields
-    return result
+    with _path_lock(path):
+        records = _index(path).records
+        return {entry: dict(fields) for entry, fields in records.items()}
 
 
 def _write_table(path, records):
     """Write the complete dict of records to a CDV table file."""
-    with open(path, "w") as f:
-        for entry_id, fields in records.items():
-            line = entry_id + "".join(
-                f":{k}={_encode(v)}" for k, v in fields.items()
-            )
-            f.write(line + "\n")
+    with _locked(path):
+        _rewrite(path, records)
 
 
 def load_all(pathlike: str) -> dict[str, dict[str, str]]:
@@ -62,30 +191,55 @@ def load_all(pathlike: str) -> dict[str, dict[str, str]]:
         gw.abort(f"Failed to read table '{pathlike}': {e}")
 
 
+def iter_records(pathlike: str):
+    """Stream ``(entry_id, fields)`` pairs in file order without loading the table.
+
+    Repeated ids are yielded each time they appear; the last one wins in
+    :func:`load_all`.
+    """
+    path = _resolve_path(pathlike)
+    if not os.path.exists(path):
+        gw.error(f"Table file not found: {path}")
+        return
+    yield from _iter_table(path)
+
+
+def compact(table_path: str) -> int:
+    """Rewrite a CDV table with one line per record. Returns lines removed."""
+    path = _resolve_path(table_path)
+    with _locked(path):
+        idx = _index(path)
+        removed = idx.lines - len(idx.records)
+        if removed:
+            _rewrite(path, idx.records)
+    return removed
+
+
 def update(table_path: str, entry_id: str, **fields):
     """Append or update a record in the CDV table, preserving unspecified fields."""
     if not entry_id or not table_path:
         return
     path = _resolve_path(table_path)
-    records = _read_table(path)
-    existing = records.get(entry_id, {})
-    existing.update(fields)
-    records[entry_id] = existing
-    _write_table(path, records)
+    with _locked(path):
+        idx = _index(path)
+        record = {**idx.records.get(entry_id, {}), **fields}
+        _append(path, idx, {entry_id: record})
     gw.info(f"Updated table with ID={entry_id}")
 
 
 def validate(table_path: str, entry: str, *, validator=None) -> bool:
     """
-    Validate a CDV entry by ID directly from file.
-    Always reloads the file from disk to avoid stale data.
+    Validate a CDV entry by ID.
+    Answers from the in-memory index, which is re-read whenever the file changes.
     """
     path = _resolve_path(table_path)
-    table = _read_table(path)
-    if not table:
+    with _path_lock(path):
+        idx = _index(path)
+        record = idx.records.get(entry)
+        table_loaded = bool(idx.records)
+    if not table_loaded:
         gw.warn("No table loaded — rejecting validation request.")
         return False
-    record = table.get(entry)
     if not record:
         return False
     if validator:
@@ -100,15 +254,12 @@ def validate(table_path: str, entry: str, *, validator=None) -> bool:
 def copy(table_path: str, old_entry: str, new_entry: str, **kwargs) -> bool:
     """Copy a record from old_entry to new_entry, optionally updating fields."""
     path = _resolve_path(table_path)
-    records = _read_table(path)
-    if old_entry not in records:
-        gw.warn(f"Entry '{old_entry}' does not exist; cannot copy.")
-        return False
-    # Shallow copy of fields
-    new_fields = records[old_entry].copy()
-    new_fields.update(kwargs)
-    records[new_entry] = new_fields
-    _write_table(path, records)
+    with _locked(path):
+        idx = _index(path)
+        if old_entry not in idx.records:
+            gw.warn(f"Entry '{old_entry}' does not exist; cannot copy.")
+            return False
+        _append(path, idx, {new_entry: {**idx.records[old_entry], **kwargs}})
     gw.info(f"Copied '{old_entry}' to '{new_entry}' with updates: {kwargs}")
     return True
 
@@ -116,33 +267,41 @@ def copy(table_path: str, old_entry: str, new_entry: str, **kwargs) -> bool:
 def move(table_path: str, old_entry: str, new_entry: str, **kwargs) -> bool:
     """Move a record from old_entry to new_entry, optionally updating fields."""
     path = _resolve_path(table_path)
-    records = _read_table(path)
-    if old_entry not in records:
-        gw.warn(f"Entry '{old_entry}' does not exist; cannot move.")
-        return False
-    new_fields = records[old_entry].copy()
-    new_fields.update(kwargs)
-    records[new_entry] = new_fields
-    del records[old_entry]
-    _write_table(path, records)
+    with _locked(path):
+        idx = _index(path)
+        if old_entry not in idx.records:
+            gw.warn(f"Entry '{old_entry}' does not exist; cannot move.")
+            return False
+        records = dict(idx.records)
+        records[new_entry] = {**records.pop(old_entry), **kwargs}
+        _rewrite(path, records)
     gw.info(f"Moved '{old_entry}' to '{new_entry}' with updates: {kwargs}")
     return True
 
 
+def _adjust(table_path, entry, field, sign, kwargs, action):
+    path = _resolve_path(table_path)
+    with _locked(path):
+        idx = _index(path)
+        if entry not in idx.records:
+            gw.warn(f"Entry '{entry}' does not exist; cannot {action}.")
+            return None
+        amt = float(kwargs.pop('amount', 1))
+        record = dict(idx.records[entry])
+        record[field] = str(float(record.get(field, 0)) + sign * amt)
+        record.update(kwargs)
+        _append(path, idx, {entry: record})
+    return amt, record[field]
+
+
 def credit(table_path: str, entry: str, *, field: str = 'balance', **kwargs) -> bool:
     """Add 1 (or amount from kwargs) to the given field for a record."""
-    path = _resolve_path(table_path)
-    records = _read_table(path)
-    if entry not in records:
-        gw.warn(f"Entry '{entry}' does not exist; cannot credit.")
-        return False
     try:
-        amt = float(kwargs.pop('amount', 1))
-        prev = float(records[entry].get(field, 0))
-        records[entry][field] = str(prev + amt)
-        records[entry].update(kwargs)
-        _write_table(path, records)
-        gw.info(f"Credited {amt} to '{entry}' field '{field}'. New value: {records[entry][field]}")
+        result = _adjust(table_path, entry, field, 1, kwargs, "credit")
+        if result is None:
+            return False
+        amt, value = result
+        gw.info(f"Credited {amt} to '{entry}' field '{field}'. New value: {value}")
         return True
     except Exception as e:
         gw.error(f"credit failed: {e}")
@@ -151,24 +310,77 @@ def credit(table_path: str, entry: str, *, field: str = 'balance', **kwargs) ->
 
 def debit(table_path: str, entry: str, *, field: str = 'balance', **kwargs) -> bool:
     """Subtract 1 (or amount from kwargs) from the given field for a record."""
-    path = _resolve_path(table_path)
-    records = _read_table(path)
-    if entry not in records:
-        gw.warn(f"Entry '{entry}' does not exist; cannot debit.")
-        return False
     try:
-        amt = float(kwargs.pop('amount', 1))
-        prev = float(records[entry].get(field, 0))
-        records[entry][field] = str(prev - amt)
-        records[entry].update(kwargs)
-        _write_table(path, records)
-        gw.info(f"Debited {amt} from '{entry}' field '{field}'. New value: {records[entry][field]}")
+        result = _adjust(table_path, entry, field, -1, kwargs, "debit")
+        if result is None:
+            return False
+        amt, value = result
+        gw.info(f"Debited {amt} from '{entry}' field '{field}'. New value: {value}")
         return True
     except Exception as e:
         gw.error(f"debit failed: {e}")
         return False
 
 
+def benchmark(entries: int = 100_000, updates: int = 1000, *,
+              path: str = "work/cdv_bench.cdv") -> dict:
+    """Time credits and lookups against a table of ``entries`` records.
+
+    The indexed engine is compared with re-reading and rewriting the whole
+    file for every update, which is what each mutation used to cost.
+    """
+    full = str(_resolve_path(path))
+    records = {f"{i:08X}": {"user": f"user{i}", "balance": "100"} for i in range(entries)}
+    _write_table(full, records)
+    ids = list(records)
+    pick = [ids[(i * 7919) % entries] for i in range(updates)]
+    try:
+        rounds = min(updates, 10)
+        start = time.perf_counter()
+        for entry in pick[:rounds]:
+            table = dict(_iter_table(full))
+            table[entry] = {**table[entry], "balance": "99.0"}
+            with open(full, "w") as f:
+                f.writelines(_format_line(e, fields) for e, fields in table.items())
+        rewrite = (time.perf_counter() - start) / rounds
+
+        _indexes.pop(full, None)
+        start = time.perf_counter()
+        _read_table(full)
+        cold_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for entry in pick:
+            credit(full, entry)
+        indexed = (time.perf_counter() - start) / updates
+
+        start = time.perf_counter()
+        for entry in pick:
+            validate(full, entry)
+        lookup = (time.perf_counter() - start) / updates
+    finally:
+        _indexes.pop(full, None)
+        for leftover in (full, f"{full}.lock"):
+            try:
+                os.remove(leftover)
+            except OSError:
+                pass
+    result = {
+        "entries": entries,
+        "updates": updates,
+        "cold_load": cold_load,
+        "rewrite_per_op": rewrite,
+        "indexed_per_op": indexed,
+        "validate_per_op": lookup,
+        "speedup": rewrite / indexed if indexed else float("inf"),
+    }
+    gw.info(
+        f"CDV {entries} entries: {indexed * 1e6:.0f}us/update indexed vs "
+        f"{rewrite * 1e3:.1f}ms/update rewriting ({result['speedup']:.0f}x)"
+    )
+    return result
+
+
 def view_colon_validator(*, text=None):
     
     # can paste a CDV file into a large textarea and submit for validation as 'text'.
@@ -218,13 +430,15 @@ def delete(table_path: str, entry_id: str):
     Remove a record by ID from the CDV table.
     """
     path = _resolve_path(table_path)
-    records = _read_table(path)
-    if entry_id in records:
+    with _locked(path):
+        idx = _index(path)
+        if entry_id not in idx.records:
+            return False
+        records = dict(idx.records)
         del records[entry_id]
-        _write_table(path, records)
-        gw.info(f"Deleted record '{entry_id}' from table.")
-        return True
-    return False
+        _rewrite(path, records)
+    gw.info(f"Deleted record '{entry_id}' from table.")
+    return True
 
 
 def _sanitize_filename(name: str) -> str:
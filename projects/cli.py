@@ -19,7 +19,10 @@ def _walk(ns: Project, parts: list[str]) -> list[list[str]]:
     for name in dir(ns):
         if name.startswith("_"):
             continue
-        obj = getattr(ns, name)
+        try:
+            obj = getattr(ns, name)
+        except (AttributeError, ImportError):
+            continue
         if isinstance(obj, Project):
             commands.extend(_walk(obj, parts + [name]))
         elif inspect.isfunction(obj):
@@ -2,142 +2,237 @@
 """Helper utilities for building the `gw.help` database."""
 
 import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from gway import gw
+from gway.manifest import describe_module
 import re
 import ast
 
+DB_FILE = "data/help.sqlite"
+SCHEMA_VERSION = "2"
 
-def build(*, update: bool = False):
-    """Build or update the help database used by :func:`gw.help`."""
-    import inspect
+# Rows are keyed by the file they come from (``path``) so a changed file
+# only replaces its own rows. ``help_files`` holds the content hash each
+# file had when it was indexed.
+_SCHEMA = (
+    """CREATE VIRTUAL TABLE help USING fts5(
+        project, function, signature, docstring, source, todos, tests,
+        path UNINDEXED, tokenize='porter')""",
+    "CREATE TABLE param_types (project TEXT, function TEXT, name TEXT, type TEXT, path TEXT)",
+    "CREATE TABLE return_types (project TEXT, function TEXT, type TEXT, path TEXT)",
+    "CREATE TABLE providers (type TEXT, project TEXT, function TEXT, path TEXT)",
+    "CREATE TABLE refs (project TEXT, function TEXT, ref TEXT, path TEXT)",
+    "CREATE TABLE test_refs (target TEXT, test TEXT, path TEXT)",
+    "CREATE TABLE help_files (path TEXT PRIMARY KEY, kind TEXT, project TEXT, hash TEXT)",
+    "CREATE TABLE help_meta (key TEXT PRIMARY KEY, value TEXT)",
+    "CREATE INDEX param_types_func ON param_types (project, function)",
+    "CREATE INDEX return_types_func ON return_types (project, function)",
+    "CREATE INDEX providers_type ON providers (type)",
+    "CREATE INDEX refs_func ON refs (project, function)",
+    "CREATE INDEX test_refs_target ON test_refs (target)",
+)
+_TABLES = ("help", "param_types", "return_types", "providers", "refs",
+           "test_refs", "help_files", "help_meta")
+_PATH_TABLES = ("param_types", "return_types", "providers", "refs", "test_refs")
 
+
+def build(*, update: bool = False, force: bool = False, workers: int = None):
+    """Build or update the help database used by :func:`gw.help`.
+
+    Signatures, docstrings, TODOs and ``gw`` references are read from the
+    source with :mod:`ast`; no project is imported. With ``update`` only
+    files whose content hash changed are indexed again, ``force`` rebuilds
+    everything. ``workers`` parses changed files on that many processes.
+    """
     db_path = gw.resource("data", "help.sqlite")
-    test_map = _scan_tests("tests")
-    if not update and os.path.isfile(db_path):
+    if not (update or force) and os.path.isfile(db_path):
         gw.info("Help database already exists; skipping build.")
         return db_path
 
-    with gw.sql.open_db(datafile="data/help.sqlite") as cursor:
-        cursor.execute("DROP TABLE IF EXISTS help")
-        cursor.execute("DROP TABLE IF EXISTS param_types")
-        cursor.execute("DROP TABLE IF EXISTS return_types")
-        cursor.execute("DROP TABLE IF EXISTS providers")
-        cursor.execute(
-            """
-            CREATE VIRTUAL TABLE help USING fts5(
-                project, function, signature, docstring, source, todos, tests, tokenize='porter')
-            """
-        )
-        cursor.execute(
-            """CREATE TABLE param_types (project TEXT, function TEXT, name TEXT, type TEXT)"""
-        )
-        cursor.execute(
-            """CREATE TABLE return_types (project TEXT, function TEXT, type TEXT)"""
-        )
-        cursor.execute(
-            """CREATE TABLE providers (type TEXT, project TEXT, function TEXT)"""
-        )
-
-        for dotted_path in _walk_projects("projects"):
-            try:
-                project_obj = gw.load_project(dotted_path)
-                for fname in dir(project_obj):
-                    if fname.startswith("_"):
-                        continue
-                    func = getattr(project_obj, fname, None)
-                    if not callable(func):
-                        continue
-                    raw_func = getattr(func, "__wrapped__", func)
-                    doc = inspect.getdoc(raw_func) or ""
-                    sig = str(inspect.signature(raw_func))
-                    param_types, return_type, provides = _parse_doc(doc)
-                    try:
-                        source = "".join(inspect.getsourcelines(raw_func)[0])
-                    except OSError:
-                        source = ""
-                    todos = _extract_todos(source)
-                    tests = "\n".join(test_map.get(f"{dotted_path}.{fname}", []))
-                    cursor.execute(
-                        "INSERT INTO help VALUES (?, ?, ?, ?, ?, ?, ?)",
-                        (
-                            dotted_path,
-                            fname,
-                            sig,
-                            doc,
-                            source,
-                            "\n".join(todos),
-                            tests,
-                        ),
-                    )
-                    for p, t in param_types.items():
-                        cursor.execute(
-                            "INSERT INTO param_types VALUES (?, ?, ?, ?)",
-                            (dotted_path, fname, p, t),
-                        )
-                    if return_type:
-                        cursor.execute(
-                            "INSERT INTO return_types VALUES (?, ?, ?)",
-                            (dotted_path, fname, return_type),
-                        )
-                    provider_type = provides or (
-                        return_type if return_type and not _is_builtin_type(return_type) else None
-                    )
-                    if provider_type:
-                        cursor.execute(
-                            "INSERT INTO providers VALUES (?, ?, ?)",
-                            (provider_type, dotted_path, fname),
-                        )
-            except Exception as e:
-                gw.warning(f"Skipping project {dotted_path}: {e}")
-
-        for name, func in gw._builtins.items():
-            raw_func = getattr(func, "__wrapped__", func)
-            doc = inspect.getdoc(raw_func) or ""
-            sig = str(inspect.signature(raw_func))
-            param_types, return_type, provides = _parse_doc(doc)
-            try:
-                source = "".join(inspect.getsourcelines(raw_func)[0])
-            except OSError:
-                source = ""
-            todos = _extract_todos(source)
-            tests = "\n".join(test_map.get(f"builtin.{name}", []))
-            cursor.execute(
-                "INSERT INTO help VALUES (?, ?, ?, ?, ?, ?, ?)",
-                ("builtin", name, sig, doc, source, "\n".join(todos), tests),
-            )
-            for p, t in param_types.items():
-                cursor.execute(
-                    "INSERT INTO param_types VALUES (?, ?, ?, ?)",
-                    ("builtin", name, p, t),
-                )
-            if return_type:
-                cursor.execute(
-                    "INSERT INTO return_types VALUES (?, ?, ?)",
-                    ("builtin", name, return_type),
-                )
-            provider_type = provides or (
-                return_type if return_type and not _is_builtin_type(return_type) else None
-            )
-            if provider_type:
-                cursor.execute(
-                    "INSERT INTO providers VALUES (?, ?, ?)",
-                    (provider_type, "builtin", name),
-                )
-
-        cursor.execute("COMMIT")
+    conn = gw.sql.open_db(datafile=DB_FILE)
+    with conn as cursor:
+        changed, removed = _update_index(cursor, _sources(), force=force, workers=workers)
+    if not changed and not removed:
+        gw.sql.close_db(datafile=DB_FILE)
+        gw.info(f"Help database at {db_path} is up to date")
+        return db_path
     gw.sql.close_db(all=True)
-    gw.info(f"Help database built at {db_path}")
+    gw.info(f"Help database updated at {db_path}: {len(changed)} changed, "
+            f"{len(removed)} removed file(s)")
     return db_path
 
 
+def _sources() -> dict:
+    """Map the absolute path of every indexed file to ``(kind, project)``."""
+    sources = {}
+    for dotted_path, path in _walk_projects("projects"):
+        sources[path] = ("project", dotted_path)
+    for path in _builtin_files():
+        sources[path] = ("builtin", "builtin")
+    for dirpath, _, files in os.walk("tests"):
+        for fname in files:
+            if fname.endswith(".py"):
+                sources[os.path.abspath(os.path.join(dirpath, fname))] = ("test", None)
+    return sources
+
+
+def _update_index(cursor, sources, *, force=False, workers=None):
+    """Re-index the files of *sources* whose hash changed, in one transaction.
+
+    Returns the ``(changed, removed)`` file paths.
+    """
+    if force or not _schema_current(cursor):
+        for table in _TABLES:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        for statement in _SCHEMA:
+            cursor.execute(statement)
+        cursor.execute("INSERT INTO help_meta VALUES ('version', ?)", (SCHEMA_VERSION,))
+
+    known = dict(cursor.execute("SELECT path, hash FROM help_files"))
+    hashes = {path: _file_hash(path) for path in sources}
+    changed = [path for path in sources if known.get(path) != hashes[path]]
+    removed = [path for path in known if path not in sources]
+    if not changed and not removed:
+        return changed, removed
+
+    stale = changed + removed
+    affected = _targets(cursor, stale)
+    _delete_paths(cursor, stale)
+
+    tests = [path for path in changed if sources[path][0] == "test"]
+    modules = [path for path in changed if sources[path][0] != "test"]
+    test_rows = []
+    for path in tests:
+        for target, contexts in _scan_test_file(path).items():
+            test_rows.extend((target, f"{os.path.basename(path)}::{c}", path)
+                             for c in sorted(contexts))
+    cursor.executemany("INSERT INTO test_refs VALUES (?, ?, ?)", test_rows)
+    affected.update(target for target, _, _ in test_rows)
+
+    rows = {"help": [], "param_types": [], "return_types": [], "providers": [], "refs": []}
+    for path, module in zip(modules, _describe_all(modules, workers)):
+        if module is None:
+            gw.warning(f"Skipping unparsable file {path}")
+            continue
+        kind, project = sources[path]
+        _module_rows(rows, cursor, path, project, module,
+                     exported=module["all"] if kind == "builtin" else None)
+    for table, table_rows in rows.items():
+        if table_rows:
+            marks = ", ".join("?" * len(table_rows[0]))
+            cursor.executemany(f"INSERT INTO {table} VALUES ({marks})", table_rows)
+
+    # functions in unchanged files whose tests changed
+    fresh = {_test_key(row[0], row[1]) for row in rows["help"]}
+    cursor.executemany(
+        "UPDATE help SET tests = ? WHERE project = ? AND function = ?",
+        [(_tests_for(cursor, key), *_split_key(key)) for key in affected - fresh],
+    )
+    cursor.executemany("DELETE FROM help_files WHERE path = ?", [(p,) for p in removed])
+    cursor.executemany(
+        "INSERT OR REPLACE INTO help_files VALUES (?, ?, ?, ?)",
+        [(p, sources[p][0], sources[p][1], hashes[p]) for p in changed],
+    )
+    return changed, removed
+
+
+def _schema_current(cursor) -> bool:
+    try:
+        row = cursor.execute("SELECT value FROM help_meta WHERE key = 'version'").fetchone()
+    except Exception:
+        return False
+    return bool(row) and row[0] == SCHEMA_VERSION
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _builtin_files():
+    import gway.builtins
+
+    base = os.path.dirname(os.path.abspath(gway.builtins.__file__))
+    for fname in sorted(os.listdir(base)):
+        if fname.endswith(".py") and not fname.startswith("_"):
+            yield os.path.join(base, fname)
+
+
+def _describe_all(paths, workers=None):
+    """Parse *paths* with :func:`describe_module`, optionally on processes."""
+    workers = int(workers or 0)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(describe_module, paths, chunksize=8))
+    return [describe_module(path) for path in paths]
+
+
+def _module_rows(rows, cursor, path, project, module, *, exported=None):
+    for func in module["functions"]:
+        name = func["name"]
+        if exported is not None and name not in exported:
+            continue
+        doc = func["doc"]
+        param_types, return_type, provides = _parse_doc(doc)
+        rows["help"].append((
+            project, name, func["signature"], doc, func["source"],
+            "\n".join(_extract_todos(func["source"])),
+            _tests_for(cursor, _test_key(project, name)), path,
+        ))
+        rows["param_types"].extend((project, name, p, t, path) for p, t in param_types.items())
+        if return_type:
+            rows["return_types"].append((project, name, return_type, path))
+        provider_type = provides or (
+            return_type if return_type and not _is_builtin_type(return_type) else None
+        )
+        if provider_type:
+            rows["providers"].append((provider_type, project, name, path))
+        rows["refs"].extend((project, name, ref, path) for ref in func["refs"])
+
+
+def _test_key(project: str, function: str) -> str:
+    """The ``gw.`` call path tests use for *function*."""
+    return function if project == "builtin" else f"{project}.{function}"
+
+
+def _split_key(key: str):
+    project, _, function = key.rpartition(".")
+    return project or "builtin", function
+
+
+def _tests_for(cursor, key: str) -> str:
+    rows = cursor.execute(
+        "SELECT DISTINCT test FROM test_refs WHERE target = ? ORDER BY test", (key,)
+    ).fetchall()
+    return "\n".join(row[0] for row in rows)
+
+
+def _targets(cursor, paths) -> set:
+    targets = set()
+    for path in paths:
+        targets.update(row[0] for row in cursor.execute(
+            "SELECT target FROM test_refs WHERE path = ?", (path,)))
+    return targets
+
+
+def _delete_paths(cursor, paths):
+    params = [(path,) for path in paths]
+    cursor.executemany("DELETE FROM help WHERE path = ?", params)
+    for table in _PATH_TABLES:
+        cursor.executemany(f"DELETE FROM {table} WHERE path = ?", params)
+
+
 def _walk_projects(base: str = "projects"):
+    """Yield ``(dotted_name, absolute_path)`` for every project file."""
     for dirpath, _, filenames in os.walk(base):
         for fname in filenames:
             if not fname.endswith(".py") or fname.startswith("_"):
                 continue
-            rel_path = os.path.relpath(os.path.join(dirpath, fname), base)
+            path = os.path.join(dirpath, fname)
+            rel_path = os.path.relpath(path, base)
             dotted = rel_path.replace(os.sep, ".").removesuffix(".py")
-            yield dotted
+            yield dotted, os.path.abspath(path)
 
 
 def _extract_todos(source: str):
@@ -160,86 +255,76 @@ def _extract_todos(source: str):
     return todos
 
 
-def _scan_tests(root: str = "tests"):
-    """Return mapping of dotted function paths to referencing tests."""
-    result: dict[str, set[str]] = {}
-
-    class Visitor(ast.NodeVisitor):
-        def __init__(self):
-            self.var_map: dict[str, str] = {}
-            self.stack: list[str] = []
-            self.calls: dict[str, set[str]] = {}
-
-        def _attr_chain(self, node):
-            parts = []
-            while isinstance(node, ast.Attribute):
-                parts.append(node.attr)
-                node = node.value
-            if isinstance(node, ast.Name):
-                parts.append(node.id)
-                return list(reversed(parts))
-            return None
-
-        def _context(self):
-            return ".".join(self.stack) if self.stack else "<module>"
-
-        def visit_Assign(self, node):
-            if isinstance(node.value, ast.Call):
-                chain = self._attr_chain(node.value.func)
-                if (
-                    chain == ["gw", "load_project"]
-                    and node.value.args
-                    and isinstance(node.value.args[0], ast.Constant)
-                ):
-                    proj = str(node.value.args[0].value)
-                    for tgt in node.targets:
-                        if isinstance(tgt, ast.Name):
-                            self.var_map[tgt.id] = proj
-            self.generic_visit(node)
-
-        def visit_Call(self, node):
-            chain = self._attr_chain(node.func)
-            if chain:
-                root = chain[0]
-                if root == "gw":
-                    dotted = ".".join(chain[1:])
-                    self.calls.setdefault(dotted, set()).add(self._context())
-                elif root in self.var_map:
-                    dotted = ".".join([self.var_map[root]] + chain[1:])
-                    self.calls.setdefault(dotted, set()).add(self._context())
-            self.generic_visit(node)
-
-        def visit_FunctionDef(self, node):
-            self.stack.append(node.name)
-            self.generic_visit(node)
-            self.stack.pop()
-
-        visit_AsyncFunctionDef = visit_FunctionDef
-
-        def visit_ClassDef(self, node):
-            self.stack.append(node.name)
-            self.generic_visit(node)
-            self.stack.pop()
-
-    for dirpath, _, files in os.walk(root):
-        for fname in files:
-            if not fname.endswith(".py"):
-                continue
-            path = os.path.join(dirpath, fname)
-            try:
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    source = f.read()
-                tree = ast.parse(source)
-            except Exception:
-                continue
-            visitor = Visitor()
-            visitor.visit(tree)
-            for call, refs in visitor.calls.items():
-                key = call
-                refs_full = {f"{fname}::{r}" for r in refs}
-                result.setdefault(key, set()).update(refs_full)
-
-    return {k: sorted(v) for k, v in result.items()}
+class _TestVisitor(ast.NodeVisitor):
+    """Collect the ``gw`` calls made by a test module, by enclosing test."""
+
+    def __init__(self):
+        self.var_map: dict[str, str] = {}
+        self.stack: list[str] = []
+        self.calls: dict[str, set[str]] = {}
+
+    def _attr_chain(self, node):
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if isinstance(node, ast.Name):
+            parts.append(node.id)
+            return list(reversed(parts))
+        return None
+
+    def _context(self):
+        return ".".join(self.stack) if self.stack else "<module>"
+
+    def visit_Assign(self, node):
+        if isinstance(node.value, ast.Call):
+            chain = self._attr_chain(node.value.func)
+            if (
+                chain == ["gw", "load_project"]
+                and node.value.args
+                and isinstance(node.value.args[0], ast.Constant)
+            ):
+                proj = str(node.value.args[0].value)
+                for tgt in node.targets:
+                    if isinstance(tgt, ast.Name):
+                        self.var_map[tgt.id] = proj
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        chain = self._attr_chain(node.func)
+        if chain:
+            root = chain[0]
+            if root == "gw":
+                dotted = ".".join(chain[1:])
+                self.calls.setdefault(dotted, set()).add(self._context())
+            elif root in self.var_map:
+                dotted = ".".join([self.var_map[root]] + chain[1:])
+                self.calls.setdefault(dotted, set()).add(self._context())
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        self.stack.append(node.name)
+        self.generic_visit(node)
+        self.stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.stack.append(node.name)
+        self.generic_visit(node)
+        self.stack.pop()
+
+
+def _scan_test_file(path: str) -> dict[str, set[str]]:
+    """Return the ``gw`` calls of one test file mapped to the tests making them."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            tree = ast.parse(f.read())
+    except Exception:
+        return {}
+    visitor = _TestVisitor()
+    visitor.visit(tree)
+    return visitor.calls
 
 
 _BUILTIN_TYPES = {
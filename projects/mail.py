@@ -2,6 +2,13 @@
 # projects/mail.py
 
 import os
+import re
+import time
+import heapq
+import atexit
+import pathlib
+import sqlite3
+import itertools
 from gway import gw
 import imaplib
 import smtplib
@@ -11,6 +18,20 @@ import contextlib
 from datetime import date, datetime
 from email.mime.text import MIMEText
 from email import message_from_bytes
+from email.header import decode_header, make_header
+from email.utils import parsedate_to_datetime
+from concurrent.futures import Future, InvalidStateError
+
+INDEX_FILE = "work/mail/index.sqlite"
+INDEX_PROJECT = "mail_index"
+FETCH_BATCH = 200
+
+OUTBOX_DIR = "work/mail/outbox"
+SMTP_IDLE_TIMEOUT = 60
+SMTP_BATCH = 20
+SEND_RETRIES = 4
+RETRY_BACKOFF = 2.0
+RETRY_MAX_DELAY = 300
 
 
 def _escape_imap_string(value: str) -> str:
@@ -29,65 +50,46 @@ def send(subject, body=None, to=None, threaded=None, **kwargs):
     """
     Send an email with the specified subject and body, using defaults from env if available.
 
+    Messages go through the outbound queue (see :func:`flush`), whose worker
+    keeps one authenticated SMTP connection open between messages.
+
     Parameters:
     - subject: the email subject (string)
     - body:    the plain-text body (string). Must be provided.
     - to:      recipient address (string). Defaults to ADMIN_EMAIL from the environment.
-    - threaded:  if True, send the email asynchronously; if False, block and send; if None, auto-detect.
+    - threaded:  if True, queue the email and return at once (retrying with backoff
+                 on failure); if False, block and send; if None, auto-detect.
     - **kwargs: reserved for future use.
 
     Returns:
-        str ("Email sent successfully to ...") or error message, unless threaded is True (returns immediately).
+        str ("Email sent successfully to ...") or error message, unless threaded is True
+        (returns a :class:`MailHandle` future resolving to that string).
     """
+    _to = to or os.environ.get("ADMIN_EMAIL")
+    if not body:
+        gw.debug("No email body provided.")
+        return "No email body provided."
 
-    def _send_email():
-        _to = to or os.environ.get("ADMIN_EMAIL")
-        if not body:
-            gw.debug("No email body provided.")
-            return "No email body provided."
-
-        gw.debug(f"Preparing to send email to {_to}: {subject}")
-
-        # Load SMTP configuration from environment
-        sender_email    = os.environ.get("MAIL_SENDER")
-        sender_password = os.environ.get("MAIL_PASSWORD")
-        smtp_server     = os.environ.get("SMTP_SERVER")
-        smtp_port       = os.environ.get("SMTP_PORT")
+    gw.debug(f"Preparing to send email to {_to}: {subject}")
 
-        gw.debug(f"MAIL_SENDER: {sender_email}")
-        gw.debug(f"SMTP_SERVER: {smtp_server}")
-        gw.debug(f"SMTP_PORT: {smtp_port}")
-        gw.debug("Environment variables loaded.")
+    # Load SMTP configuration from environment
+    config = _smtp_config()
+    gw.debug(f"MAIL_SENDER: {config[0]}")
+    gw.debug(f"SMTP_SERVER: {config[2]}")
+    gw.debug(f"SMTP_PORT: {config[3]}")
 
-        # If any required piece is missing, bail out
-        if not all([sender_email, sender_password, smtp_server, smtp_port]):
-            gw.debug("Missing one or more required email configuration details.")
-            return "Missing email configuration details."
+    # If any required piece is missing, bail out
+    if not all(config):
+        gw.debug("Missing one or more required email configuration details.")
+        return "Missing email configuration details."
 
-        # Construct the MIMEText message with explicit UTF-8 encoding
-        msg = MIMEText(body, _charset="utf-8")
-        msg['Subject'] = gw.resolve(subject)
-        msg['From']    = sender_email
-        msg['To']      = _to
+    # Construct the MIMEText message with explicit UTF-8 encoding
+    msg = MIMEText(body, _charset="utf-8")
+    msg['Subject'] = gw.resolve(subject)
+    msg['From']    = config[0]
+    msg['To']      = _to
 
-        gw.debug("Email MIME message constructed.")
-        gw.debug(f"Email headers: From={msg['From']}, To={msg['To']}, Subject={msg['Subject']}")
-
-        try:
-            gw.debug(f"Connecting to SMTP server: {smtp_server}:{smtp_port}")
-            server = smtplib.SMTP(smtp_server, int(smtp_port))
-            gw.debug("SMTP connection established. Starting TLS...")
-            server.starttls()
-            gw.debug("TLS started. Logging in...")  
-            server.login(sender_email, sender_password)
-            gw.debug("Login successful. Sending message...")
-            server.send_message(msg)
-            server.quit()
-            gw.debug("Email sent and SMTP session closed.")
-            return "Email sent successfully to " + _to
-        except Exception as e:
-            gw.debug(f"Exception occurred while sending email: {e}")
-            return f"Error sending email: {e}"
+    gw.debug(f"Email headers: From={msg['From']}, To={msg['To']}, Subject={msg['Subject']}")
 
     # Auto-detect async mode if not specified
     if threaded is None:
@@ -97,26 +99,13 @@ def send(subject, body=None, to=None, threaded=None, **kwargs):
         except RuntimeError:
             threaded = False
 
+    outbox = _get_outbox()
     if threaded:
-        try:
-            loop = asyncio.get_running_loop()
-            async def async_task():
-                result = await asyncio.to_thread(_send_email)
-                if result and "Error" in result:
-                    gw.error(result)
-            asyncio.create_task(async_task())
-        except RuntimeError:
-            def thread_task():
-                result = _send_email()
-                if result and "Error" in result:
-                    gw.error(result)
-            threading.Thread(target=thread_task, daemon=True).start()
-        return "Email send scheduled (async mode)"
-    else:
-        return _send_email()
+        return outbox.submit(msg, _to, config, retries=SEND_RETRIES)
+    return outbox.submit(msg, _to, config, retries=0, spool=False).result()
 
 
-def read(subject_fragment, body_fragment=None, sender=None, since=None, before=None):
+def read(subject_fragment, body_fragment=None, sender=None, since=None, before=None, index=None):
     """Read the most recent email matching criteria.
 
     Parameters
@@ -131,7 +120,18 @@ def read(subject_fragment, body_fragment=None, sender=None, since=None, before=N
         Only return messages on or after this date.
     before : str or :class:`datetime.date`, optional
         Only return messages before this date.
+    index : bool or str, optional
+        Answer from the local mail index (see :func:`sync`) instead of
+        searching on the server. A string names the index file. Defaults to
+        the ``MAIL_INDEX`` environment variable.
     """
+    index = _index_file(index)
+    if index:
+        return _read_indexed(
+            index, subject_fragment, body_fragment=body_fragment,
+            sender=sender, since=since, before=before,
+        )
+
     EMAIL_SENDER = os.environ.get("MAIL_SENDER")
     EMAIL_PASSWORD = os.environ.get("MAIL_PASSWORD")
     IMAP_SERVER = os.environ.get("IMAP_SERVER")
@@ -239,7 +239,7 @@ def read(subject_fragment, body_fragment=None, sender=None, since=None, before=N
                 mail.logout()
 
 
-def search(subject_fragment="*", body_fragment=None, sender=None, to=None, since=None, before=None, limit=10, reverse=False):
+def search(subject_fragment="*", body_fragment=None, sender=None, to=None, since=None, before=None, limit=10, reverse=False, index=None):
     """Search for emails and return summaries (subject, date, sender).
 
     Parameters
@@ -263,7 +263,19 @@ def search(subject_fragment="*", body_fragment=None, sender=None, to=None, since
     reverse : bool, optional
         If ``True`` return results from oldest to newest instead of newest to
         oldest.
+    index : bool or str, optional
+        Answer from the local mail index (see :func:`sync`). A string names
+        the index file. Defaults to the ``MAIL_INDEX`` environment variable.
     """
+    if to is True:
+        to = os.environ.get("ADMIN_EMAIL")
+    index = _index_file(index)
+    if index:
+        return _search_indexed(
+            index, subject_fragment, body_fragment=body_fragment, sender=sender,
+            to=to, since=since, before=before, limit=limit, reverse=reverse,
+        )
+
     EMAIL_SENDER = os.environ.get("MAIL_SENDER")
     EMAIL_PASSWORD = os.environ.get("MAIL_PASSWORD")
     IMAP_SERVER = os.environ.get("IMAP_SERVER")
@@ -294,8 +306,6 @@ def search(subject_fragment="*", body_fragment=None, sender=None, to=None, since
         if sender:
             esc_sender = _escape_imap_string(sender)
             criteria.extend(["FROM", f'"{esc_sender}"'])
-        if to is True:
-            to = os.environ.get("ADMIN_EMAIL")
         if to:
             esc_to = _escape_imap_string(to)
             criteria.extend(["TO", f'"{esc_to}"'])
@@ -324,7 +334,8 @@ def search(subject_fragment="*", body_fragment=None, sender=None, to=None, since
         mail_ids = data[0].split()
         results = []
         for m_id in mail_ids:
-            status, fdata = mail.fetch(m_id, '(RFC822)')
+            # Only the summary headers are needed, not bodies and attachments
+            status, fdata = mail.fetch(m_id, '(BODY.PEEK[HEADER])')
             email_msg = message_from_bytes(fdata[0][1])
             results.append({
                 'subject': email_msg.get('Subject'),
@@ -358,3 +369,632 @@ def search(subject_fragment="*", body_fragment=None, sender=None, to=None, since
             with contextlib.suppress(Exception):
                 mail.logout()
 
+
+
+# Local mail index
+#
+# ``sync`` copies the headers and the first text part of every new message
+# into a SQLite (FTS5) table so that polling recipes do not download the
+# same mail again. Messages are tracked by IMAP UID; the server's
+# UIDVALIDITY tells us when those UIDs were renumbered and the index for
+# that mailbox has to be rebuilt.
+
+_STATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS mail_state ("
+    "account TEXT, mailbox TEXT, uidvalidity INTEGER, last_uid INTEGER, "
+    "PRIMARY KEY (account, mailbox))"
+)
+_MESSAGE_COLUMNS = (
+    "account, mailbox, uid, ts, date, attachments, subject, sender, recipients, body"
+)
+_MESSAGES_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS mail_messages USING fts5("
+    "account UNINDEXED, mailbox UNINDEXED, uid UNINDEXED, ts UNINDEXED, "
+    "date UNINDEXED, attachments UNINDEXED, subject, sender, recipients, body, "
+    "tokenize='trigram')"
+)
+# Without FTS5 (or its trigram tokenizer) the LIKE queries scan a plain table
+_MESSAGES_TABLE = f"CREATE TABLE IF NOT EXISTS mail_messages ({_MESSAGE_COLUMNS})"
+
+_FETCH_START = re.compile(rb"^\d+ \(")
+_FETCH_UID = re.compile(rb"UID (\d+)")
+_FETCH_SECTION = re.compile(rb"BODY\[([^\]]*)\](?:<\d+>)? \{\d+\}$")
+
+
+def _index_file(index):
+    if index is None:
+        index = os.environ.get("MAIL_INDEX")
+    if isinstance(index, str):
+        if index.strip().lower() in ("", "0", "false", "no", "off"):
+            return None
+        if index.strip().lower() in ("1", "true", "yes", "on"):
+            return INDEX_FILE
+        return index
+    return INDEX_FILE if index else None
+
+
+def _imap_config():
+    config = [os.environ.get(key) for key in ("MAIL_SENDER", "MAIL_PASSWORD", "IMAP_SERVER", "IMAP_PORT")]
+    if not all(config):
+        raise RuntimeError(
+            "Missing email configuration: MAIL_SENDER, MAIL_PASSWORD, IMAP_SERVER, IMAP_PORT"
+        )
+    return config
+
+
+def _open_index(datafile):
+    conn = gw.sql.open_db(datafile, project=INDEX_PROJECT)
+    # A direct read rather than a remembered flag: the index file may have
+    # been deleted or replaced since this process last created the tables.
+    ready = gw.sql.execute(
+        "SELECT count(*) FROM sqlite_master WHERE name IN ('mail_state', 'mail_messages')",
+        connection=conn,
+    )[0][0] == 2
+    if not ready:
+        gw.sql.execute(_STATE_TABLE, connection=conn)
+        try:
+            gw.sql.execute(_MESSAGES_FTS, connection=conn)
+        except sqlite3.OperationalError as e:
+            gw.debug("FTS5 unavailable for the mail index (%s); using a plain table", e)
+            gw.sql.execute(_MESSAGES_TABLE, connection=conn)
+    return conn
+
+
+@contextlib.contextmanager
+def _indexed_mailbox(datafile, mailbox, batch=None):
+    """Sync *mailbox* into the index; yield ``(mail, conn, account, stats)``."""
+    user, password, server, port = _imap_config()
+    account = f"{user}@{server}:{port}"
+    conn = _open_index(datafile)
+    mail = imaplib.IMAP4_SSL(server, port)
+    try:
+        mail.login(user, password)
+        with contextlib.suppress(Exception):
+            mail.enable('UTF8=ACCEPT')
+        stats = _sync_mailbox(mail, conn, account, mailbox, batch)
+        yield mail, conn, account, stats
+    finally:
+        with contextlib.suppress(imaplib.IMAP4.error):
+            mail.close()
+        with contextlib.suppress(Exception):
+            mail.logout()
+
+
+def sync(mailbox="INBOX", *, datafile=None, batch=None):
+    """Copy new messages of *mailbox* into the local mail index.
+
+    Only UIDs above the last synced one are fetched, ``batch`` (default
+    ``FETCH_BATCH``) per FETCH and without attachments. If the server reports a new
+    UIDVALIDITY the mailbox is indexed again from scratch.
+
+    Returns a dict with the ``uidvalidity``, ``last_uid``, the number of
+    messages ``fetched`` and whether the index was ``reset``.
+    """
+    with _indexed_mailbox(datafile or INDEX_FILE, mailbox, batch) as (_, _, _, stats):
+        return stats
+
+
+def _sync_mailbox(mail, conn, account, mailbox, batch=None):
+    status, _ = mail.select(mailbox, readonly=True)
+    if status != 'OK':
+        raise RuntimeError(f"Unable to select mailbox {mailbox}")
+    _, validity = mail.response('UIDVALIDITY')
+    uidvalidity = int(validity[0]) if validity and validity[0] else 0
+
+    key = (account, mailbox)
+    rows = gw.sql.execute(
+        "SELECT uidvalidity, last_uid FROM mail_state WHERE account = ? AND mailbox = ?",
+        connection=conn, args=key,
+    )
+    known_validity, last_uid = rows[0] if rows else (None, 0)
+    reset = known_validity is not None and known_validity != uidvalidity
+    if reset:
+        gw.info("UIDVALIDITY of %s changed; rebuilding its mail index", mailbox)
+        last_uid = 0
+
+    # "n:*" always includes the highest UID, even when it is below n
+    status, data = mail.uid('SEARCH', None, f'UID {last_uid + 1}:*')
+    uids = sorted(uid for uid in map(int, (data[0] or b'').split()) if uid > last_uid)
+
+    if reset or uids:
+        # also drops rows left behind by an interrupted sync
+        gw.sql.execute(
+            "DELETE FROM mail_messages WHERE account = ? AND mailbox = ? AND uid > ?",
+            connection=conn, args=(*key, last_uid),
+        )
+    batch = batch or FETCH_BATCH
+    for start in range(0, len(uids), batch):
+        chunk = uids[start:start + batch]
+        pending = [
+            gw.sql.execute(
+                f"INSERT INTO mail_messages ({_MESSAGE_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                connection=conn, args=(*key, *row), wait=False,
+            )
+            for row in _fetch_messages(mail, chunk)
+        ]
+        for future in pending:
+            future.result()
+        last_uid = chunk[-1]
+        # checkpoint per batch so an interrupted sync resumes from here
+        _save_state(conn, key, uidvalidity, last_uid)
+    if known_validity != uidvalidity and not uids:
+        _save_state(conn, key, uidvalidity, last_uid)
+
+    gw.debug("Synced %d new message(s) from %s", len(uids), mailbox)
+    return {
+        "mailbox": mailbox,
+        "uidvalidity": uidvalidity,
+        "last_uid": last_uid,
+        "fetched": len(uids),
+        "reset": reset,
+    }
+
+
+def _save_state(conn, key, uidvalidity, last_uid):
+    gw.sql.execute(
+        "INSERT OR REPLACE INTO mail_state (account, mailbox, uidvalidity, last_uid) "
+        "VALUES (?, ?, ?, ?)",
+        connection=conn, args=(*key, uidvalidity, last_uid),
+    )
+
+
+def _parse_fetch(data):
+    """Map each UID in an imaplib FETCH response to its ``{section: bytes}``."""
+    messages = []
+    current = None
+    for item in data:
+        head, literal = item if isinstance(item, tuple) else (item, None)
+        if not head:
+            continue
+        if _FETCH_START.match(head):
+            current = {}
+            messages.append(current)
+        if current is None:
+            continue
+        match = _FETCH_UID.search(head)
+        if match:
+            current["UID"] = int(match.group(1))
+        if literal is not None:
+            match = _FETCH_SECTION.search(head)
+            if match:
+                current[match.group(1).decode().upper()] = literal
+    return {m.pop("UID"): m for m in messages if "UID" in m}
+
+
+def _fetch_messages(mail, uids):
+    """Fetch headers and text of *uids*; yield rows for ``mail_messages``.
+
+    One FETCH brings the headers of the whole batch. Single part text
+    messages then need their ``TEXT``; for multipart ones only the first
+    part is fetched, which is the text (or its alternatives) in practice,
+    so attachments never cross the wire.
+    """
+    uid_set = ",".join(map(str, uids))
+    _, data = mail.uid('FETCH', uid_set, '(UID BODY.PEEK[HEADER])')
+    headers = {uid: parts.get("HEADER", b"") for uid, parts in _parse_fetch(data).items()}
+    parsed = {uid: message_from_bytes(header) for uid, header in headers.items()}
+
+    simple = [uid for uid, msg in parsed.items() if msg.get_content_maintype() == "text"]
+    # a header-only parse never is_multipart(); go by the declared type
+    multipart = [uid for uid, msg in parsed.items() if msg.get_content_maintype() == "multipart"]
+    texts = {}
+    if simple:
+        _, data = mail.uid('FETCH', ",".join(map(str, simple)), '(UID BODY.PEEK[TEXT])')
+        for uid, parts in _parse_fetch(data).items():
+            texts[uid] = _message_text(headers.get(uid, b"") + parts.get("TEXT", b""))
+    if multipart:
+        _, data = mail.uid(
+            'FETCH', ",".join(map(str, multipart)), '(UID BODY.PEEK[1.MIME] BODY.PEEK[1])'
+        )
+        for uid, parts in _parse_fetch(data).items():
+            texts[uid] = _message_text(parts.get("1.MIME", b"") + parts.get("1", b""))
+
+    for uid in uids:
+        msg = parsed.get(uid)
+        if msg is None:  # expunged while we were fetching
+            continue
+        date_header = msg.get('Date')
+        try:
+            ts = parsedate_to_datetime(date_header).timestamp()
+        except Exception:
+            ts = 0
+        attachments = msg.get_content_maintype() == "multipart" and msg.get_content_subtype() != "alternative"
+        yield (
+            uid, ts, date_header, int(attachments),
+            _header_text(msg.get('Subject')),
+            _header_text(msg.get('From')),
+            ", ".join(_header_text(msg.get(h)) for h in ('To', 'Cc') if msg.get(h)),
+            texts.get(uid, ""),
+        )
+
+
+def _header_text(value):
+    if value is None:
+        return ""
+    try:
+        return str(make_header(decode_header(value)))
+    except Exception:
+        return str(value)
+
+
+def _message_text(raw):
+    """Return the plain text (or else HTML) body of the MIME entity *raw*."""
+    msg = message_from_bytes(raw)
+    found = {}
+    for part in msg.walk():
+        content_type = part.get_content_type()
+        if content_type in ("text/plain", "text/html") and content_type not in found:
+            if part.get('Content-Disposition', '').lower().startswith('attachment'):
+                continue
+            payload = part.get_payload(decode=True) or b""
+            charset = part.get_content_charset() or "utf-8"
+            try:
+                found[content_type] = payload.decode(charset, errors="replace")
+            except LookupError:
+                found[content_type] = payload.decode("utf-8", errors="replace")
+    return found.get("text/plain") or found.get("text/html") or ""
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    value = str(value)
+    try:
+        return datetime.strptime(value, '%d-%b-%Y').timestamp()
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _query_index(conn, account, mailbox, *, subject=None, body=None, sender=None,
+                 to=None, since=None, before=None, limit=None, newest_first=True,
+                 columns="uid, date, subject, sender, body, attachments"):
+    where = ["account = ?", "mailbox = ?"]
+    args = [account, mailbox]
+    fragments = {"subject": subject, "sender": sender, "recipients": to, "body": body}
+    fragments = {column: value for column, value in fragments.items() if value}
+    for column, value in fragments.items():
+        where.append(f"{column} LIKE ?")
+        args.append(f"%{value}%")
+    if since:
+        where.append("ts >= ?")
+        args.append(_timestamp(since))
+    if before:
+        where.append("ts < ?")
+        args.append(_timestamp(before))
+    order = "DESC" if newest_first else "ASC"
+    rows = gw.sql.execute(
+        f"SELECT {columns}, {', '.join(fragments) or 'NULL'} FROM mail_messages "
+        f"WHERE {' AND '.join(where)} ORDER BY ts {order}, uid {order}",
+        connection=conn, args=tuple(args),
+    )
+    results = []
+    width = len(columns.split(","))
+    for row in rows:
+        # LIKE treats % and _ as wildcards; keep literal substring semantics
+        values = row[width:]
+        if all(f.lower() in (v or "").lower() for f, v in zip(fragments.values(), values)):
+            results.append(row[:width])
+            if limit is not None and len(results) >= limit:
+                break
+    return results
+
+
+def _search_indexed(datafile, subject_fragment, *, body_fragment=None, sender=None,
+                    to=None, since=None, before=None, limit=10, reverse=False):
+    with _indexed_mailbox(datafile, 'INBOX') as (mail, conn, account, _):
+        rows = _query_index(
+            conn, account, 'INBOX',
+            subject=None if subject_fragment == "*" else subject_fragment,
+            body=body_fragment, sender=sender, to=to, since=since, before=before,
+            limit=limit, newest_first=not reverse, columns="subject, sender, date",
+        )
+    return [{'subject': subject, 'from': sender, 'date': date} for subject, sender, date in rows]
+
+
+def _read_indexed(datafile, subject_fragment, *, body_fragment=None, sender=None,
+                  since=None, before=None):
+    if not any([subject_fragment and subject_fragment != "*", body_fragment, sender, since, before]):
+        gw.warning("No search criteria provided.")
+        return None
+    with _indexed_mailbox(datafile, 'INBOX') as (mail, conn, account, _):
+        rows = _query_index(
+            conn, account, 'INBOX',
+            subject=None if subject_fragment == "*" else subject_fragment,
+            body=body_fragment, sender=sender, since=since, before=before, limit=1,
+            columns="uid, body, attachments",
+        )
+        if not rows:
+            gw.warning("No emails found with the specified criteria.")
+            return None
+        uid, content, has_attachments = rows[0]
+        attachments = []
+        if has_attachments:
+            # the index holds the text only; attachments come from the server
+            _, data = mail.uid('FETCH', str(uid), '(BODY.PEEK[])')
+            raw = _parse_fetch(data).get(uid, {}).get("", b"")
+            for part in message_from_bytes(raw).walk():
+                if part.get_content_maintype() == "multipart":
+                    continue
+                if part.get('Content-Disposition') is not None and part.get_filename():
+                    attachments.append((part.get_filename(), part.get_payload(decode=True)))
+    if not content:
+        gw.warning("Matching email found, but unsupported content type.")
+        return None
+    return content, attachments
+
+
+# Outbound queue
+#
+# One worker thread delivers every message over a single SMTP connection,
+# which stays logged in until it has been idle for SMTP_IDLE_TIMEOUT
+# seconds. Queued (threaded) messages are retried with exponential backoff
+# and, when MAIL_OUTBOX is set, spooled to disk until they are delivered.
+
+class MailHandle(Future):
+    """Future returned by ``send(threaded=True)``.
+
+    Resolves to the same message ``send`` returns when it blocks.
+    """
+
+    def __init__(self, mail_id, to):
+        super().__init__()
+        self.id = mail_id
+        self.to = to
+
+    def __str__(self):
+        if self.done():
+            return self.result()
+        return f"Email to {self.to} queued ({self.id})"
+
+
+class _Outgoing:
+    __slots__ = ("msg", "to", "config", "retries", "attempts", "handle", "path")
+
+    def __init__(self, msg, to, config, retries, handle, path=None):
+        self.msg = msg
+        self.to = to
+        self.config = config
+        self.retries = retries
+        self.attempts = 0
+        self.handle = handle
+        self.path = path
+
+
+class _Outbox:
+    def __init__(self, spool=None):
+        self.spool = pathlib.Path(spool) if spool else None
+        self.stats = {"connections": 0, "sent": 0, "retried": 0, "failed": 0}
+        self._cond = threading.Condition()
+        self._queue = []  # heap of (due, seq, _Outgoing)
+        self._seq = itertools.count()
+        self._busy = 0
+        self._closing = False
+        self._smtp = None
+        self._smtp_config = None
+        self._last_used = 0.0
+        if self.spool:
+            self._recover()
+        self._thread = threading.Thread(target=self._run, name="mail-outbox", daemon=True)
+        self._thread.start()
+
+    def submit(self, msg, to, config, *, retries=SEND_RETRIES, spool=True):
+        handle = MailHandle(f"{time.time_ns():x}-{next(self._seq)}", to)
+        path = None
+        if spool and self.spool:
+            path = self.spool / f"{handle.id}.eml"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(msg.as_bytes())
+            os.replace(tmp, path)
+        self._push(_Outgoing(msg, to, tuple(config), retries, handle, path))
+        return handle
+
+    def _push(self, item, delay=0.0):
+        with self._cond:
+            heapq.heappush(self._queue, (time.monotonic() + delay, next(self._seq), item))
+            self._cond.notify_all()
+
+    def _recover(self):
+        """Queue the messages a previous process left in the spool."""
+        self.spool.mkdir(parents=True, exist_ok=True)
+        config = _smtp_config()
+        for path in sorted(self.spool.glob("*.eml")):
+            msg = message_from_bytes(path.read_bytes())
+            handle = MailHandle(path.stem, msg['To'])
+            self._push(_Outgoing(msg, msg['To'], config, SEND_RETRIES, handle, path))
+        if self._queue:
+            gw.info("Resending %d spooled email(s) from %s", len(self._queue), self.spool)
+
+    def pending(self):
+        with self._cond:
+            return len(self._queue) + self._busy
+
+    def flush(self, timeout=None):
+        """Wait until every queued message was sent or gave up."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _take(self):
+        now = time.monotonic()
+        batch = []
+        while self._queue and self._queue[0][0] <= now and len(batch) < SMTP_BATCH:
+            batch.append(heapq.heappop(self._queue)[2])
+        return batch
+
+    def _wait_time(self):
+        now = time.monotonic()
+        waits = []
+        if self._queue:
+            waits.append(self._queue[0][0] - now)
+        if self._smtp is not None:
+            waits.append(self._last_used + SMTP_IDLE_TIMEOUT - now)
+        return max(0.0, min(waits)) if waits else None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                batch = self._take()
+                if not batch:
+                    if self._closing:
+                        break
+                    idle = (self._smtp is not None
+                            and time.monotonic() - self._last_used >= SMTP_IDLE_TIMEOUT)
+                    if not idle:
+                        self._cond.wait(self._wait_time())
+                        continue
+                self._busy = len(batch)
+            if not batch:
+                gw.debug("Closing idle SMTP connection")
+                self._disconnect()
+                continue
+            for item in batch:
+                self._attempt(item)
+            with self._cond:
+                self._busy = 0
+                self._cond.notify_all()
+        self._disconnect()
+        # what is left waits for a retry that will not happen in this process
+        with self._cond:
+            for _, _, item in self._queue:
+                _resolve(item.handle, "Error sending email: outbox closed before retry")
+            self._queue.clear()
+
+    def _attempt(self, item):
+        if item.handle.cancelled():
+            self._drop_spooled(item)
+            return
+        try:
+            self._deliver(item.msg, item.config)
+        except Exception as e:
+            item.attempts += 1
+            if item.attempts <= item.retries:
+                delay = min(RETRY_BACKOFF * 2 ** (item.attempts - 1), RETRY_MAX_DELAY)
+                self.stats["retried"] += 1
+                gw.warning("Sending email to %s failed (%s); retrying in %.1fs", item.to, e, delay)
+                self._push(item, delay)
+                return
+            self.stats["failed"] += 1
+            result = f"Error sending email: {e}"
+            if item.retries:
+                gw.error(result)
+                if item.path:  # keep it, but out of the way of the next recovery
+                    with contextlib.suppress(OSError):
+                        os.replace(item.path, item.path.with_suffix(".failed"))
+            else:
+                gw.debug(f"Exception occurred while sending email: {e}")
+            _resolve(item.handle, result)
+            return
+        self.stats["sent"] += 1
+        self._drop_spooled(item)
+        _resolve(item.handle, "Email sent successfully to " + str(item.to))
+
+    @staticmethod
+    def _drop_spooled(item):
+        if item.path:
+            with contextlib.suppress(OSError):
+                item.path.unlink()
+
+    def _deliver(self, msg, config):
+        for _ in range(2):
+            reused = self._smtp is not None and self._smtp_config == config
+            if not reused:
+                self._disconnect()
+                self._connect(config)
+            try:
+                self._smtp.send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                # the server may drop a connection we kept open; log in again once
+                self._disconnect()
+                if reused:
+                    continue
+                raise
+            self._last_used = time.monotonic()
+            return
+
+    def _connect(self, config):
+        sender_email, sender_password, smtp_server, smtp_port = config
+        gw.debug(f"Connecting to SMTP server: {smtp_server}:{smtp_port}")
+        server = smtplib.SMTP(smtp_server, int(smtp_port))
+        try:
+            server.starttls()
+            server.login(sender_email, sender_password)
+        except Exception:
+            with contextlib.suppress(Exception):
+                server.quit()
+            raise
+        gw.debug("SMTP login successful.")
+        self.stats["connections"] += 1
+        self._smtp = server
+        self._smtp_config = config
+        self._last_used = time.monotonic()
+
+    def _disconnect(self):
+        if self._smtp is not None:
+            with contextlib.suppress(Exception):
+                self._smtp.quit()
+            self._smtp = None
+            self._smtp_config = None
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def _resolve(handle, result):
+    with contextlib.suppress(InvalidStateError):  # cancelled by the caller
+        handle.set_result(result)
+
+
+def _smtp_config():
+    return [os.environ.get(key) for key in ("MAIL_SENDER", "MAIL_PASSWORD", "SMTP_SERVER", "SMTP_PORT")]
+
+
+def _get_outbox():
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            spool = os.environ.get("MAIL_OUTBOX", "").strip()
+            if spool.lower() in ("", "0", "false", "no", "off"):
+                spool = None
+            elif spool.lower() in ("1", "true", "yes", "on"):
+                spool = gw.resource(OUTBOX_DIR, dir=True)
+            _outbox = _Outbox(spool)
+        return _outbox
+
+
+def flush(timeout=None):
+    """Wait for the outbound mail queue to drain and return its counters.
+
+    With ``MAIL_OUTBOX`` set this also resends mail spooled by an earlier
+    process. ``pending`` is non-zero if ``timeout`` ran out first.
+    """
+    outbox = _get_outbox()
+    outbox.flush(None if timeout is None else float(timeout))
+    return {**outbox.stats, "pending": outbox.pending()}
+
+
+def shutdown_outbox(timeout=10):
+    """Drain the outbound queue (up to ``timeout`` seconds) and stop its worker."""
+    global _outbox
+    with _outbox_lock:
+        outbox, _outbox = _outbox, None
+    if outbox is not None:
+        outbox.close(timeout)
+
+
+atexit.register(shutdown_outbox)
@@ -2,12 +2,11 @@
 
 import time
 import datetime
-import asyncio
 from gway import gw
 
 NETWORK_STATE = {}         # {project: {last_run, last_result, ...}}
 MONITOR_NEXT_CHECK = {}    # {project: next_check_iso}
-MONITOR_TRIGGER = {}       # {project: asyncio.Event (optional)}
+MONITOR_TRIGGER = {}       # {project: ScheduledTask}
 MONITOR_RENDER = {}        # {project: list of renderers}
 
 def now_iso():
@@ -32,12 +31,12 @@ def get_next_check_time(project):
     return MONITOR_NEXT_CHECK.get(project)
 
 def trigger_watch(project):
-    """Trigger an immediate check for a given project, if async Event is set up."""
-    trig = MONITOR_TRIGGER.get(project)
-    if trig and hasattr(trig, "set"):
-        trig.set()
-        return True
-    return False
+    """Trigger an immediate check for a given project running as a daemon."""
+    task = MONITOR_TRIGGER.get(project)
+    if task is None or task.cancelled:
+        return False
+    task.run_now()
+    return True
 
 def start_watch(
     project, *,
@@ -59,7 +58,7 @@ def start_watch(
         converted automatically.
       - delay: Startup delay (seconds).
       - block: Block main thread? (default False)
-      - daemon: Async coroutine? (default True)
+      - daemon: Run on the gateway scheduler? (default True)
       - render: Name or list of render functions (without prefix), for dashboard.
       - logger: Optional logger (uses print if not provided).
       - kwargs: Extra parameters for monitor functions.
@@ -98,35 +97,21 @@ def start_watch(
         if logger: logger.warning(msg)
         else: print(f"{log_prefix}[WARN] {msg}")
 
-    trig = None
-
-    async def async_loop():
-        """Async watcher loop (recommended for web/production)."""
-        nonlocal trig
-        if delay > 0:
-            log_info(f"Waiting {delay}s before starting monitor loop...")
-            await asyncio.sleep(delay)
-        trig = MONITOR_TRIGGER.setdefault(project_name, asyncio.Event())
-        while True:
-            state = get_state(project_name)
-            state["last_run"] = now_iso()
-            state["last_result"] = results = []
-            for funcname, func in monitor_funcs:
-                try:
-                    log_info(f"Calling {funcname} ...")
-                    result = func(**kwargs)
-                    results.append((funcname, result))
-                except Exception as e:
-                    log_warn(f"Exception in {funcname}: {e}")
-                    results.append((funcname, f"error: {e}"))
-            next_time = datetime.datetime.now() + datetime.timedelta(seconds=interval)
-            MONITOR_NEXT_CHECK[project_name] = next_time.isoformat(timespec="seconds")
+    def run_once():
+        state = get_state(project_name)
+        state["last_run"] = now_iso()
+        state["last_result"] = results = []
+        for funcname, func in monitor_funcs:
             try:
-                await asyncio.wait_for(trig.wait(), timeout=interval)
-                trig.clear()
-                log_info("Triggered immediate check via trigger_watch.")
-            except asyncio.TimeoutError:
-                pass
+                log_info(f"Calling {funcname} ...")
+                result = func(**kwargs)
+                results.append((funcname, result))
+            except Exception as e:
+                log_warn(f"Exception in {funcname}: {e}")
+                results.append((funcname, f"error: {e}"))
+        next_time = datetime.datetime.now() + datetime.timedelta(seconds=interval)
+        MONITOR_NEXT_CHECK[project_name] = next_time.isoformat(timespec="seconds")
+        return results
 
     def blocking_loop():
         """Synchronous watcher loop (for legacy CLI or quick tests)."""
@@ -134,41 +119,27 @@ def start_watch(
             log_info(f"Waiting {delay}s before starting monitor loop...")
             time.sleep(delay)
         while True:
-            state = get_state(project_name)
-            state["last_run"] = now_iso()
-            state["last_result"] = results = []
-            for funcname, func in monitor_funcs:
-                try:
-                    log_info(f"Calling {funcname} ...")
-                    result = func(**kwargs)
-                    results.append((funcname, result))
-                except Exception as e:
-                    log_warn(f"Exception in {funcname}: {e}")
-                    results.append((funcname, f"error: {e}"))
-            next_time = datetime.datetime.now() + datetime.timedelta(seconds=interval)
-            MONITOR_NEXT_CHECK[project_name] = next_time.isoformat(timespec="seconds")
+            run_once()
             time.sleep(interval)
 
     # Main entry points
     if daemon:
-        return async_loop()
+        # Monitors run on the gateway's shared scheduler, so any number of
+        # them costs one timer thread; trigger_watch() calls task.run_now().
+        # Checks may block on nmcli or the network, so each run gets its own
+        # thread instead of a pool worker.
+        if delay > 0:
+            log_info(f"Waiting {delay}s before starting monitor loop...")
+        task = gw.schedule(
+            run_once, interval, delay=delay, name=f"monitor:{project_name}", dedicated=True,
+        )
+        MONITOR_TRIGGER[project_name] = task
+        gw._async_threads.append(task)
+        return task
     if block:
         blocking_loop()
     else:
-        state = get_state(project_name)
-        state["last_run"] = now_iso()
-        state["last_result"] = results = []
-        for funcname, func in monitor_funcs:
-            try:
-                log_info(f"Calling {funcname} ...")
-                result = func(**kwargs)
-                results.append((funcname, result))
-            except Exception as e:
-                log_warn(f"Exception in {funcname}: {e}")
-                results.append((funcname, f"error: {e}"))
-        next_time = datetime.datetime.now() + datetime.timedelta(seconds=interval)
-        MONITOR_NEXT_CHECK[project_name] = next_time.isoformat(timespec="seconds")
-        return results
+        return run_once()
 
 def view_monitor_panel(**_):
     """
@@ -1,8 +1,13 @@
 # file: projects/odoo.py
 
 import csv
+import json
 import re
+import threading
+import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from xmlrpc import client
 from datetime import datetime, timedelta
@@ -12,6 +17,7 @@ from gway import gw
 _TOKEN_RE = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ0-9']+")
 
 
+@lru_cache(maxsize=65536)
 def _strip_accents(value: str) -> str:
     if not value:
         return ""
@@ -36,6 +42,11 @@ def _tokenize_name(name: str) -> list[str]:
     return tokens
 
 
+@lru_cache(maxsize=65536)
+def _canonical_tokens(name: str) -> frozenset[str]:
+    return frozenset(_strip_accents(token).lower() for token in _tokenize_name(name))
+
+
 def _resolve_csv_path(csvfile: str) -> Path:
     if not csvfile:
         gw.abort("A CSV file name is required")
@@ -102,10 +113,15 @@ def _quote_sort_key(quote: dict) -> tuple[str, str]:
     return (create_date, name)
 
 
-def _find_quotes_for_customer(name: str) -> list[dict]:
+_QUOTE_FIELDS = ['id', 'name', 'state', 'partner_id', 'create_date', 'amount_total']
+_QUOTE_DOMAIN = [('state', '!=', 'cancel')]
+
+
+def _customer_search_terms(name: str) -> tuple[set[str], list[str]]:
+    """Return the canonical name tokens and the partner search terms for *name*."""
     normalized_name = (name or "").strip()
     if not normalized_name:
-        return []
+        return set(), []
 
     tokens = _tokenize_name(normalized_name)
     canonical_tokens = {_strip_accents(token).lower() for token in tokens}
@@ -135,38 +151,57 @@ def _find_quotes_for_customer(name: str) -> list[dict]:
             seen_terms.add(canonical)
             search_terms.append(variant)
 
-    fields = ['id', 'name', 'state', 'partner_id', 'create_date', 'amount_total']
-    domain_base = [('state', '!=', 'cancel')]
-    quotes_by_id: dict[int, dict] = {}
+    return canonical_tokens, search_terms
+
+
+def _quote_partner(quote: dict) -> tuple[object, str]:
+    """Return ``(partner id, partner name)`` from a quote's ``partner_id`` field."""
+    partner_field = quote.get('partner_id') or []
+    partner_id = None
+    partner_name = ""
+    if isinstance(partner_field, (list, tuple)) and partner_field:
+        partner_id = partner_field[0]
+        if len(partner_field) > 1 and isinstance(partner_field[1], str):
+            partner_name = partner_field[1]
+    elif isinstance(partner_field, int):
+        partner_id = partner_field
+    return partner_id, partner_name
+
+
+def _add_matched_quote(quotes_by_id: dict[int, dict], quote: dict, term: str) -> None:
+    quote_id = quote.get('id')
+    if not quote_id:
+        return
+    stored = quotes_by_id.get(quote_id)
+    if stored is None:
+        partner_id, partner_name = _quote_partner(quote)
+        stored = dict(quote)
+        stored['_partner_id'] = partner_id
+        stored['_partner_name'] = partner_name
+        stored['_matched_terms'] = set()
+        quotes_by_id[quote_id] = stored
+    stored['_matched_terms'].add(term)
 
-    for term in search_terms:
-        domain = domain_base + [('partner_id.name', 'ilike', term)]
-        results = execute_kw(
-            [domain], {'fields': fields},
-            model='sale.order', method='search_read'
-        )
+
+def _find_quotes_for_customer(name: str) -> list[dict]:
+    canonical_tokens, search_terms = _customer_search_terms(name)
+    if not search_terms:
+        return []
+
+    quotes_by_id: dict[int, dict] = {}
+    searches = execute_batch([
+        ('sale.order', 'search_read',
+         [_QUOTE_DOMAIN + [('partner_id.name', 'ilike', term)]], {'fields': _QUOTE_FIELDS})
+        for term in search_terms
+    ])
+    for term, results in zip(search_terms, searches):
         for quote in results:
-            quote_id = quote.get('id')
-            if not quote_id:
-                continue
-            stored = quotes_by_id.get(quote_id)
-            if stored is None:
-                partner_field = quote.get('partner_id') or []
-                partner_id = None
-                partner_name = ""
-                if isinstance(partner_field, (list, tuple)) and partner_field:
-                    partner_id = partner_field[0]
-                    if len(partner_field) > 1 and isinstance(partner_field[1], str):
-                        partner_name = partner_field[1]
-                elif isinstance(partner_field, int):
-                    partner_id = partner_field
-                stored = dict(quote)
-                stored['_partner_id'] = partner_id
-                stored['_partner_name'] = partner_name
-                stored['_matched_terms'] = set()
-                quotes_by_id[quote_id] = stored
-            stored['_matched_terms'].add(term)
+            _add_matched_quote(quotes_by_id, quote, term)
+
+    return _rank_customer_quotes(quotes_by_id, canonical_tokens)
 
+
+def _rank_customer_quotes(quotes_by_id: dict[int, dict], canonical_tokens: set[str]) -> list[dict]:
     if not quotes_by_id:
         return []
 
@@ -195,10 +230,7 @@ def _find_quotes_for_customer(name: str) -> list[dict]:
             group['sent_count'] += 1
 
     for group in partners.values():
-        partner_tokens = {
-            _strip_accents(token).lower()
-            for token in _tokenize_name(group.get('partner_name') or "")
-        }
+        partner_tokens = _canonical_tokens(group.get('partner_name') or "")
         group['token_overlap'] = len(canonical_tokens & partner_tokens)
 
     best_group = max(
@@ -212,7 +244,11 @@ def _find_quotes_for_customer(name: str) -> list[dict]:
         )
     )
 
-    quotes = best_group['quotes']
+    return _select_quotes(best_group['quotes'])
+
+
+def _select_quotes(quotes: list[dict]) -> list[dict]:
+    """Newest first, only the sent ones when there are any."""
     sent_quotes = [quote for quote in quotes if quote.get('state') == 'sent']
     if len(sent_quotes) == 1:
         quotes_to_use = sent_quotes
@@ -238,10 +274,163 @@ def _find_quotes_for_customer(name: str) -> list[dict]:
     return sanitized
 
 
+# Faults that mean the cached uid is no longer accepted.
+_AUTH_FAULTS = ("AccessDenied", "Access Denied", "SessionExpired", "Session expired")
+
+# Concurrent requests per session when the server has no system.multicall.
+BATCH_WORKERS = 4
+
+_RESERVED_KWARGS = ("db_name", "uid", "password", "model", "method")
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _is_auth_fault(error) -> bool:
+    return isinstance(error, client.Fault) and any(
+        marker in str(error.faultString) for marker in _AUTH_FAULTS
+    )
+
+
+class _NoMulticall(Exception):
+    """The server rejected ``system.multicall`` itself."""
+
+
+class OdooSession:
+    """Authenticated XML-RPC access to one Odoo database as one user.
+
+    The uid is cached after the first ``authenticate`` and refreshed only
+    when the server answers with an access fault. Each thread keeps its
+    own ``ServerProxy`` pair, whose transport holds the HTTP connection
+    open between calls.
+    """
+
+    def __init__(self, url, db_name, username, password, *, workers=BATCH_WORKERS):
+        self.url = url.rstrip("/")
+        self.db_name = db_name
+        self.username = username
+        self.password = password
+        self.workers = workers
+        self.uid = None
+        self.multicall_supported = None  # unknown until the first batch
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _proxy(self, endpoint):
+        proxies = self._local.__dict__
+        proxy = proxies.get(endpoint)
+        if proxy is None:
+            proxy = client.ServerProxy(f"{self.url}/xmlrpc/2/{endpoint}")
+            proxies[endpoint] = proxy
+        return proxy
+
+    def authenticate(self, *, stale=None):
+        """Return a valid uid, logging in again only if it is missing or *stale*."""
+        with self._lock:
+            if self.uid is None or self.uid == stale:
+                uid = self._proxy("common").authenticate(
+                    self.db_name, self.username, self.password, {}
+                )
+                if not uid:
+                    raise client.Fault(3, f"AccessDenied: {self.username}@{self.db_name}")
+                self.uid = uid
+            return self.uid
+
+    def _retrying(self, call):
+        uid = self.authenticate()
+        try:
+            return call(uid)
+        except client.Fault as fault:
+            if not _is_auth_fault(fault):
+                raise
+            gw.debug("Odoo uid %s rejected, authenticating again", uid)
+            return call(self.authenticate(stale=uid))
+
+    def execute(self, model, method, *args):
+        """Call ``model.method(*args)`` through ``execute_kw``."""
+        return self._retrying(lambda uid: self._proxy("object").execute_kw(
+            self.db_name, uid, self.password, model, method, *args
+        ))
+
+    def batch(self, calls):
+        """Run ``[(model, method, *args), ...]`` and return results in order.
+
+        Servers that offer ``system.multicall`` get a single request;
+        otherwise the calls run concurrently on at most ``workers``
+        threads. The first failing call raises.
+        """
+        calls = [tuple(call) for call in calls]
+        if not calls:
+            return []
+        if self.multicall_supported is not False:
+            try:
+                return self._retrying(lambda uid: self._multicall(uid, calls))
+            except _NoMulticall:
+                # Odoo's own XML-RPC endpoint has no system.multicall.
+                self.multicall_supported = False
+        if len(calls) == 1:
+            return [self.execute(*calls[0])]
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="odoo-batch"
+                )
+        futures = [self._pool.submit(self.execute, *call) for call in calls]
+        return [future.result() for future in futures]
+
+    def _multicall(self, uid, calls):
+        multicall = client.MultiCall(self._proxy("object"))
+        for model, method, *args in calls:
+            multicall.execute_kw(self.db_name, uid, self.password, model, method, *args)
+        try:
+            results = multicall()
+        except client.Fault as fault:
+            if self.multicall_supported or _is_auth_fault(fault):
+                raise
+            raise _NoMulticall() from fault
+        self.multicall_supported = True
+        # Iterating raises the Fault of the first failed call
+        return list(results)
+
+
+def get_session(*, url=None, db_name=None, username=None, password=None) -> OdooSession:
+    """Return the shared :class:`OdooSession` for the configured Odoo user.
+
+    Unset parameters come from ``ODOO_BASE_URL``, ``ODOO_DB_NAME``,
+    ``ODOO_ADMIN_USER`` and ``ODOO_ADMIN_PASSWORD``.
+    """
+    url = url or gw.resolve("[ODOO_BASE_URL]")
+    db_name = db_name or gw.resolve("[ODOO_DB_NAME]")
+    username = username or gw.resolve("[ODOO_ADMIN_USER]")
+    password = password or gw.resolve("[ODOO_ADMIN_PASSWORD]")
+    if url.startswith("[") or "ODOO_BASE_URL" in url:
+        gw.abort("Odoo XML-RPC url not configured. Please set ODOO_BASE_URL correctly.")
+
+    key = (url, db_name, username)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None or session.password != password:
+            session = OdooSession(url, db_name, username, password)
+            _sessions[key] = session
+    return session
+
+
+def _clean_kwargs(kwargs):
+    for reserved in _RESERVED_KWARGS:
+        if reserved in kwargs:
+            gw.warning(f"Removing reserved keyword: {reserved}")
+            kwargs.pop(reserved)
+    return kwargs
+
+
 def execute_kw(*args, model: str, method: str, **kwargs) -> dict:
     """
     A generic function to directly interface with Odoo's execute_kw method.
 
+    Calls go through the shared :class:`OdooSession`, so authentication
+    and the HTTP connection are reused between calls.
+
     Parameters:
         model (str): The Odoo model to interact with (e.g., 'sale.order').
         method (str): The method to call on the model (e.g., 'read', 'write').
@@ -251,37 +440,43 @@ def execute_kw(*args, model: str, method: str, **kwargs) -> dict:
     Returns:
         dict: The result of the execute_kw call.
     """
-    url = gw.resolve("[ODOO_BASE_URL]")
-    db_name = gw.resolve("[ODOO_DB_NAME]")
-    username = gw.resolve("[ODOO_ADMIN_USER]")
-    password = gw.resolve("[ODOO_ADMIN_PASSWORD]")
-
-    gw.info(f"Odoo Execute: {model=} {method=} @ {url=} {db_name=} {username=}")
-    if url.startswith("[") or "ODOO_BASE_URL" in url:
-        gw.abort("Odoo XML-RPC url not configured. Please set ODOO_BASE_URL correctly.")
+    session = get_session()
+    gw.info("Odoo Execute: model=%r method=%r @ url=%r db_name=%r username=%r",
+            model, method, session.url, session.db_name, session.username)
+    _clean_kwargs(kwargs)
     try:
-        common_client = client.ServerProxy(f"{url}/xmlrpc/2/common")
-    except Exception as e:
-        gw.exception(f"Error with ServerProxy setup", e)
+        gw.debug("Model client call execute_kw %s.%s with args=%r kwargs=%r",
+                 model, method, args, kwargs)
+        return session.execute(model, method, *args, *([kwargs] if kwargs else []))
+    except client.Fault as e:
+        if _is_auth_fault(e):
+            gw.error(f"Error with Odoo authentication: {e}")
+            print(f"( Did you forget to specify the correct --client? )")
+        else:
+            gw.error(f"Error executing {model}.{method}: {e}")
         raise
-    gw.debug(f"ServerProxy client: {common_client}")
-    try:
-        uid = common_client.authenticate(db_name, username, password, {})
     except Exception as e:
-        gw.error(f"Error with Odoo authentication: {e}")
-        print(f"( Did you forget to specify the correct --client? )")
+        gw.error(f"Error executing {model}.{method}: {e}")
         raise
 
+
+def execute_batch(calls) -> list:
+    """
+    Run several execute_kw calls with as few round-trips as possible.
+
+    Parameters:
+        calls (list): ``(model, method, *args)`` tuples, e.g.
+            ``('res.partner', 'search_read', [domain], {'fields': fields})``.
+
+    Returns:
+        list: One result per call, in the same order.
+    """
+    session = get_session()
+    gw.info("Odoo Batch: %d call(s) @ url=%r db_name=%r", len(calls), session.url, session.db_name)
     try:
-        models_client = client.ServerProxy(f"{url}/xmlrpc/2/object")
-        for reserved in ("db_name", "uid", "password", "model", "method"):
-            gw.warning(f"Removing reserved keyword: {reserved}")
-            kwargs.pop(reserved, None)
-        gw.debug(f"Model client call execute_kw {model}.{method} with {args=} {kwargs=}")
-        result = models_client.execute_kw(db_name, uid, password, model, method, *args, **kwargs)
-        return result
+        return session.batch(calls)
     except Exception as e:
-        gw.error(f"Error executing {model}.{method}: {e}")
+        gw.error(f"Error executing Odoo batch: {e}")
         raise
 
 
@@ -481,25 +676,30 @@ def fetch_order(order_id):
     line_fields = ['product_id', 'name', 'price_unit', 'product_uom_qty']
     
     # Check if order_id is a string that starts with 'S' and fetch by name instead of ID
+    order_result = None
     if isinstance(order_id, str) and order_id.startswith('S'):
         order_domain_filter = [('name', '=', order_id)]
         order_result = execute_kw(
-            order_model, 'search_read', [order_domain_filter], {'fields': order_fields})
+            [order_domain_filter], {'fields': order_fields},
+            model=order_model, method='search_read',
+        )
         if order_result:
             order_id = order_result[0]['id']
         else:
             return {'error': 'Order not found.'}
-    else:
-        order_result = execute_kw(
-            [[order_id]], {'fields': order_fields},
-            model=order_model, method=order_method,
-        )
 
     line_domain_filter = [('order_id', '=', order_id)]
-    line_result = execute_kw(
-        [line_domain_filter], {'fields': line_fields},
-        model=line_model, method=line_method,
-    )
+    if order_result is None:
+        # Order and lines are independent reads: one batch instead of two calls
+        order_result, line_result = execute_batch([
+            (order_model, order_method, [[order_id]], {'fields': order_fields}),
+            (line_model, line_method, [line_domain_filter], {'fields': line_fields}),
+        ])
+    else:
+        line_result = execute_kw(
+            [line_domain_filter], {'fields': line_fields},
+            model=line_model, method=line_method,
+        )
     
     result = {
         'order_info': order_result,
@@ -759,6 +959,142 @@ def find_quotes(
     return quotes
 
 
+# Quotations per search_read page when prefetching the quote index.
+QUOTE_INDEX_PAGE = 2000
+
+
+class QuoteIndex:
+    """Every non-cancelled quotation, grouped by partner and indexed by name.
+
+    Answers ``_find_quotes_for_customer`` from memory. Partner names are
+    indexed by the accent-stripped, lowercased words of ``_tokenize_name``;
+    a search term matches a partner whose name has all of its words, and
+    multi-word terms must also appear as a phrase, much like Odoo's
+    ``ilike`` on an unaccented database. Single words match whole words
+    only. Work per row depends on the partners matched, not on the size
+    of the index.
+    """
+
+    def __init__(self, quotes, *, created=None):
+        self.quotes = [quote for quote in quotes if quote.get('id')]
+        self.created = time.time() if created is None else created
+        self._partners: dict[object, dict] = {}
+        self._tokens: dict[str, list[object]] = {}
+        for quote in self.quotes:
+            key, name = _quote_partner(quote)
+            if key is None:
+                key = name
+            partner = self._partners.get(key)
+            if partner is None:
+                partner = self._partners[key] = {
+                    'name': name,
+                    'canonical': _strip_accents(name).lower(),
+                    'tokens': _canonical_tokens(name),
+                    'quotes': [],
+                    'sent_count': 0,
+                    'latest_date': "",
+                }
+                for token in partner['tokens']:
+                    self._tokens.setdefault(token, []).append(key)
+            partner['quotes'].append(quote)
+            quote_date = quote.get('create_date') or ""
+            if quote_date > partner['latest_date']:
+                partner['latest_date'] = quote_date
+            if quote.get('state') == 'sent':
+                partner['sent_count'] += 1
+
+    def __len__(self):
+        return len(self.quotes)
+
+    @classmethod
+    def fetch(cls, *, page_size: int = QUOTE_INDEX_PAGE) -> "QuoteIndex":
+        """Download the quotations in ``search_read`` pages of *page_size*."""
+        total = execute_kw([_QUOTE_DOMAIN], model='sale.order', method='search_count')
+        pages = execute_batch([
+            ('sale.order', 'search_read', [_QUOTE_DOMAIN],
+             {'fields': _QUOTE_FIELDS, 'offset': offset, 'limit': page_size, 'order': 'id'})
+            for offset in range(0, total, page_size)
+        ])
+        return cls(quote for page in pages for quote in page)
+
+    def partners_matching(self, term: str) -> list[object]:
+        phrase = _strip_accents(term).strip().lower()
+        words = _canonical_tokens(term)
+        if not words:
+            return [key for key, p in self._partners.items() if phrase and phrase in p['canonical']]
+        candidates = min((self._tokens.get(word, ()) for word in words), key=len)
+        if len(words) == 1:
+            return list(candidates)
+        return [key for key in candidates if phrase in self._partners[key]['canonical']]
+
+    def find(self, name: str) -> list[dict]:
+        """Same result as ``_find_quotes_for_customer(name)``, without requests."""
+        canonical_tokens, search_terms = _customer_search_terms(name)
+        matched: dict[object, set[str]] = {}
+        for term in search_terms:
+            canonical = _strip_accents(term).lower()
+            for key in self.partners_matching(term):
+                matched.setdefault(key, set()).add(canonical)
+        if not matched:
+            return []
+
+        def rank(key):
+            partner = self._partners[key]
+            return (
+                len(canonical_tokens & partner['tokens']),
+                len(matched[key]),
+                partner['sent_count'],
+                partner['latest_date'],
+                partner['name'],
+            )
+
+        return _select_quotes(self._partners[max(matched, key=rank)]['quotes'])
+
+    def save(self, path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({'created': self.created, 'quotes': self.quotes}),
+                       encoding='utf-8')
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path) -> "QuoteIndex":
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+        return cls(data['quotes'], created=data['created'])
+
+
+def _quote_index_path() -> Path:
+    session = get_session()
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{session.db_name}@{session.url}")
+    return Path(gw.resource("work", "odoo", f"quote_index_{slug}.json"))
+
+
+def load_quote_index(*, ttl: float | str | None = None, refresh: bool = False) -> QuoteIndex:
+    """Return the prefetched :class:`QuoteIndex` for the configured database.
+
+    With ``ttl`` (seconds) the index is stored under ``work/odoo/`` and
+    reused while younger than ``ttl``; ``refresh`` forces a new download.
+    """
+    ttl = float(ttl) if ttl not in (None, "") else None
+    path = _quote_index_path() if ttl is not None else None
+    if path is not None and not refresh and path.exists():
+        try:
+            index = QuoteIndex.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            gw.warning(f"Ignoring unreadable quote index {path}: {e}")
+        else:
+            if time.time() - index.created < ttl:
+                gw.info("Using quote index %s (%d quotations)", path, len(index))
+                return index
+    start = time.perf_counter()
+    index = QuoteIndex.fetch()
+    gw.info("Prefetched %d quotations in %.2fs", len(index), time.perf_counter() - start)
+    if path is not None:
+        index.save(path)
+    return index
+
+
 def add_quote_ids(
     *,
     csvfile: str,
@@ -767,6 +1103,8 @@ def add_quote_ids(
     quote_cap: float | str | None = 50_000,
     filler: str | None = "XX",
     skip_missing: bool | str = False,
+    prefetch: bool | str = False,
+    index_ttl: float | str | None = None,
 ) -> dict:
     """Add quotation identifiers to a CSV file based on customer names.
 
@@ -784,6 +1122,12 @@ def add_quote_ids(
             to ``"XX"``. Use ``None`` to leave the cell blank.
         skip_missing (bool | str): When truthy, rows without a matching quote
             are removed from the CSV entirely.
+        prefetch (bool | str): Download all quotations once and match every
+            row against a local name index (see :class:`QuoteIndex`) instead
+            of searching Odoo per customer. Best for large sheets.
+        index_ttl (float | str | None): Keep the prefetched index in
+            ``work/odoo/`` and reuse it for this many seconds. Implies
+            ``prefetch``.
 
     Returns:
         dict: Summary including counts of processed rows and matched quotations.
@@ -941,6 +1285,9 @@ def add_quote_ids(
         processed_rows.append(header_row)
 
     quote_cache: dict[str, list[dict]] = {}
+    lookup_quotes = _find_quotes_for_customer
+    if gw.cast.to_bool(prefetch) or index_ttl not in (None, ""):
+        lookup_quotes = load_quote_index(ttl=index_ttl).find
     matched_rows = 0
     quotes_added = 0
     skipped_rows = 0
@@ -953,7 +1300,7 @@ def add_quote_ids(
             cache_key = _strip_accents(customer_name).lower() or customer_name.lower()
             cached = quote_cache.get(cache_key)
             if cached is None:
-                cached = _find_quotes_for_customer(customer_name)
+                cached = lookup_quotes(customer_name)
                 quote_cache[cache_key] = cached
             quotes = cached
         else:
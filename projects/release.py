@@ -843,10 +843,15 @@ def loc(*paths):
     return file_counts
 
 
-def benchmark_sigils(iterations: int = 10000) -> float:
-    """Benchmark Sigil resolution performance."""
+def benchmark_sigils(iterations: int = 10000) -> dict:
+    """Benchmark Sigil resolution with and without the compiled template cache.
+
+    Returns the number of ``sigils`` resolved per mode, the seconds spent
+    compiling every template on each resolution (``uncompiled_each_time``)
+    and reusing the cached template (``cached``), and their ``speedup``.
+    """
     from time import perf_counter
-    from gway.sigils import Sigil
+    from gway.sigils import Sigil, CompiledSigil, compile_sigil
 
     ctx = {
         "name": "Bench",
@@ -859,16 +864,33 @@ def benchmark_sigils(iterations: int = 10000) -> float:
         Sigil("[info.x]"),
         Sigil("[info]")
     ]
+    lookups = [(s.text, s._make_lookup(ctx)) for s in samples]
+
+    # Compile the template again for every resolution, bypassing the cache.
+    start = perf_counter()
+    for _ in range(iterations):
+        for text, lookup in lookups:
+            _ = CompiledSigil(text).resolve(lookup)
+    uncompiled = perf_counter() - start
 
     start = perf_counter()
     for _ in range(iterations):
-        for s in samples:
-            _ = s % ctx
-    elapsed = perf_counter() - start
+        for text, lookup in lookups:
+            _ = compile_sigil(text).resolve(lookup)
+    cached = perf_counter() - start
+
+    total = iterations * len(samples)
+    speedup = uncompiled / cached if cached else float("inf")
     gw.info(
-        f"Resolved {iterations * len(samples)} sigils in {elapsed:.4f}s"
+        f"Resolved {total} sigils: {uncompiled:.4f}s compiling each time, "
+        f"{cached:.4f}s cached ({speedup:.1f}x)"
     )
-    return elapsed
+    return {
+        "sigils": total,
+        "uncompiled_each_time": uncompiled,
+        "cached": cached,
+        "speedup": speedup,
+    }
 
 
 def create_shortcut(
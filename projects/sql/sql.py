@@ -2,13 +2,21 @@
 
 import os
 import csv
+import json
 import queue
+import hashlib
+import shutil
 import sqlite3
+import tempfile
 import threading
+import itertools
+import multiprocessing
 import re
 import time
 import inspect
+from concurrent.futures import Future, ProcessPoolExecutor
 from gway import gw
+from gway.logging import JSON_LOG_FIELDS
 
 # Regex mask matching the default gway logging pattern. This captures the
 # timestamp, log level, logger name, function name, filename, line number, and
@@ -33,14 +41,53 @@ DEFAULT_LOG_MASK = (
 # sql open-db
 #   - execute "<SQL>"
 
-_write_queue = queue.Queue()
-_writer_thread = None
-_writer_shutdown = threading.Event()
+# Group commit knobs: each writer drains up to WRITE_BATCH_SIZE queued writes,
+# waiting at most WRITE_BATCH_LATENCY seconds for more once one arrives, and
+# commits them in one transaction per connection.
+WRITE_BATCH_SIZE = 500
+WRITE_BATCH_LATENCY = 0.0
+
+# SQLite connections are pooled per (project, engine, datafile). A thread
+# leases one connection until close_db() hands it back; up to POOL_SIZE
+# connections are kept for reuse per pool. When all of them are leased a new
+# thread opens an overflow connection of its own, which is closed instead of
+# pooled on release. Most threads never call close_db(), so by default there
+# is no waiting for a lease to come back; a positive POOL_TIMEOUT waits up to
+# that many seconds first. Both can be overridden per database through
+# open_db().
+POOL_SIZE = 8
+POOL_TIMEOUT = 0.0
+
+# PRAGMAs applied to every new SQLite connection. Override any of them with
+# open_db(**dbopts); ``None`` leaves the SQLite default in place.
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": None,
+    "cache_size": None,
+}
+_JOURNAL_MODES = {"delete", "truncate", "persist", "memory", "wal", "off"}
+_SYNC_LEVELS = {"off", "normal", "full", "extra", "0", "1", "2", "3"}
 
 class WrappedConnection:
     def __init__(self, connection):
-        self._connection = connection
+        self._raw = connection
         self._cursor = None
+        self._pool = None
+
+    @property
+    def _connection(self):
+        if self._raw is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a released database connection.")
+        return self._raw
+
+    def _detach(self):
+        """Move the connection into a fresh wrapper and invalidate this one."""
+        fresh = WrappedConnection.__new__(WrappedConnection)
+        fresh.__dict__.update(self.__dict__)
+        fresh._cursor = None
+        self._raw = None
+        return fresh
 
     def __enter__(self):
         self._cursor = self._connection.cursor()
@@ -68,185 +115,737 @@ class WrappedConnection:
         return self._connection.rollback()
 
     def close(self):
+        # Pooled connections go back to their pool instead of closing.
+        if self._pool is not None:
+            return self._pool.release(self)
         return self._connection.close()
 
 
+# Streaming ingest: column types are inferred from the first INGEST_SAMPLE_ROWS
+# data rows and rows are inserted INGEST_CHUNK_SIZE at a time, one transaction
+# per source file. Both can be overridden per call.
+INGEST_SAMPLE_ROWS = 1000
+INGEST_CHUNK_SIZE = 5000
+
+_TYPE_RANK = {"INTEGER": 0, "REAL": 1, "TEXT": 2}
+
+
 def infer_type(val):
     t, _ = gw.try_cast(val, INTEGER=int, REAL=float)
     return t or "TEXT"
 
 
-def load_csv(*, connection=None, folder="data", force=False):
+def _value_type(val):
+    if isinstance(val, (bool, int)):
+        return "INTEGER"
+    if isinstance(val, float):
+        return "REAL"
+    if isinstance(val, str):
+        return infer_type(val)
+    return "TEXT"
+
+
+def _infer_types(sample, width):
+    """Return the narrowest type per column that fits every sampled value."""
+    types = [None] * width
+    for row in sample:
+        for i in range(min(width, len(row))):
+            val = row[i]
+            if val is None or val == "" or types[i] == "TEXT":
+                continue
+            t = _value_type(val)
+            if types[i] is None or _TYPE_RANK[t] > _TYPE_RANK[types[i]]:
+                types[i] = t
+    return [t or "TEXT" for t in types]
+
+
+def _unique_headers(headers):
+    seen = set()
+    unique = []
+    for i, h in enumerate(headers):
+        h_clean = str(h).strip() if h is not None else f"Unnamed: {i}"
+        h_final = h_clean
+        n = 1
+        while h_final.lower() in seen:
+            h_final = f"{h_clean}_{n}"
+            n += 1
+        unique.append(h_final)
+        seen.add(h_final.lower())
+    return unique
+
+
+def _plain(val):
+    """Convert values sqlite3 cannot bind (dates, times, ...) to text."""
+    if val is None or isinstance(val, (str, int, float, bytes)):
+        return val
+    return str(val)
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _ingest_rows(connection, table, headers, rows, *, force, sample, chunk_size,
+                 source, commit=True):
+    """Create ``table`` and stream ``rows`` into it inside one transaction.
+
+    With ``commit=False`` the caller owns the (already open) transaction.
+    Returns a stats dict, or ``None`` when the table was skipped.
+    """
+    start = time.perf_counter()
+    cursor = connection.cursor()
+    try:
+        exists = _table_exists(cursor, table)
+        if exists and not force:
+            gw.verbose(f"Skipped existing table: {table}")
+            return None
+        headers = _unique_headers(headers)
+        rows = iter(rows)
+        head = list(itertools.islice(rows, sample))
+        if not head:
+            gw.warning(f"Skipping empty source: {source}")
+            return None
+        types = _infer_types(head, len(headers))
+        width = len(headers)
+
+        def fit(row):
+            row = list(row[:width])
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+            return row
+
+        if commit and not connection.in_transaction:
+            # DDL does not open a transaction implicitly; keep the DROP,
+            # CREATE and inserts together.
+            cursor.execute("BEGIN")
+        if exists:
+            cursor.execute(f'DROP TABLE IF EXISTS "{table}"')
+            gw.info(f"Dropped existing table: {table}")
+        colspec = ", ".join(f'"{h}" {t}' for h, t in zip(headers, types))
+        cursor.execute(f'CREATE TABLE "{table}" ({colspec})')
+        columns_join = ", ".join(f'"{h}"' for h in headers)
+        placeholders = ", ".join("?" for _ in headers)
+        insert = f'INSERT INTO "{table}" ({columns_join}) VALUES ({placeholders})'
+
+        count = len(head)
+        cursor.executemany(insert, map(fit, head))
+        while True:
+            chunk = [fit(row) for row in itertools.islice(rows, chunk_size)]
+            if not chunk:
+                break
+            cursor.executemany(insert, chunk)
+            count += len(chunk)
+        if commit:
+            connection.commit()
+    except Exception:
+        if commit:
+            connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    elapsed = time.perf_counter() - start
+    stats = {
+        "source": source,
+        "table": table,
+        "columns": width,
+        "rows": count,
+        "seconds": elapsed,
+        "rows_per_sec": count / elapsed if elapsed else float("inf"),
+    }
+    gw.info(
+        f"Loaded table '{table}' with {width} columns from {source} "
+        f"({count} rows, {stats['rows_per_sec']:.0f} rows/s)"
+    )
+    return stats
+
+
+def _csv_table(path, prefix):
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    table_name = f"{prefix}_{base_name}" if prefix else base_name
+    return table_name.replace("-", "_")
+
+
+def _book_prefix(path, prefix):
+    base = os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+    return f"{prefix}_{base}" if prefix else base
+
+
+def _load_csv_file(connection, path, prefix, **opts):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        try:
+            headers = next(reader)
+        except StopIteration:
+            gw.warning(f"Skipping empty CSV: {path}")
+            return []
+        stats = _ingest_rows(connection, _csv_table(path, prefix), headers, reader,
+                             source=path, **opts)
+    return [stats] if stats else []
+
+
+def _excel_sheets(path):
+    """Yield ``(sheet_name, headers, rows)`` reading each sheet row by row."""
+    if path.lower().endswith(".xls"):
+        # Legacy .xls has no streaming reader; fall back to pandas per sheet.
+        import pandas as pd
+        with pd.ExcelFile(path) as book:
+            for sheet_name in book.sheet_names:
+                df = book.parse(sheet_name)
+                df = df.astype(object).where(df.notna(), None)
+                yield sheet_name, list(df.columns), df.itertuples(index=False, name=None)
+        return
+    import openpyxl
+    book = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in book.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            headers = next(rows, None)
+            if headers is None:
+                gw.warning(f"Skipping empty sheet '{sheet.title}' in {path}")
+                continue
+            yield sheet.title, list(headers), (tuple(map(_plain, r)) for r in rows)
+    finally:
+        book.close()
+
+
+def _load_excel_file(connection, path, prefix, **opts):
+    prefix_final = _book_prefix(path, prefix)
+    loaded = []
+    for sheet_name, headers, rows in _excel_sheets(path):
+        sheet_clean = sheet_name.strip().replace(" ", "_").replace("-", "_")
+        table = f"{prefix_final}_{sheet_clean}" if sheet_clean else prefix_final
+        stats = _ingest_rows(connection, table, headers, rows,
+                             source=f"{path} [{sheet_name}]", **opts)
+        if stats:
+            loaded.append(stats)
+    return loaded
+
+
+def _load_cdv_file(connection, path, prefix, **opts):
+    with open(path, "r") as f:
+        # Both passes read through one handle: a compaction replaces the file
+        # under a new inode and appends land past the records counted here.
+        # First pass: column union and the last line of every id (later lines win).
+        columns = {}
+        last = {}
+        total = 0
+        for n, (entry, fields) in enumerate(gw.cdv.parse_records(f)):
+            last[entry] = n
+            total = n + 1
+            for key in fields:
+                columns.setdefault(key, None)
+        if not last:
+            gw.debug(f"No records in CDV: {path}")
+            return []
+        columns = list(columns)
+
+        def rows():
+            f.seek(0)
+            for n, (entry, fields) in enumerate(gw.cdv.parse_records(f)):
+                if n >= total:
+                    break
+                if last.get(entry) == n:
+                    yield [entry] + [fields.get(c) for c in columns]
+
+        stats = _ingest_rows(connection, _book_prefix(path, prefix), ["id"] + columns,
+                             rows(), source=path, **opts)
+    return [stats] if stats else []
+
+
+_LOADERS = {
+    "csv": (_load_csv_file, (".csv",)),
+    "excel": (_load_excel_file, (".xlsx", ".xls")),
+    "cdv": (_load_cdv_file, (".cdv",)),
+}
+
+
+def _find_sources(base_path, suffixes, prefix=""):
+    found = []
+    for item in os.listdir(base_path):
+        full = os.path.join(base_path, item)
+        if os.path.isdir(full):
+            sub = f"{prefix}_{item}" if prefix else item
+            found.extend(_find_sources(full, suffixes, sub))
+        elif item.lower().endswith(suffixes):
+            found.append((full, prefix))
+    return found
+
+
+def _stage_source(kind, path, prefix, stage_path, skip, opts):
+    """Process-pool worker: stream one source into a private staging database."""
+    loader = _LOADERS[kind][0]
+    conn = sqlite3.connect(stage_path)
+    try:
+        for table in skip:
+            conn.execute(f'CREATE TABLE "{table}" (_skip INTEGER)')
+        conn.commit()
+        return loader(conn, path, prefix, **{**opts, "force": False})
+    finally:
+        conn.close()
+
+
+def _merge_stage(connection, stage_path, loaded, force):
+    """Copy staged tables into ``connection`` in one transaction."""
+    raw = connection._connection if isinstance(connection, WrappedConnection) else connection
+    raw.execute("ATTACH DATABASE ? AS stage", (stage_path,))
+    try:
+        cursor = raw.cursor()
+        try:
+            for stats in loaded:
+                table = stats["table"]
+                if _table_exists(cursor, table):
+                    if not force:
+                        gw.verbose(f"Skipped existing table: {table}")
+                        continue
+                    cursor.execute(f'DROP TABLE "{table}"')
+                cursor.execute(
+                    "SELECT sql FROM stage.sqlite_master WHERE type='table' AND name=?",
+                    (table,),
+                )
+                cursor.execute(cursor.fetchone()[0])
+                cursor.execute(f'INSERT INTO main."{table}" SELECT * FROM stage."{table}"')
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            cursor.close()
+    finally:
+        raw.execute("DETACH DATABASE stage")
+
+
+def _load_sources(connection, kind, sources, *, force, sample, chunk_size, workers):
+    opts = {
+        "force": force,
+        "sample": sample or INGEST_SAMPLE_ROWS,
+        "chunk_size": chunk_size or INGEST_CHUNK_SIZE,
+    }
+    loader = _LOADERS[kind][0]
+    workers = min(int(workers or 1), len(sources))
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        gw.debug("Parallel ingest needs the fork start method; loading sequentially.")
+        workers = 1
+    if workers <= 1:
+        loaded = []
+        for path, prefix in sources:
+            loaded.extend(loader(connection, path, prefix, **opts))
+        return loaded
+
+    # Parse in worker processes, each writing to its own staging database,
+    # then copy the staged tables over on this connection.
+    cursor = connection.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    skip = [] if force else [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    stage_dir = tempfile.mkdtemp(prefix="gw-ingest-", dir=gw.resource("work", dir=True))
+    loaded = []
+    try:
+        ctx = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = [
+                (pool.submit(_stage_source, kind, path, prefix,
+                             os.path.join(stage_dir, f"{n}.sqlite"), skip, opts),
+                 os.path.join(stage_dir, f"{n}.sqlite"))
+                for n, (path, prefix) in enumerate(sources)
+            ]
+            for future, stage_path in futures:
+                staged = future.result()
+                if staged:
+                    _merge_stage(connection, stage_path, staged, force)
+                    loaded.extend(staged)
+    finally:
+        shutil.rmtree(stage_dir, ignore_errors=True)
+    return loaded
+
+
+def load_csv(*, connection=None, folder="data", force=False,
+             sample=None, chunk_size=None, workers=None):
     """
     Recursively loads CSVs from a folder into SQLite tables.
     Table names are derived from folder/file paths.
+
+    Files are streamed: column types come from the first ``sample`` rows and
+    rows are inserted ``chunk_size`` at a time in one transaction per file.
+    ``workers`` > 1 parses files in parallel processes. Returns per-file stats
+    including ``rows_per_sec``.
     """
     assert connection
-    base_path = gw.resource(folder)
+    sources = _find_sources(gw.resource(folder), _LOADERS["csv"][1])
+    return _load_sources(connection, "csv", sources, force=force, sample=sample,
+                         chunk_size=chunk_size, workers=workers)
 
-    def load_folder(path, prefix=""):
-        cursor = connection.cursor()
-        for item in os.listdir(path):
-            full_path = os.path.join(path, item)
-            if os.path.isdir(full_path):
-                sub_prefix = f"{prefix}_{item}" if prefix else item
-                load_folder(full_path, sub_prefix)
-            elif item.endswith(".csv"):
-                base_name = os.path.splitext(item)[0]
-                table_name = f"{prefix}_{base_name}" if prefix else base_name
-                table_name = table_name.replace("-", "_")
-
-                with open(full_path, "r", encoding="utf-8") as f:
-                    reader = csv.reader(f)
-                    try:
-                        headers = next(reader)
-                        sample_row = next(reader)
-                    except StopIteration:
-                        gw.warning(f"Skipping empty CSV: {full_path}")
-                        continue
 
-                    seen = set()
-                    unique_headers = []
-                    for h in headers:
-                        h_clean = h.strip()
-                        h_final = h_clean
-                        i = 1
-                        while h_final.lower() in seen:
-                            h_final = f"{h_clean}_{i}"
-                            i += 1
-                        unique_headers.append(h_final)
-                        seen.add(h_final.lower())
-
-                    types = [
-                        infer_type(sample_row[i])
-                        if i < len(sample_row) else "TEXT"
-                        for i in range(len(unique_headers))
-                    ]
-
-                    cursor.execute(
-                        "SELECT name FROM sqlite_master "
-                        "WHERE type='table' AND name=?", (table_name,)
-                    )
-                    exists = cursor.fetchone()
+def load_excel(*, connection=None, file=None, folder="data", force=False,
+               sample=None, chunk_size=None, workers=None):
+    """Load Excel workbooks into tables, one table per sheet.
 
-                    if exists and force:
-                        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
-                        gw.info(f"Dropped existing table: {table_name}")
+    Sheets are read row by row (see :func:`load_csv` for the options).
+    """
+    assert connection
+    if file:
+        sources = [(str(gw.resource(file)), "")]
+    else:
+        sources = _find_sources(gw.resource(folder), _LOADERS["excel"][1])
+    return _load_sources(connection, "excel", sources, force=force, sample=sample,
+                         chunk_size=chunk_size, workers=workers)
 
-                    if not exists or force:
-                        colspec = ", ".join(
-                            f'"{unique_headers[i]}" {types[i]}'
-                            for i in range(len(unique_headers))
-                        )
-                        create = f'CREATE TABLE "{table_name}" ({colspec})'
-                        columns_join = ", ".join(f'"{h}"' for h in unique_headers)
-                        placeholders = ", ".join("?" for _ in unique_headers)
-                        insert = (
-                            f'INSERT INTO "{table_name}" ({columns_join}) '
-                            f'VALUES ({placeholders})'
-                        )
 
-                        cursor.execute(create)
-                        cursor.execute(insert, sample_row)
-                        cursor.executemany(insert, reader)
-                        connection.commit()
+def load_cdv(*, connection=None, file=None, folder="data", force=False,
+             sample=None, chunk_size=None, workers=None):
+    """Load CDV tables (colon-delimited) into SQLite.
 
-                        gw.info(
-                            f"Loaded table '{table_name}' with "
-                            f"{len(unique_headers)} columns"
-                        )
-                    else:
-                        gw.verbose(f"Skipped existing table: {table_name}")
-        cursor.close()
+    Records are streamed (see :func:`load_csv` for the options); when an id
+    repeats, its last record wins.
+    """
+    assert connection
+    if file:
+        sources = [(str(gw.resource(file)), "")]
+    else:
+        sources = _find_sources(gw.resource(folder), _LOADERS["cdv"][1])
+    return _load_sources(connection, "cdv", sources, force=force, sample=sample,
+                         chunk_size=chunk_size, workers=workers)
 
-    load_folder(base_path)
 
+# Catalog of files ingested by autoload(): one row per (source, table) with
+# the fingerprint the source had when it was loaded.
+CATALOG_TABLE = "gw_catalog"
 
-def load_excel(*, connection=None, file=None, folder="data", force=False):
-    """Load Excel workbooks into tables, one table per sheet."""
-    assert connection
-    base_path = gw.resource(folder)
 
-    def load_file(path, prefix=""):
-        import pandas as pd
-        book = pd.read_excel(path, sheet_name=None)
-        base = os.path.splitext(os.path.basename(path))[0].replace("-", "_")
-        prefix_final = f"{prefix}_{base}" if prefix else base
-        for sheet_name, df in book.items():
-            sheet_clean = sheet_name.strip().replace(" ", "_").replace("-", "_")
-            table = f"{prefix_final}_{sheet_clean}" if sheet_clean else prefix_final
-            try:
-                df.to_sql(table, connection._connection,
-                           if_exists="replace" if force else "fail",
-                           index=False)
-                gw.info(f"Loaded sheet '{sheet_name}' as table '{table}'")
-            except ValueError as e:
-                if "exists" in str(e).lower() and not force:
-                    gw.verbose(f"Skipped existing table: {table}")
-                else:
-                    raise
-
-    def load_folder(path, prefix=""):
-        for item in os.listdir(path):
-            full = os.path.join(path, item)
-            if os.path.isdir(full):
-                sub = f"{prefix}_{item}" if prefix else item
-                load_folder(full, sub)
-            elif item.lower().endswith((".xlsx", ".xls")):
-                load_file(full, prefix)
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-    if file:
-        load_file(gw.resource(file))
-    else:
-        load_folder(base_path)
 
+def autoload(*, connection=None, folder="data", force=False, sample=None, chunk_size=None):
+    """Bring tables loaded from ``folder`` up to date with their source files.
 
-def load_cdv(*, connection=None, file=None, folder="data", force=False):
-    """Load CDV tables (colon-delimited) into SQLite."""
+    Each CSV, Excel and CDV file is fingerprinted in the ``gw_catalog``
+    table (path, size, mtime, content hash and target table). Unchanged
+    files cost a ``stat``; files whose size or mtime moved are hashed and
+    re-ingested only when their content changed, and tables whose source
+    disappeared are dropped. Everything runs in one transaction.
+    ``force`` re-ingests every file. Returns a summary dict.
+    """
     assert connection
     base_path = gw.resource(folder)
+    opts = {
+        "force": True,
+        "sample": sample or INGEST_SAMPLE_ROWS,
+        "chunk_size": chunk_size or INGEST_CHUNK_SIZE,
+        "commit": False,
+    }
+    summary = {"loaded": [], "unchanged": 0, "removed": []}
+    cursor = connection.cursor()
+    try:
+        if not connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS "{CATALOG_TABLE}" ('
+            "path TEXT, kind TEXT, size INTEGER, mtime INTEGER, hash TEXT, "
+            "target TEXT, PRIMARY KEY (path, target))"
+        )
+        catalog = {}
+        for path, kind, size, mtime, digest, target in cursor.execute(
+            f'SELECT path, kind, size, mtime, hash, target FROM "{CATALOG_TABLE}"'
+        ).fetchall():
+            entry = catalog.setdefault(path, {"kind": kind, "size": size, "mtime": mtime,
+                                              "hash": digest, "targets": []})
+            if target:
+                entry["targets"].append(target)
+        tables = {row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        ).fetchall()}
+
+        seen = set()
+        for kind, (loader, suffixes) in _LOADERS.items():
+            for full, prefix in _find_sources(base_path, suffixes):
+                rel = os.path.relpath(full, base_path)
+                seen.add(rel)
+                st = os.stat(full)
+                entry = catalog.get(rel)
+                digest = None
+                if entry and not force and all(t in tables for t in entry["targets"]):
+                    if entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns:
+                        summary["unchanged"] += 1
+                        continue
+                    digest = _file_hash(full)
+                    if digest == entry["hash"]:
+                        cursor.execute(
+                            f'UPDATE "{CATALOG_TABLE}" SET size=?, mtime=? WHERE path=?',
+                            (st.st_size, st.st_mtime_ns, rel),
+                        )
+                        summary["unchanged"] += 1
+                        continue
+                digest = digest or _file_hash(full)
+                for target in entry["targets"] if entry else ():
+                    cursor.execute(f'DROP TABLE IF EXISTS "{target}"')
+                cursor.execute(f'DELETE FROM "{CATALOG_TABLE}" WHERE path=?', (rel,))
+                loaded = loader(connection, full, prefix, **opts)
+                rows = [(rel, kind, st.st_size, st.st_mtime_ns, digest, s["table"])
+                        for s in loaded] or [(rel, kind, st.st_size, st.st_mtime_ns, digest, None)]
+                cursor.executemany(
+                    f'INSERT INTO "{CATALOG_TABLE}" VALUES (?, ?, ?, ?, ?, ?)', rows
+                )
+                summary["loaded"].extend(loaded)
+
+        for rel in set(catalog) - seen:
+            for target in catalog[rel]["targets"]:
+                cursor.execute(f'DROP TABLE IF EXISTS "{target}"')
+                summary["removed"].append(target)
+                gw.info(f"Dropped table '{target}' (source {rel} removed)")
+            cursor.execute(f'DELETE FROM "{CATALOG_TABLE}" WHERE path=?', (rel,))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    gw.verbose(
+        f"Autoload: {len(summary['loaded'])} tables loaded, "
+        f"{summary['unchanged']} files unchanged, {len(summary['removed'])} tables removed"
+    )
+    return summary
 
-    def load_file(path, prefix=""):
-        import pandas as pd
-        records = gw.cdv.load_all(path)
-        if not records:
-            gw.debug(f"No records in CDV: {path}")
-            return
-        df = pd.DataFrame.from_dict(records, orient="index")
-        df.index.name = "id"
-        df.reset_index(inplace=True)
-        base = os.path.splitext(os.path.basename(path))[0].replace("-", "_")
-        table = f"{prefix}_{base}" if prefix else base
-        try:
-            df.to_sql(table, connection._connection,
-                      if_exists="replace" if force else "fail",
-                      index=False)
-            gw.info(f"Loaded CDV '{os.path.basename(path)}' as table '{table}'")
-        except ValueError as e:
-            if "exists" in str(e).lower() and not force:
-                gw.verbose(f"Skipped existing table: {table}")
+
+# --- Connection Management (Drop-in Replacement) ---
+
+_connection_cache = {}
+_db_configs = {}
+_pools = {}
+_writers = {}
+_registry_lock = threading.Lock()
+
+
+def _sqlite_pragmas(dbopts):
+    """Return the PRAGMA statements for ``dbopts`` merged over the defaults."""
+    statements = []
+    for name, default in SQLITE_PRAGMAS.items():
+        value = dbopts.get(name, default)
+        if value is None:
+            continue
+        if name == "journal_mode":
+            value = str(value).lower()
+            if value not in _JOURNAL_MODES:
+                raise ValueError(f"Unsupported journal_mode: {value}")
+        elif name == "synchronous":
+            value = str(value).lower()
+            if value not in _SYNC_LEVELS:
+                raise ValueError(f"Unsupported synchronous level: {value}")
+        else:
+            value = int(value)
+        statements.append(f"PRAGMA {name}={value}")
+    return tuple(statements)
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+class _ConnectionPool:
+    """Bounded set of SQLite connections for one (project, engine, datafile).
+
+    Each thread leases a connection on its first :func:`open_db` and keeps it
+    until :func:`close_db` releases it; released connections are reused by the
+    next thread instead of being reopened. Leases held by threads that have
+    exited are reclaimed when the pool runs dry. The size is a soft limit:
+    once no connection frees up within ``timeout`` the caller gets an overflow
+    connection, which is closed rather than kept when it is released.
+    """
+
+    def __init__(self, key, path, *, size=POOL_SIZE, timeout=POOL_TIMEOUT, pragmas=()):
+        self.key = key
+        self.path = path
+        self.size = max(1, int(size))
+        self.timeout = float(timeout)
+        self.pragmas = pragmas
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.overflows = 0
+        self._cond = threading.Condition()
+        self._idle = []
+        self._leases = {}  # thread ident -> (connection, thread)
+        self._open = 0
+        self._opening = 0
+
+    def configure(self, *, size=None, timeout=None, pragmas=None):
+        with self._cond:
+            if size is not None:
+                self.size = max(1, int(size))
+            if timeout is not None:
+                self.timeout = float(timeout)
+            if pragmas is not None and pragmas != self.pragmas:
+                self.pragmas = pragmas
+                self.generation += 1
+            self._cond.notify_all()
+
+    def acquire(self):
+        ident = threading.get_ident()
+        with self._cond:
+            lease = self._leases.get(ident)
+            if lease:
+                self.hits += 1
+                conn = lease[0]
             else:
-                raise
+                conn = self._checkout(ident)
+        if conn is None:
+            conn = self._connect(ident)
+        if conn._pragma_gen != self.generation:
+            self._apply_pragmas(conn)
+        return conn
+
+    def _checkout(self, ident):
+        """Take an idle connection or reserve a slot (returns ``None``)."""
+        self._drop_stale()
+        deadline = None
+        while True:
+            if self._idle:
+                conn = self._idle.pop()
+                self.hits += 1
+                self._leases[ident] = (conn, threading.current_thread())
+                return conn
+            if self._open + self._opening < self.size:
+                self.misses += 1
+                self._opening += 1
+                return None
+            if self._reclaim_dead():
+                continue
+            if deadline is None:
+                deadline = time.monotonic() + self.timeout
+                if self.timeout > 0:
+                    self.waits += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.overflows += 1
+                self.misses += 1
+                self._opening += 1
+                gw.debug(
+                    f"SQLite pool for {self.path} is full ({self.size} leased); "
+                    "opening an overflow connection"
+                )
+                return None
+            self._cond.wait(remaining)
 
-    def load_folder(path, prefix=""):
-        for item in os.listdir(path):
-            full = os.path.join(path, item)
-            if os.path.isdir(full):
-                sub = f"{prefix}_{item}" if prefix else item
-                load_folder(full, sub)
-            elif item.lower().endswith(".cdv"):
-                load_file(full, prefix)
+    def _connect(self, ident):
+        try:
+            # check_same_thread=False: leases move between threads and the
+            # writer thread commits on the caller's connection.
+            raw = sqlite3.connect(self.path, check_same_thread=False)
+        except BaseException:
+            with self._cond:
+                self._opening -= 1
+                self._cond.notify()
+            raise
+        conn = WrappedConnection(raw)
+        conn._engine = "sqlite"
+        conn._pool = self
+        conn._writer_key = self.path
+        conn._pragma_gen = None
+        conn._stamp = _file_stamp(self.path)
+        with self._cond:
+            self._opening -= 1
+            self._open += 1
+            self._leases[ident] = (conn, threading.current_thread())
+        gw.info(f"Opened SQLite connection at {self.path}")
+        return conn
 
-    if file:
-        load_file(gw.resource(file))
-    else:
-        load_folder(base_path)
+    def _apply_pragmas(self, conn):
+        for statement in self.pragmas:
+            try:
+                conn._connection.execute(statement)
+            except sqlite3.DatabaseError as e:
+                gw.debug(f"Unable to apply {statement} to {self.path}: {e}")
+        conn._pragma_gen = self.generation
+
+    def _drop_stale(self):
+        """Close idle connections whose database file was removed or replaced."""
+        if not self._idle:
+            return
+        stamp = _file_stamp(self.path)
+        stale = [c for c in self._idle if c._stamp != stamp]
+        for conn in stale:
+            self._idle.remove(conn)
+            self._close(conn)
+
+    def _reclaim_dead(self):
+        dead = [i for i, (_, thread) in self._leases.items() if not thread.is_alive()]
+        for ident in dead:
+            self._put_back(self._leases.pop(ident)[0])
+        return bool(dead)
+
+    def _put_back(self, conn):
+        """Pool a returned connection, or close it if the pool is over size."""
+        if self._open > self.size:
+            self._close(conn)
+        else:
+            self._idle.append(conn._detach())
 
+    def _close(self, conn):
+        self._open -= 1
+        raw, conn._raw = conn._raw, None
+        try:
+            if raw is not None:
+                raw.close()
+        except Exception as e:
+            gw.warning(f"Failed to close connection: {e}")
 
-# --- Connection Management (Drop-in Replacement) ---
+    def release(self, conn=None):
+        """Return the calling thread's connection (or ``conn``) to the pool."""
+        with self._cond:
+            if conn is None:
+                lease = self._leases.pop(threading.get_ident(), None)
+            else:
+                ident = next((i for i, (c, _) in self._leases.items() if c is conn), None)
+                lease = self._leases.pop(ident) if ident is not None else None
+            if not lease:
+                return False
+            self._put_back(lease[0])
+            self._cond.notify()
+            return True
+
+    def close_all(self):
+        with self._cond:
+            conns = self._idle + [c for c, _ in self._leases.values()]
+            self._idle.clear()
+            self._leases.clear()
+            for conn in conns:
+                self._close(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "leased": len(self._leases),
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "overflows": self.overflows,
+            }
+
+
+def _row_factory(row_factory):
+    if row_factory is True:
+        return sqlite3.Row
+    if callable(row_factory):
+        return row_factory
+    if isinstance(row_factory, str):
+        return gw[row_factory]
+    return None
 
-_connection_cache = {}
-_db_configs = {}
 
 def open_db(
         datafile=None, *,
@@ -257,6 +856,12 @@ def open_db(
     ``project`` allows configuring multiple databases which can later be
     referenced by name.  Subsequent calls for the same ``project`` reuse the
     stored configuration and cached connection.
+
+    SQLite connections come from a bounded per-database pool (see
+    :func:`pool_stats`). For SQLite, ``dbopts`` may set the ``journal_mode``,
+    ``synchronous``, ``mmap_size`` and ``cache_size`` PRAGMAs as well as
+    ``pool_size`` and ``pool_timeout``; for Postgres they are passed to
+    ``psycopg2.connect``.
     """
     project = project or "default"
     cfg = _db_configs.setdefault(project, {})
@@ -274,47 +879,36 @@ def open_db(
     row_factory = row_factory or cfg.get("row_factory", False)
     dbopts = {**cfg.get("dbopts", {}), **dbopts}
 
-    if sql_engine != "duckdb":
-        _start_writer_thread()
     base_key = (project, sql_engine, datafile or "default")
-    thread_key = threading.get_ident() if sql_engine in ("sqlite", "duckdb") else "*"
+
+    if sql_engine == "sqlite":
+        pool = _get_pool(base_key, datafile, dbopts)
+        try:
+            conn = pool.acquire()
+        except sqlite3.OperationalError as e:
+            gw.abort(
+                f"Unable to open SQLite database at {pool.path}. "
+                f"Check the path and file permissions. ({e})"
+            )
+        conn._connection.row_factory = _row_factory(row_factory)
+        if autoload and (force or not getattr(conn, "_autoloaded", False)):
+            gw.sql.autoload(connection=conn, force=force)
+            conn._autoloaded = True
+        return conn
+
+    thread_key = threading.get_ident() if sql_engine == "duckdb" else "*"
     key = (base_key, thread_key)
 
     # Reuse cached connection if available
     if key in _connection_cache:
         conn = _connection_cache[key]
-        if autoload and conn._engine == "sqlite" and (force or not getattr(conn, "_autoloaded", False)):
-            load_csv(connection=conn, force=force)
-            load_excel(connection=conn, force=force)
-            load_cdv(connection=conn, force=force)
-            conn._autoloaded = True
         if row_factory:
             gw.warning("Row factory change requires close_db(). Reconnect manually.")
         gw.verbose(f"Reusing connection: {key}")
         return conn
 
     # Create connection per backend
-    if sql_engine == "sqlite":
-        path = gw.resource(datafile or "work/data.sqlite")
-        # Note: check_same_thread=False for sharing connections in the writer thread
-        try:
-            conn = sqlite3.connect(str(path), check_same_thread=False)
-        except sqlite3.OperationalError as e:
-            gw.abort(
-                f"Unable to open SQLite database at {str(path)}. "
-                f"Check the path and file permissions. ({e})"
-            )
-        if row_factory:
-            if row_factory is True:
-                conn.row_factory = sqlite3.Row
-            elif callable(row_factory):
-                conn.row_factory = row_factory
-            elif isinstance(row_factory, str):
-                conn.row_factory = gw[row_factory]
-            gw.debug(f"Configured row_factory: {conn.row_factory}")
-        gw.info(f"Opened SQLite connection at {path}")
-        _start_writer_thread()  # Ensure writer is running
-    elif sql_engine == "duckdb":
+    if sql_engine == "duckdb":
         import duckdb
         path = gw.resource(datafile or "work/data.duckdb")
         conn = duckdb.connect(path)
@@ -329,31 +923,81 @@ def open_db(
     # Wrap and cache connection
     conn = WrappedConnection(conn)
     conn._engine = sql_engine
+    conn._writer_key = base_key
     _connection_cache[key] = conn
+    return conn
 
-    if autoload and sql_engine == "sqlite":
-        load_csv(connection=conn, force=force)
-        load_excel(connection=conn, force=force)
-        load_cdv(connection=conn, force=force)
-        conn._autoloaded = True
 
-    return conn
+def _get_pool(base_key, datafile, dbopts):
+    pragmas = _sqlite_pragmas(dbopts)
+    size = dbopts.get("pool_size")
+    timeout = dbopts.get("pool_timeout")
+    with _registry_lock:
+        pool = _pools.get(base_key)
+        if pool is None:
+            path = str(gw.resource(datafile or "work/data.sqlite"))
+            pool = _ConnectionPool(
+                base_key, path,
+                size=POOL_SIZE if size is None else size,
+                timeout=POOL_TIMEOUT if timeout is None else timeout,
+                pragmas=pragmas,
+            )
+            _pools[base_key] = pool
+            return pool
+    if pragmas != pool.pragmas or size is not None or timeout is not None:
+        pool.configure(size=size, timeout=timeout, pragmas=pragmas)
+    return pool
+
+
+def pool_stats() -> list:
+    """Return usage counters for every SQLite connection pool.
+
+    Each entry reports the pool ``size``, currently ``open``, ``idle`` and
+    ``leased`` connections, lease ``hits`` (reused without connecting),
+    ``misses`` (new connections), ``waits`` (callers that had to wait for a
+    free connection), ``overflows`` (connections opened past ``size``) and
+    the number of ``pending_writes`` queued for the
+    database file.
+    """
+    with _registry_lock:
+        pools = list(_pools.values())
+        writers = dict(_writers)
+    stats = []
+    for pool in pools:
+        project, engine, datafile = pool.key
+        writer = writers.get(pool.path)
+        stats.append({
+            "project": project,
+            "engine": engine,
+            "datafile": datafile,
+            "path": pool.path,
+            **pool.stats(),
+            "pending_writes": writer.queue.qsize() if writer else 0,
+        })
+    return stats
 
 
 def close_db(datafile=None, *, project=None, sql_engine=None, all=False):
     """
-    Explicitly close one or all cached database connections.
-    Shuts down writer thread if all connections closed.
+    Release or close cached database connections.
+
+    SQLite connections are handed back to their pool for reuse and the handle
+    returned by :func:`open_db` stops working; ``all=True`` stops the writer threads and closes every connection.
     """
     project = project or "default"
     if all:
+        shutdown_writer()
+        with _registry_lock:
+            pools = list(_pools.values())
+            _pools.clear()
+        for pool in pools:
+            pool.close_all()
         for key, connection in list(_connection_cache.items()):
             try:
                 connection.close()
             except Exception as e:
                 gw.warning(f"Failed to close connection: {e}")
             _connection_cache.pop(key, None)
-        shutdown_writer()
         gw.info("All connections closed.")
         return
 
@@ -364,7 +1008,13 @@ def close_db(datafile=None, *, project=None, sql_engine=None, all=False):
         sql_engine = cfg.get("sql_engine", "sqlite")
 
     base_key = (project, sql_engine, datafile or "default")
-    thread_key = threading.get_ident() if sql_engine in ("sqlite", "duckdb") else "*"
+    if sql_engine == "sqlite":
+        pool = _pools.get(base_key)
+        if pool and pool.release():
+            gw.verbose(f"Released connection: {base_key}")
+        return
+
+    thread_key = threading.get_ident() if sql_engine == "duckdb" else "*"
     key = (base_key, thread_key)
     connection = _connection_cache.pop(key, None)
     if connection:
@@ -389,20 +1039,25 @@ def _run(cursor, sql, *, args=None, is_script=False):
         raise type(e)(f"{e}. SQL: {sql}") from e
 
 
-def execute(*sql, connection=None, script=None, sep='; ', args=None):
+def execute(*sql, connection=None, script=None, sep='; ', args=None, wait=True):
     """
     Thread-safe SQL execution.
     - SELECTs and other read queries run immediately (parallel safe).
-    - DML/DDL statements (INSERT/UPDATE/DELETE/etc) are funneled into the write queue.
+    - DML/DDL statements (INSERT/UPDATE/DELETE/etc) are funneled into the write queue
+      of their database file, whose writer thread group-commits them
+      (see :func:`configure_writer`). Writes to different files never wait
+      on each other.
     - Multi-statement scripts are supported via executescript.
-    - All write queue items are always 5-tuple: (sql, args, conn, result_q, is_script)
+    - With ``wait=False`` a :class:`concurrent.futures.Future` is returned instead
+      of the rows; writes are then fire-and-forget until ``.result()`` is called.
+    - All write queue items are always 5-tuple: (sql, args, conn, future, is_script)
     """
     assert connection, "Pass connection= from gw.sql.open_db()"
 
     if script:
         script_text = gw.resource(script, text=True)
         # Recursively call as a multi-statement script
-        return execute(script_text, connection=connection)
+        return execute(script_text, connection=connection, wait=wait)
 
     if sql:
         sql = sep.join(sql)
@@ -416,14 +1071,17 @@ def execute(*sql, connection=None, script=None, sep='; ', args=None):
 
     # If it is a read-only statement and not a script, execute directly
     if not _is_write_query(sql) and not is_script:
-        cursor = connection.cursor()
-        try:
-            return _run(cursor, sql, args=args)
-        finally:
-            cursor.close()
-    else:
-        # DuckDB connections are not thread-safe, execute writes synchronously
-        if getattr(connection, "_engine", "sqlite") == "duckdb":
+        def read():
+            cursor = connection.cursor()
+            try:
+                return _run(cursor, sql, args=args)
+            finally:
+                cursor.close()
+        return read() if wait else _completed_future(read)
+
+    # DuckDB connections are not thread-safe, execute writes synchronously
+    if getattr(connection, "_engine", "sqlite") == "duckdb":
+        def write():
             cursor = connection.cursor()
             try:
                 rows = _run(cursor, sql, args=args, is_script=is_script)
@@ -434,38 +1092,224 @@ def execute(*sql, connection=None, script=None, sep='; ', args=None):
                 raise
             finally:
                 cursor.close()
-        else:
-            # All writes or scripts are serialized via the queue.
-            result_q = queue.Queue()
-            # Always enqueue a 5-item tuple: (sql, args, conn, result_q, is_script)
-            _write_queue.put((sql, args, connection._connection, result_q, is_script))
-            rows, error = result_q.get()
-            if error:
-                raise error
-            return rows
-
-
-def _process_writes():
-    while not _writer_shutdown.is_set():
+        return write() if wait else _completed_future(write)
+
+    # All writes or scripts are serialized via the database's writer queue.
+    future = Future()
+    # Always enqueue a 5-item tuple: (sql, args, conn, future, is_script)
+    _writer_for(connection).submit((sql, args, connection._connection, future, is_script))
+    if not wait:
+        return future
+    return future.result()
+
+
+def configure_writer(*, batch_size: int = None, latency: float = None) -> dict:
+    """Tune group commit for queued writes.
+
+    ``batch_size`` caps how many queued statements share one transaction and
+    ``latency`` (seconds) is how long the writer waits for more statements
+    after the first one arrives. Returns the active settings.
+    """
+    global WRITE_BATCH_SIZE, WRITE_BATCH_LATENCY
+    if batch_size is not None:
+        WRITE_BATCH_SIZE = max(1, int(batch_size))
+    if latency is not None:
+        WRITE_BATCH_LATENCY = max(0.0, float(latency))
+    return {"batch_size": WRITE_BATCH_SIZE, "latency": WRITE_BATCH_LATENCY}
+
+
+def _completed_future(fn):
+    future = Future()
+    try:
+        future.set_result(fn())
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _can_coalesce(sql, args):
+    """Return ``True`` when repeated *sql* can be batched with ``executemany``."""
+    if not args:
+        return False
+    head = sql.lstrip()[:7].lower()
+    return head.startswith(("insert", "replace", "update", "delete")) and "returning" not in sql.lower()
+
+
+def _run_group(conn, items):
+    """Run *items* inside a single transaction and return one result per item.
+
+    Consecutive statements sharing the same SQL text are sent through
+    ``executemany``. Any failure rolls back the whole group and re-raises.
+    """
+    results = []
+    cursor = conn.cursor()
+    try:
+        i = 0
+        while i < len(items):
+            sql, args = items[i][0], items[i][1]
+            j = i + 1
+            if _can_coalesce(sql, args):
+                while j < len(items) and items[j][0] == sql and items[j][1]:
+                    j += 1
+            if j - i > 1:
+                try:
+                    cursor.executemany(sql, [item[1] for item in items[i:j]])
+                except Exception as e:
+                    raise type(e)(f"{e}. SQL: {sql}") from e
+                results.extend([None] * (j - i))
+            else:
+                results.append(_run(cursor, sql, args=args))
+            i = j
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return results
+
+
+def _run_single(conn, sql, args, is_script):
+    cursor = conn.cursor()
+    try:
+        rows = _run(cursor, sql, args=args, is_script=is_script)
+        conn.commit()
+        return rows, None
+    except Exception as e:
+        conn.rollback()
+        return None, e
+    finally:
+        cursor.close()
+
+
+def _commit_batch(batch):
+    """Execute a drained batch and resolve each waiter's future."""
+    by_conn = {}
+    for item in batch:
+        by_conn.setdefault(id(item[2]), []).append(item)
+
+    for items in by_conn.values():
+        conn = items[0][2]
+        pending = []
+
+        def flush():
+            if not pending:
+                return
+            try:
+                results = _run_group(conn, pending)
+            except Exception:
+                # Replay one statement per transaction so every waiter gets
+                # its own result or error, exactly as without batching.
+                results = None
+            if results is None:
+                for sql, args, _, future, is_script in pending:
+                    rows, error = _run_single(conn, sql, args, is_script)
+                    _resolve(future, rows, error)
+            else:
+                for item, rows in zip(pending, results):
+                    _resolve(item[3], rows, None)
+            pending.clear()
+
+        for item in items:
+            if item[4]:
+                # executescript() commits on its own; keep it out of groups.
+                flush()
+                sql, args, _, future, is_script = item
+                rows, error = _run_single(conn, sql, args, is_script)
+                _resolve(future, rows, error)
+            else:
+                pending.append(item)
+        flush()
+
+
+def _resolve(future, rows, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(rows)
+
+
+class _Writer:
+    """Serializes the queued writes of one database on its own thread."""
+
+    def __init__(self, key):
+        self.key = key
+        self.queue = queue.Queue()
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, item):
+        if self.thread is None or not self.thread.is_alive():
+            with self._lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(
+                        target=self._process, name=f"gw.sql writer {self.key}", daemon=True
+                    )
+                    self.thread.start()
+        self.queue.put(item)
+
+    def _process(self):
+        while True:
+            item = self.queue.get()
+            batch = []
+            taken = 1
+            stop = item is None
+            if not stop:
+                batch.append(item)
+                deadline = time.monotonic() + WRITE_BATCH_LATENCY
+                while len(batch) < WRITE_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        if remaining > 0:
+                            item = self.queue.get(timeout=remaining)
+                        else:
+                            item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+            try:
+                if batch:
+                    _commit_batch(batch)
+            except Exception as e:  # pragma: no cover - defensive
+                for item in batch:
+                    _resolve(item[3], None, e)
+            finally:
+                for _ in range(taken):
+                    self.queue.task_done()
+            if stop:
+                break
+
+    def shutdown(self, timeout=2):
+        """Let queued writes finish, stop the thread and fail any leftovers."""
+        with self._lock:
+            thread, self.thread = self.thread, None
+        if thread and thread.is_alive():
+            self.queue.put(None)
+            thread.join(timeout=timeout)
         try:
-            item = _write_queue.get(timeout=0.5)
+            while True:
+                item = self.queue.get_nowait()
+                if item is not None:
+                    _resolve(item[3], None, RuntimeError("SQL writer shut down"))
+                self.queue.task_done()
         except queue.Empty:
-            continue
-        if item is None:
-            _write_queue.task_done()
-            break
-        sql, args, conn, result_q, is_script = item  # Always expect 5!
-        try:
-            cursor = conn.cursor()
-            rows = _run(cursor, sql, args=args, is_script=is_script)
-            conn.commit()
-            result_q.put((rows, None))
-        except Exception as e:
-            conn.rollback()
-            result_q.put((None, e))
-        finally:
-            cursor.close()
-            _write_queue.task_done()
+            pass
+
+
+def _writer_for(connection):
+    """Return the writer owning the database behind ``connection``."""
+    key = getattr(connection, "_writer_key", None)
+    writer = _writers.get(key)
+    if writer is None:
+        with _registry_lock:
+            writer = _writers.setdefault(key, _Writer(key))
+    return writer
 
 
 def _is_write_query(sql):
@@ -475,31 +1319,13 @@ def _is_write_query(sql):
         for word in ("insert", "update", "delete", "create", "drop", "alter", "replace", "truncate", "vacuum", "attach", "detach"))
 
 
-def _start_writer_thread():
-    global _writer_thread
-    if _writer_thread is None or not _writer_thread.is_alive():
-        _writer_thread = threading.Thread(target=_process_writes, daemon=True)
-        _writer_thread.start()
-
-
 def shutdown_writer():
-    """Signal writer thread to exit and wait for it to finish."""
-    global _writer_thread
-    _writer_shutdown.set()
-    # Put enough poison pills for any possible writer threads (usually 1)
-    _write_queue.put(None)
-    if _writer_thread:
-        _writer_thread.join(timeout=2)
-        _writer_thread = None  # Allow restart
-    # Clean up: clear shutdown flag for future tests
-    _writer_shutdown.clear()
-    # Drain any leftover queue items (to avoid memory leaks between tests)
-    try:
-        while True:
-            _write_queue.get_nowait()
-            _write_queue.task_done()
-    except queue.Empty:
-        pass
+    """Stop every per-database writer thread after its queue drains."""
+    with _registry_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.shutdown()
 
 
 def parse_log(
@@ -512,12 +1338,14 @@ def parse_log(
     poll_interval=0.5,
     stop_event=None,
     flags=0,
+    log_format="text",
 ):
     """Consume a log file in real time and store matching records.
 
     Parameters:
         mask (str): Regular expression with named groups representing columns.
             Defaults to ``DEFAULT_LOG_MASK`` which parses standard GWay logs.
+            Ignored for JSON logs.
         log_location (str): Path to the log file to monitor.
         table (str): Table to insert parsed records into.
         connection: Database connection from :func:`open_db`.
@@ -525,14 +1353,33 @@ def parse_log(
         poll_interval (float): Seconds to wait for new lines.
         stop_event (threading.Event): Optional event to stop the tail loop.
         flags (int): Regex flags for ``re.compile``.
+        log_format (str): ``"text"`` to match lines against ``mask`` or
+            ``"json"`` for logs written with ``gway --log-format json``; the
+            columns are then ``gway.logging.JSON_LOG_FIELDS``.
     """
 
     assert connection, "Pass connection= from gw.sql.open_db()"
 
-    regex = re.compile(mask, flags)
-    columns = list(regex.groupindex.keys())
-    if not columns:
-        raise ValueError("Mask must use named capturing groups for columns")
+    if log_format == "json":
+        columns = list(JSON_LOG_FIELDS)
+
+        def match(line):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                return None
+            if not isinstance(entry, dict):
+                return None
+            return {c: None if entry.get(c) is None else str(entry[c]) for c in columns}
+    else:
+        regex = re.compile(mask, flags)
+        columns = list(regex.groupindex.keys())
+        if not columns:
+            raise ValueError("Mask must use named capturing groups for columns")
+
+        def match(line):
+            m = regex.search(line)
+            return m.groupdict() if m else None
 
     colspec = ", ".join(f'"{c}" TEXT' for c in columns)
     gw.sql.execute(
@@ -541,29 +1388,83 @@ def parse_log(
     )
 
     stop_event = stop_event or threading.Event()
+    columns_sql = ", ".join(f'"{c}"' for c in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    insert_sql = f'INSERT INTO "{table}" ({columns_sql}) VALUES ({placeholders})'
+
+    # Inserts are fire-and-forget so bursts of lines share one commit; the
+    # futures are settled whenever the tail goes idle to surface errors.
+    pending = []
+
+    def settle():
+        for future in pending:
+            future.result()
+        pending.clear()
 
     with open(log_location, "r", encoding="utf-8") as f:
         if start_at_end:
             f.seek(0, os.SEEK_END)
-        while not stop_event.is_set():
-            line = f.readline()
-            if not line:
-                time.sleep(poll_interval)
-                continue
-            m = regex.search(line)
-            if not m:
-                continue
-            values = m.groupdict()
-            columns_sql = ", ".join(f'"{c}"' for c in columns)
-            placeholders = ", ".join("?" for _ in columns)
-            gw.sql.execute(
-                f'INSERT INTO "{table}" ({columns_sql}) VALUES ({placeholders})',
-                args=tuple(values[c] for c in columns),
-                connection=connection,
-            )
+        try:
+            while not stop_event.is_set():
+                line = f.readline()
+                if not line:
+                    settle()
+                    time.sleep(poll_interval)
+                    continue
+                values = match(line)
+                if values is None:
+                    continue
+                pending.append(gw.sql.execute(
+                    insert_sql,
+                    args=tuple(values[c] for c in columns),
+                    connection=connection,
+                    wait=False,
+                ))
+                if len(pending) >= WRITE_BATCH_SIZE:
+                    settle()
+        finally:
+            settle()
 
     return stop_event
 
+
+def benchmark_execute(rows: int = 100_000, *, datafile="work/bench_writes.sqlite",
+                      batch_size: int = None, latency: float = None) -> dict:
+    """Insert ``rows`` rows through :func:`execute` and report throughput.
+
+    Rows are submitted with ``wait=False`` so the writer can group-commit them;
+    the timing includes waiting for every future to settle.
+    """
+    path = gw.resource(datafile)
+    if os.path.exists(path):
+        os.remove(path)
+    previous = configure_writer()
+    settings = configure_writer(batch_size=batch_size, latency=latency)
+    conn = open_db(datafile, project="benchmark")
+    try:
+        execute("CREATE TABLE bench (id INTEGER PRIMARY KEY, value TEXT)", connection=conn)
+        start = time.perf_counter()
+        futures = [
+            execute("INSERT INTO bench (value) VALUES (?)", args=(f"row {i}",),
+                    connection=conn, wait=False)
+            for i in range(rows)
+        ]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        count = execute("SELECT count(*) FROM bench", connection=conn)[0][0]
+    finally:
+        close_db(datafile, project="benchmark")
+        configure_writer(**previous)
+    result = {
+        "rows": count,
+        "seconds": elapsed,
+        "rows_per_sec": count / elapsed if elapsed else float("inf"),
+        **settings,
+    }
+    gw.info(f"Inserted {count} rows in {elapsed:.3f}s ({result['rows_per_sec']:.0f} rows/s)")
+    return result
+
 # --- Migration Helpers ---
 _STAGED_SQL = {}
 
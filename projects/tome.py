@@ -12,10 +12,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from queue import Empty, Queue
-from threading import Event, Thread
 from typing import Any, Iterable
 
 from gway import gw
+from gway.watchers import watch_paths
 
 
 _STANDARD_TOME_NAME = "standard"
@@ -872,34 +872,32 @@ def open_viewer(
     watch_interval = max(0.1, float(refresh_interval))
 
     updates: Queue[tuple[dict[str, Any], float]] = Queue()
-    stop_event = Event()
 
     def _enqueue_update(updated_data: dict[str, Any], mtime: float | None) -> None:
         if mtime is None:
             return
         updates.put((updated_data, mtime))
 
-    def _watch_file() -> None:
-        local_last = last_mtime
-        while not stop_event.is_set():
-            if path.exists():
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    mtime = None
-                if mtime and (local_last is None or mtime > local_last):
-                    try:
-                        loaded = json.loads(path.read_text(encoding="utf-8"))
-                    except (OSError, json.JSONDecodeError):
-                        pass
-                    else:
-                        ensured = _ensure_schema(loaded)
-                        _enqueue_update(ensured, mtime)
-                        local_last = mtime
-            stop_event.wait(watch_interval)
+    watched_mtime = last_mtime
+
+    def _reload(_changed: set[str]) -> bool:
+        nonlocal watched_mtime
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return False
+        if watched_mtime is not None and mtime <= watched_mtime:
+            return False
+        try:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return False
+        _enqueue_update(_ensure_schema(loaded), mtime)
+        watched_mtime = mtime
+        return False
 
-    watcher = Thread(target=_watch_file, daemon=True)
-    watcher.start()
+    # inotify where available; polls every watch_interval otherwise.
+    watcher = watch_paths([str(path)], _reload, interval=watch_interval, created=True)
 
     table_color = (16, 99, 45)
     card_color = (245, 245, 245)
@@ -1866,9 +1864,8 @@ def open_viewer(
             clock.tick(30)
 
     finally:
-        stop_event.set()
-        if watcher.is_alive():
-            watcher.join(timeout=1.0)
+        watcher.set()
+        watcher.thread.join(timeout=1.0)
         pygame.quit()
 
     return {
@@ -0,0 +1,102 @@
+# tests/test_call_plan.py
+
+import inspect
+import timeit
+import unittest
+from unittest.mock import patch
+
+from gway import gw
+from gway.builtins import is_test_flag
+from gway.gateway import _CallPlan
+from gway.sigils import Sigil
+
+
+def _sample(a, b: int = 2, *, c: str = "x", d=None):
+    return a, b, c, d
+
+
+class CallPlanTests(unittest.TestCase):
+    def setUp(self):
+        gw.context.clear()
+        gw.results.clear()
+
+    def tearDown(self):
+        gw.context.clear()
+        gw.results.clear()
+
+    def test_signature_is_not_inspected_per_call(self):
+        wrapped = gw.wrap_callable("sample", _sample)
+        with patch("gway.gateway.inspect.signature", side_effect=AssertionError("called")):
+            self.assertEqual(wrapped(1), (1, 2, "x", None))
+            self.assertEqual(wrapped(1, "5", c=3), (1, 5, "3", None))
+            self.assertEqual(wrapped(a=4, d="z"), (4, 2, "x", "z"))
+
+    def test_plan_is_compiled_once_per_wrap(self):
+        with patch("gway.gateway._CallPlan", wraps=_CallPlan) as compile_plan:
+            wrapped = gw.wrap_callable("sample", _sample)
+            for _ in range(3):
+                wrapped(1)
+        self.assertEqual(compile_plan.call_count, 1)
+
+    def test_binding_errors_match_signature(self):
+        wrapped = gw.wrap_callable("sample", _sample)
+        with self.assertRaises(TypeError):
+            wrapped(1, a=2)
+        with self.assertRaises(TypeError):
+            wrapped(1, 2, 3)
+        with self.assertRaises(TypeError):
+            wrapped(1, unknown=True)
+
+    def test_var_arguments_take_slow_path(self):
+        def func(first, *rest, flag=False, **extra):
+            return first, rest, flag, extra
+
+        wrapped = gw.wrap_callable("varfunc", func)
+        self.assertEqual(wrapped(1), (1, (), False, {}))
+        self.assertEqual(wrapped(1, 2, 3, flag=True, z=9), (1, (2, 3), True, {"z": 9}))
+
+    def test_eager_sigil_default_is_resolved(self):
+        def func(value=Sigil("%[plan_missing|Guest]")):
+            return value
+
+        wrapped = gw.wrap_callable("plan_func", func)
+        self.assertEqual(wrapped(), "Guest")
+        self.assertEqual(wrapped("explicit"), "explicit")
+
+    def test_plan_exposes_subject(self):
+        wrapped = gw.wrap_callable("fetch_thing", _sample)
+        self.assertEqual(wrapped._call_plan.subject, "thing")
+
+
+@unittest.skipUnless(is_test_flag("benchmark"), "Benchmark tests disabled")
+class CallPlanBenchmark(unittest.TestCase):
+    """Micro-benchmark: the whole wrapper now costs less per call than the
+    signature introspection the previous implementation repeated on every call.
+
+    Timing based, so it only runs with ``GW_TEST_FLAGS=benchmark``.
+    """
+
+    ROUNDS = 5
+    NUMBER = 2000
+
+    def _best(self, stmt):
+        return min(timeit.repeat(stmt, number=self.NUMBER, repeat=self.ROUNDS)) / self.NUMBER
+
+    def test_per_call_overhead_drops(self):
+        def target(a, b=1, *, c="x"):
+            return a
+
+        wrapped = gw.wrap_callable("bench", target)
+
+        def introspect():
+            bound = inspect.signature(target).bind_partial(1, c="y")
+            bound.apply_defaults()
+
+        raw = self._best(lambda: target(1, c="y"))
+        wrapped_cost = self._best(lambda: wrapped(1, c="y")) - raw
+        introspection_cost = self._best(introspect)
+        self.assertLess(wrapped_cost, introspection_cost)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# tests/test_cdv.py
+
+import os
+import sys
+import tempfile
+import time
+import threading
+import unittest
+
+from gway import gw
+
+
+class CdvEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cards.cdv")
+        with open(self.path, "w") as f:
+            f.write("AA:user=ann:balance=10\nBB:user=bob:balance=5\n")
+        self.module = sys.modules[gw.cdv.load_all.__module__]
+
+    def tearDown(self):
+        self.module._indexes.pop(self.path, None)
+        self.tmp.cleanup()
+
+    def _lines(self):
+        with open(self.path) as f:
+            return f.read().splitlines()
+
+    def test_updates_append_and_last_record_wins(self):
+        self.assertTrue(gw.cdv.credit(self.path, "AA", amount=5))
+        gw.cdv.update(self.path, "CC", user="cat")
+        self.assertEqual(self._lines()[2:], ["AA:user=ann:balance=15.0", "CC:user=cat"])
+        self.assertEqual(gw.cdv.load_all(self.path)["AA"]["balance"], "15.0")
+        # A plain re-read of the file agrees with the index
+        self.module._indexes.pop(self.path)
+        self.assertEqual(gw.cdv.load_all(self.path)["AA"]["balance"], "15.0")
+
+    def test_index_is_reused_until_file_changes(self):
+        gw.cdv.load_all(self.path)
+        index = self.module._indexes[self.path]
+        self.assertTrue(gw.cdv.validate(self.path, "BB"))
+        self.assertIs(self.module._indexes[self.path], index)
+
+        with open(self.path, "a") as f:
+            f.write("DD:user=dan\n")
+        stamp = time.time() + 5
+        os.utime(self.path, (stamp, stamp))
+        self.assertTrue(gw.cdv.validate(self.path, "DD"))
+        self.assertIsNot(self.module._indexes[self.path], index)
+
+    def test_delete_and_move_rewrite_atomically(self):
+        inode = os.stat(self.path).st_ino
+        self.assertTrue(gw.cdv.move(self.path, "AA", "ZZ", note="moved"))
+        self.assertNotEqual(os.stat(self.path).st_ino, inode)
+        self.assertTrue(gw.cdv.delete(self.path, "BB"))
+        self.assertEqual(self._lines(), ["ZZ:user=ann:balance=10:note=moved"])
+        self.assertEqual(
+            [n for n in os.listdir(self.tmp.name) if n.endswith(".tmp")], []
+        )
+
+    def test_compaction_drops_superseded_lines(self):
+        previous = self.module.COMPACT_MIN_LINES
+        self.module.COMPACT_MIN_LINES = 10
+        self.addCleanup(setattr, self.module, "COMPACT_MIN_LINES", previous)
+        for _ in range(8):
+            gw.cdv.debit(self.path, "BB")
+        self.assertEqual(len(self._lines()), 2)
+        self.assertEqual(gw.cdv.load_all(self.path)["BB"]["balance"], "-3.0")
+
+    def test_concurrent_credits_are_not_lost(self):
+        threads = [
+            threading.Thread(target=gw.cdv.credit, args=(self.path, "AA"))
+            for _ in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.module._indexes.pop(self.path)
+        self.assertEqual(gw.cdv.load_all(self.path)["AA"]["balance"], "30.0")
+
+    def test_benchmark_reports_speedup(self):
+        result = gw.cdv.benchmark(
+            2000, 50, path=os.path.join(self.tmp.name, "bench.cdv")
+        )
+        self.assertEqual(result["entries"], 2000)
+        self.assertGreater(result["speedup"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
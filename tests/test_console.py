@@ -664,5 +664,59 @@ class TestRepeatBuiltin(unittest.TestCase):
             console.process([["repeat", "--times", "1", "--rest", "0"]])
 
 
+class TestCompiledRecipes(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cached.gwr")
+        with open(self.path, "w") as f:
+            f.write("# note\nhello-world Ann\n")
+
+    def tearDown(self):
+        console.clear_caches()
+        self.temp_dir.cleanup()
+
+    def test_recipe_is_parsed_once_until_it_changes(self):
+        with patch.object(console, "_parse_recipe", wraps=console._parse_recipe) as parse:
+            first, _ = console.load_recipe(self.path)
+            first[1]["tokens"].append("mutated")
+            second, comments = console.load_recipe(self.path)
+            self.assertEqual(parse.call_count, 1)
+            self.assertEqual(_extract_tokens(second), [["hello-world", "Ann"]])
+            self.assertEqual(comments, ["# note"])
+
+            with open(self.path, "a") as f:
+                f.write("hello-world Bob\n")
+            third, _ = console.load_recipe(self.path)
+            self.assertEqual(parse.call_count, 2)
+            self.assertEqual(len(_extract_tokens(third)), 2)
+
+    def test_func_parser_is_reused_per_function(self):
+        def greet(name: str, *, loud: bool = False):
+            return name
+
+        parser = console.build_func_parser(greet, "greet")
+        self.assertIs(console.build_func_parser(greet, "greet"), parser)
+        self.assertIsNot(
+            console.build_func_parser(greet, "greet", interactive=True), parser
+        )
+        self.assertEqual(parser.parse_args(["Ann", "--loud"]).loud, True)
+
+    def test_sigil_defaults_are_resolved_on_every_call(self):
+        def compiled_greet(name: str = "%[COMPILED_TEST_NAME]"):
+            return name
+
+        setattr(console.gw, "compiled_greet", compiled_greet)
+        self.addCleanup(delattr, console.gw, "compiled_greet")
+        self.addCleanup(console.gw.context.pop, "COMPILED_TEST_NAME", None)
+        for name in ("Ann", "Bob"):
+            console.gw.context["COMPILED_TEST_NAME"] = name
+            self.assertEqual(console.process([["compiled-greet"]])[1], name)
+
+    def test_benchmark_recipe_reports_speedup(self):
+        result = console.gw.benchmark_recipe(self.path, loops=200, cold_loops=20)
+        self.assertEqual(result["loops"], 200)
+        self.assertGreater(result["speedup"], 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+# tests/test_dag.py
+
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from gway import Gateway
+from gway.console import process
+from gway.dag import Node, link, run_graph, sigil_keys
+from gway.manifest import ProjectManifest
+
+
+class LinkTests(unittest.TestCase):
+    def test_sigil_keys_are_normalized_roots(self):
+        self.assertEqual(
+            sigil_keys(["--to=[Mail-Box.0]", "[orders|[fallback]]", "['quoted']"]),
+            {"mail_box", "orders", "fallback"},
+        )
+        self.assertIsNone(sigil_keys(["[[name].id]"]))
+
+    def test_readers_wait_for_writers_only(self):
+        nodes = link([
+            Node(0, "a", writes={"orders"}),
+            Node(1, "b", writes={"mail"}),
+            Node(2, "c", reads={"orders"}),
+            Node(3, "d", reads={"mail"}, writes={"orders"}),
+        ])
+        self.assertEqual([n.deps for n in nodes], [set(), set(), {0}, {1, 2, 0}])
+
+    def test_unknown_keys_and_barriers_wait_for_everything(self):
+        nodes = link([
+            Node(0, "a", writes={"x"}),
+            Node(1, "b", reads={"never_set"}),
+            Node(2, "c", barrier=True),
+            Node(3, "d", reads={"env_key"}),
+        ], known=lambda key: key == "env_key")
+        self.assertEqual([n.deps for n in nodes], [set(), {0}, {0, 1}, {2}])
+
+    def test_run_graph_keeps_order_and_raises_first_error(self):
+        nodes = link([Node(i, i) for i in range(5)])
+        self.assertEqual(run_graph(nodes, lambda n: n.chunk * 2, workers=3), [0, 2, 4, 6, 8])
+
+        def run(node):
+            if node.chunk in (1, 3):
+                raise ValueError(node.chunk)
+            return node.chunk
+
+        with self.assertRaises(ValueError) as ctx:
+            run_graph(link([Node(i, i) for i in range(5)]), run, workers=5)
+        self.assertEqual(ctx.exception.args, (1,))
+
+
+class ParallelProcessTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / "projects").mkdir()
+        (root / "projects" / "dagproj.py").write_text(textwrap.dedent("""
+            import threading
+
+            _both = threading.Barrier(2, timeout=5)
+
+            def fetch_orders():
+                _both.wait()
+                return ["o1", "o2"]
+
+            def fetch_mail():
+                _both.wait()
+                return "mail"
+
+            def count_orders(orders=None):
+                return len(orders)
+        """))
+        self.saved_manifest = Gateway._manifest
+        Gateway._manifest = ProjectManifest(root / "work" / "manifest.json")
+        self.gw = Gateway(project_path=str(root / "projects"))
+        self.gw.results.clear()
+
+    def tearDown(self):
+        self.gw.results.clear()
+        Gateway._manifest = self.saved_manifest
+        sys.modules.pop("dagproj", None)
+        self.tmp.cleanup()
+
+    def test_independent_lines_run_together_in_recipe_order(self):
+        commands = [
+            ["dagproj", "fetch-orders"],
+            ["dagproj", "fetch-mail"],
+            ["count-orders"],
+        ]
+        results, last = process(commands, origin="recipe", gw_instance=self.gw, parallel=2)
+        self.assertEqual(results, [["o1", "o2"], "mail", 2])
+        self.assertEqual(last, 2)
+
+    def test_repeat_runs_in_order_with_one_callback_per_line(self):
+        def run(parallel):
+            seen = []
+
+            def callback(tokens):
+                seen.append(tokens[0])
+                return True
+
+            commands = [
+                ["dagproj", "count-orders", "ab"],
+                ["repeat", "--rest", "0", "--times", "1"],
+            ]
+            results, _ = process(commands, callback, gw_instance=self.gw, parallel=parallel)
+            return results, seen
+
+        self.assertEqual(run(True), run(None))
+        self.assertEqual(run(True)[1], ["dagproj", "repeat", "dagproj"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import importlib
+import os
 import sys
 import types
 
@@ -36,3 +37,39 @@ def test_resolve_env_bindings_uses_fallback_when_missing() -> None:
         importlib.invalidate_caches()
         import gway.envs as real_envs  # noqa: F401 - ensure real module is restored
         importlib.reload(real_envs)
+
+
+def test_load_env_parses_once_and_reapplies_when_needed(tmp_path, monkeypatch) -> None:
+    env_dir = tmp_path / "clients"
+    env_dir.mkdir()
+    (env_dir / "cached.env").write_text("GW_CACHED_A=1\nBASE_ENV=shared\n")
+    (env_dir / "shared.env").write_text("GW_CACHED_B=2\n")
+    monkeypatch.delenv("GW_CACHED_A", raising=False)
+    monkeypatch.delenv("GW_CACHED_B", raising=False)
+    monkeypatch.setenv("CLIENT", "before")
+
+    reads = []
+    original = _env_support._read_env_file
+    monkeypatch.setattr(
+        _env_support, "_read_env_file", lambda path: reads.append(path) or original(path)
+    )
+
+    _env_support.load_env("client", "cached", str(tmp_path))
+    _env_support.load_env("client", "cached", str(tmp_path))
+    assert len(reads) == 2  # primary and base, once each
+    assert os.environ["GW_CACHED_A"] == "1" and os.environ["GW_CACHED_B"] == "2"
+
+    # Values changed behind the loader's back are applied again from cache
+    os.environ["GW_CACHED_A"] = "changed"
+    _env_support.load_env("client", "cached", str(tmp_path))
+    assert os.environ["GW_CACHED_A"] == "1"
+    assert len(reads) == 2
+
+    # Editing the file re-reads it
+    env_file = env_dir / "cached.env"
+    env_file.write_text("GW_CACHED_A=3\n")
+    stat = env_file.stat()
+    os.utime(env_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    _env_support.load_env("client", "cached", str(tmp_path))
+    assert os.environ["GW_CACHED_A"] == "3"
+    assert _env_support.parse_env_file(str(env_file)) == {"GW_CACHED_A": "3"}
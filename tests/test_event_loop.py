@@ -0,0 +1,75 @@
+# tests/test_event_loop.py
+
+import asyncio
+import threading
+import unittest
+
+from gway import Gateway
+from gway.runner import AsyncTask
+
+
+class EventLoopTests(unittest.TestCase):
+    def setUp(self):
+        self.gw = Gateway()
+        self.gw.results.clear()
+
+    def tearDown(self):
+        self.gw.results.clear()
+        self.gw._event_loop.stop()
+
+    def test_coroutines_share_one_loop_and_run_together(self):
+        seen = []
+        ready = None
+
+        async def wait_signal():
+            nonlocal ready
+            ready = ready or asyncio.Event()
+            seen.append((asyncio.get_running_loop(), threading.current_thread()))
+            await asyncio.wait_for(ready.wait(), 5)
+            return "waited"
+
+        async def send_signal():
+            nonlocal ready
+            ready = ready or asyncio.Event()
+            seen.append((asyncio.get_running_loop(), threading.current_thread()))
+            ready.set()
+            return "sent"
+
+        first = self.gw.wrap_callable("wait_signal", wait_signal)()
+        second = self.gw.wrap_callable("send_signal", send_signal)()
+        self.assertIsInstance(first, AsyncTask)
+        self.assertEqual((first.result(5), second.result(5)), ("waited", "sent"))
+        self.assertEqual(len(set(seen)), 1)
+        self.assertIs(seen[0][0], self.gw.event_loop())
+        self.assertEqual(self.gw.results.get("wait_signal"), "waited")
+
+    def test_tasks_can_be_awaited_from_another_loop(self):
+        async def compute_value(value: int = 1):
+            await asyncio.sleep(0)
+            return value * 2
+
+        task = self.gw.wrap_callable("compute_value", compute_value)(value=21)
+
+        async def main():
+            return await task
+
+        self.assertEqual(asyncio.run(main()), 42)
+
+    def test_child_gateways_share_the_loop(self):
+        self.assertIs(self.gw.child(role="x").event_loop(), self.gw.event_loop())
+
+    def test_until_waits_for_pending_coroutines(self):
+        finished = threading.Event()
+
+        async def slow_job():
+            await asyncio.sleep(0.2)
+            finished.set()
+
+        self.gw.wrap_callable("slow_job", slow_job)()
+        self.gw.until(done=True)
+        self.assertTrue(finished.is_set())
+        self.assertEqual(self.gw._async_futures, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# tests/test_fetch.py
+
+import hashlib
+import http.server
+import threading
+import time
+import unittest
+
+from gway.fetch import ConditionalGet, http_session
+from gway.runner import watch_url
+from gway.scheduler import Scheduler
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, send_body):
+        body = self.server.body
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            self.server.log.append((self.command, 304, 0))
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.server.log.append((self.command, 200, len(body) if send_body else 0))
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+
+class FetchTests(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.body = b"version 1" * 100
+        self.server.log = []
+        self.server.connections = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/lock"
+        self.scheduler = Scheduler(name="test-fetch")
+
+    def tearDown(self):
+        self.scheduler.stop()
+        http_session().close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def wait_for(self, predicate, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not predicate():
+            time.sleep(0.01)
+        return predicate()
+
+    def test_unchanged_content_is_not_downloaded_again(self):
+        fetch = ConditionalGet(self.url)
+        response, modified = fetch.get()
+        self.assertTrue(modified)
+        self.assertEqual(response.content, self.server.body)
+        for _ in range(3):
+            response, modified = fetch.get()
+            self.assertFalse(modified)
+            self.assertEqual(response.status_code, 304)
+        self.server.body = b"version 2"
+        self.assertTrue(fetch.get()[1])
+        self.assertEqual([sent for _, _, sent in self.server.log], [900, 0, 0, 0, 9])
+        self.assertEqual(self.server.connections, 1)
+
+    def test_change_watch_polls_with_etags(self):
+        changed = threading.Event()
+        stop = watch_url(self.url, changed.set, interval=0.05, scheduler=self.scheduler)
+        self.assertTrue(self.wait_for(lambda: len(self.server.log) >= 4))
+        self.assertFalse(changed.is_set())
+        self.assertEqual(sum(sent for _, _, sent in self.server.log), 900)
+        self.assertTrue(all(status == 304 for _, status, _ in self.server.log[1:]))
+        self.server.body = b"version 2"
+        self.assertTrue(changed.wait(2))
+        self.assertTrue(stop.is_set())
+
+    def test_up_watch_only_asks_for_the_status(self):
+        changed = threading.Event()
+        watch_url(self.url, changed.set, interval=0.05, event="up", scheduler=self.scheduler)
+        self.assertTrue(changed.wait(2))
+        self.assertEqual(self.server.log, [("HEAD", 200, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
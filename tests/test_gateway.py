@@ -134,6 +134,42 @@ class GatewayTests(unittest.TestCase):
             none_proj = gw.find_project("nope1", "nope2")
             self.assertIsNone(none_proj)
 
+    def test_child_shares_state_and_overlays_context(self):
+        project = gw.b64
+        child = gw.child(verbose=False, child_key="value")
+        self.assertIsNot(child, gw)
+        self.assertNotEqual(child.uuid, gw.uuid)
+        self.assertIs(child._cache, gw._cache)
+        self.assertIs(child.b64, project)
+        self.assertIs(child.context, gw.context)
+        self.assertEqual(gw.context["child_key"], "value")
+        self.assertNotIn("verbose", gw.context)
+        self.assertEqual(child.resolve("[b64.encode=hi]"), gw.b64.encode("hi"))
+
+    def test_shared_wrappers_use_the_active_gateways_modes(self):
+        from unittest.mock import patch
+        from gway import Gateway
+
+        parent = Gateway()
+        encode = parent.b64.encode
+        saved = Gateway.timed
+        child = parent.child(timed=True)
+        try:
+            self.assertIs(child.b64.encode, encode)
+            with patch.object(Gateway, "_log_timed") as log_timed:
+                encode("hi")
+                self.assertFalse(log_timed.called)
+                with child._activate():
+                    encode("hi")
+                self.assertTrue(log_timed.called)
+        finally:
+            Gateway.update_modes(timed=saved)
+
+    def test_child_with_other_project_path_is_a_full_gateway(self):
+        child = gw.child(project_path="elsewhere")
+        self.assertEqual(child.project_path, "elsewhere")
+        self.assertIsNot(child._cache, gw._cache)
+
     def test_prefixes_constant_available(self):
         self.assertIsInstance(gw.prefixes, tuple)
         for pre in ("view_", "api_", "render_"):
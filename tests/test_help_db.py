@@ -0,0 +1,106 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import patch
+
+from gway import gw
+
+
+DEMO = '''
+from gway import gw
+
+
+def greet(name="World"):
+    """Say hello.
+
+    :type name: str
+    :rtype: Greeting
+    """
+    # TODO: localise the greeting
+    gw.info("greeting")
+    return gw.cast.to_str(name)
+
+
+def _hidden():
+    pass
+'''
+
+DEMO_TEST = '''
+from gway import gw
+
+
+class DemoTests:
+    def test_greet(self):
+        gw.demo.greet("you")
+'''
+
+
+class HelpDbTests(unittest.TestCase):
+    def setUp(self):
+        self.module = sys.modules[gw.help_db.build.__module__]
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        for folder in ("projects", "tests", "data"):
+            os.mkdir(folder)
+        # resolve data/help.sqlite here rather than in the checkout
+        open(os.path.join("data", "help.sqlite"), "wb").close()
+        self.write("projects/demo.py", DEMO)
+        self.write("projects/other.py", "def ping():\n    return 'pong'\n")
+        self.write("tests/test_demo.py", DEMO_TEST)
+
+    def tearDown(self):
+        gw.sql.close_db(all=True)
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(textwrap.dedent(text))
+
+    def build(self):
+        parsed = []
+        describe = self.module.describe_module
+
+        def spy(path):
+            parsed.append(os.path.basename(path))
+            return describe(path)
+
+        with patch.object(self.module, "describe_module", spy):
+            gw.help_db.build(update=True)
+        return parsed
+
+    def test_indexes_by_ast_and_answers_help(self):
+        self.assertIn("demo.py", self.build())
+        self.assertNotIn("demo", sys.modules)
+        entry = gw.help("demo", "greet")
+        self.assertEqual(entry["Signature"], "(name='World')")
+        self.assertEqual(entry["Docstring"].splitlines()[0], "Say hello.")
+        self.assertEqual(entry["TODOs"], "# TODO: localise the greeting")
+        self.assertEqual(entry["References"], ["cast", "cast.to_str", "info"])
+        self.assertEqual(entry["Tests"], ["test_demo.py::DemoTests.test_greet"])
+        self.assertEqual(entry["Returns"], "Greeting")
+        self.assertEqual(gw.help("demo", "_hidden"), {"Matches": []})
+
+    def test_only_changed_files_are_parsed_again(self):
+        self.build()
+        self.assertEqual(self.build(), [])
+
+        self.write("projects/other.py", "def ping():\n    return 'pong!'\n\ndef pong():\n    pass\n")
+        self.assertEqual(self.build(), ["other.py"])
+        self.assertEqual(gw.help("other", "pong")["Function"], "pong")
+
+        # a new test updates the unchanged project's rows
+        self.write("tests/test_more.py", "from gway import gw\n\ndef test_ping():\n    gw.other.ping()\n")
+        self.assertEqual(self.build(), [])
+        self.assertEqual(gw.help("other", "ping")["Tests"], ["test_more.py::test_ping"])
+
+        os.remove("projects/demo.py")
+        self.build()
+        self.assertEqual(gw.help("demo", "greet"), {"Matches": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 import os
+import json
 import unittest
 import tempfile
 import logging
+import threading
 import traceback
 from gway import logging as gway_logging
 import unittest.mock
@@ -15,6 +17,7 @@ class LoggingSetupTests(unittest.TestCase):
         self.tempfile.close()
 
     def tearDown(self):
+        gway_logging._stop_listener()
         # Close all handlers before deleting the file
         root_logger = logging.getLogger()
         for handler in root_logger.handlers[:]:
@@ -56,6 +59,92 @@ class LoggingSetupTests(unittest.TestCase):
 
         self.assertIn("frame(s) in gway internals skipped", result)
 
+    def setup(self, **kwargs):
+        return gway_logging.setup_logging(
+            logfile=os.path.basename(self.logfile_path),
+            logdir=os.path.dirname(self.logfile_path), **kwargs
+        )
+
+    def test_background_writer_writes_queued_records(self):
+        logger = self.setup(loglevel="INFO", background=True)
+        self.assertIsInstance(logger.handlers[-1], logging.handlers.QueueHandler)
+        for i in range(200):
+            logging.getLogger("gw").info("queued %d", i)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("gw").exception("failed")
+        gway_logging.flush_logging()
+        with open(self.logfile_path) as f:
+            content = f.read()
+        self.assertIn("queued 199", content)
+        self.assertIn(f"[gw:{gway_logging.GWAY_LOG_ID}:", content)
+        self.assertIn("ValueError: boom", content)
+
+    def test_formatter_leaves_record_name_alone(self):
+        formatter = gway_logging.FilteredFormatter("%(name)s %(message)s")
+        record = logging.LogRecord("gw.sub", logging.INFO, __file__, 1, "hi", None, None)
+        text = formatter.format(record)
+        self.assertEqual(record.name, "gw.sub")
+        self.assertTrue(text.startswith(f"gw:{gway_logging.GWAY_LOG_ID}:"))
+        self.assertTrue(text.endswith(".sub hi"))
+
+    def test_json_lines_carry_structured_fields(self):
+        self.setup(loglevel="INFO", log_format="json", background=True)
+        worker = {}
+
+        def log():
+            worker["tid"] = gway_logging._get_thread_shortid()
+            logging.getLogger("gw").info(
+                "[timed] %s took %.3fs", "mail_fetch", 0.25,
+                extra={"function": "mail_fetch", "subject": "fetch", "duration": 0.25},
+            )
+
+        thread = threading.Thread(target=log)
+        thread.start()
+        thread.join()
+        gway_logging.flush_logging()
+        with open(self.logfile_path) as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        entry = entries[-1]
+        self.assertEqual(entry["msg"], "[timed] mail_fetch took 0.250s")
+        self.assertEqual(entry["function"], "mail_fetch")
+        self.assertEqual(entry["subject"], "fetch")
+        self.assertEqual(entry["duration"], 0.25)
+        self.assertEqual(entry["thread"], worker["tid"])
+        self.assertEqual(entry["log_id"], gway_logging.GWAY_LOG_ID)
+        self.assertEqual(entry["level"], "INFO")
+
+    def test_hard_exit_on_interrupt_writes_queued_records(self):
+        from gway import Gateway
+        import gway.runner as runner
+
+        self.setup(loglevel="INFO", background=True)
+        gw = Gateway()
+        alive = unittest.mock.Mock(is_alive=lambda: True)
+        gw._async_threads[:] = [alive]
+
+        def interrupt(_):
+            raise KeyboardInterrupt
+
+        def hard_exit(code):
+            # Capture what reached the file at the moment of the hard exit.
+            with open(self.logfile_path) as f:
+                written.append(f.read())
+            raise SystemExit(code)
+
+        written = []
+        with unittest.mock.patch.object(runner.time, "sleep", interrupt), \
+                unittest.mock.patch.object(runner.os, "_exit", hard_exit):
+            with self.assertRaises(SystemExit):
+                gw.until(done=True)
+        gw._async_threads.clear()
+        self.assertIn("KeyboardInterrupt received", written[0])
+
+    def test_unknown_log_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.setup(log_format="xml")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,221 @@
+import os
+import re
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from email import message_from_bytes
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from unittest.mock import patch
+
+from gway import gw
+
+
+def _plain(idx, subject, body):
+    msg = MIMEText(body, _charset='utf-8')
+    msg['Subject'] = subject
+    msg['From'] = f'sender{idx}@example.com'
+    msg['To'] = 'admin@example.com'
+    msg['Date'] = (datetime(2024, 1, 1) + timedelta(days=idx)).strftime('%a, %d %b %Y %H:%M:%S +0000')
+    return msg.as_bytes()
+
+
+def _with_attachment(idx, subject, body, payload):
+    msg = MIMEMultipart()
+    msg['Subject'] = subject
+    msg['From'] = f'sender{idx}@example.com'
+    msg['To'] = 'admin@example.com'
+    msg['Date'] = (datetime(2024, 1, 1) + timedelta(days=idx)).strftime('%a, %d %b %Y %H:%M:%S +0000')
+    msg.attach(MIMEText(body, _charset='utf-8'))
+    attachment = MIMEApplication(payload)
+    attachment.add_header('Content-Disposition', 'attachment', filename='report.bin')
+    msg.attach(attachment)
+    return msg.as_bytes()
+
+
+class Mailbox:
+    """Server side state shared by every FakeIMAP connection."""
+
+    def __init__(self):
+        self.uidvalidity = 1
+        self.messages = {}  # uid -> raw bytes
+        self.next_uid = 1
+        self.fetches = []  # (uid_set, items)
+        self.sent = 0  # literal bytes sent to the client
+
+    def add(self, raw):
+        self.messages[self.next_uid] = raw
+        self.next_uid += 1
+
+
+def _split(raw):
+    head, _, body = raw.partition(b'\n\n')
+    return head + b'\n\n', body
+
+
+class FakeIMAP:
+    """Minimal UID-aware IMAP stand-in returning imaplib shaped responses."""
+
+    box = None
+
+    def __init__(self, server, port):
+        self.utf8_enabled = False
+
+    def login(self, user, password):
+        pass
+
+    def enable(self, capability):
+        self.utf8_enabled = True
+        return 'OK', [b'enabled']
+
+    def select(self, mailbox, readonly=False):
+        self._validity = self.box.uidvalidity
+        return 'OK', [str(len(self.box.messages)).encode()]
+
+    def response(self, code):
+        return code, [str(self._validity).encode()]
+
+    def search(self, charset, *criteria):
+        raise AssertionError('the index path must not SEARCH on the server')
+
+    def fetch(self, mail_id, mode):
+        raise AssertionError('the index path must not fetch by sequence number')
+
+    def uid(self, command, *args):
+        if command == 'SEARCH':
+            low = int(re.match(r'UID (\d+):\*', args[1]).group(1))
+            uids = [u for u in sorted(self.box.messages) if u >= low]
+            if not uids and self.box.messages:
+                uids = [max(self.box.messages)]
+            return 'OK', [' '.join(map(str, uids)).encode()]
+        assert command == 'FETCH'
+        uid_set, items = args
+        self.box.fetches.append((uid_set, items))
+        sections = re.findall(r'BODY\.PEEK\[([^\]]*)\]', items)
+        data = []
+        for seq, uid in enumerate(map(int, uid_set.split(',')), 1):
+            if uid not in self.box.messages:
+                continue
+            raw = self.box.messages[uid]
+            prefix = f'{seq} (UID {uid} '
+            for section in sections:
+                literal = self._section(raw, section)
+                self.box.sent += len(literal)
+                data.append((f'{prefix}BODY[{section}] {{{len(literal)}}}'.encode(), literal))
+                prefix = ' '
+            data.append(b')')
+        return 'OK', data
+
+    @staticmethod
+    def _section(raw, section):
+        head, body = _split(raw)
+        if section == '':
+            return raw
+        if section == 'HEADER':
+            return head
+        if section == 'TEXT':
+            return body
+        part = message_from_bytes(raw).get_payload(0).as_bytes()
+        part_head, part_body = _split(part)
+        return part_head if section == '1.MIME' else part_body
+
+    def close(self):
+        pass
+
+    def logout(self):
+        pass
+
+
+class MailIndexTests(unittest.TestCase):
+    def setUp(self):
+        os.environ['MAIL_SENDER'] = 'test@example.com'
+        os.environ['MAIL_PASSWORD'] = 'secret'
+        os.environ['IMAP_SERVER'] = 'imap.example.com'
+        os.environ['IMAP_PORT'] = '993'
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = os.path.join(self.tmp.name, 'mail.sqlite')
+        self.box = FakeIMAP.box = Mailbox()
+        self.box.add(_plain(1, 'Welcome', 'hello there'))
+        self.box.add(_plain(2, 'Your code', 'confirmation code 1234'))
+        self.box.add(_with_attachment(3, 'Monthly report', 'see attached', b'\0' * 50000))
+
+    def tearDown(self):
+        gw.sql.close_db(self.index, project='mail_index')
+        self.tmp.cleanup()
+        for var in ['MAIL_SENDER', 'MAIL_PASSWORD', 'IMAP_SERVER', 'IMAP_PORT']:
+            os.environ.pop(var, None)
+
+    def sync(self, **kwargs):
+        with patch('imaplib.IMAP4_SSL', FakeIMAP):
+            return gw.mail.sync(datafile=self.index, **kwargs)
+
+    def test_sync_fetches_only_new_uids_without_attachments(self):
+        stats = self.sync()
+        self.assertEqual((stats['fetched'], stats['last_uid']), (3, 3))
+        # headers, single part texts and first parts: one FETCH each
+        self.assertEqual(len(self.box.fetches), 3)
+        self.assertLess(self.box.sent, 5000)
+
+        self.box.fetches.clear()
+        self.assertEqual(self.sync()['fetched'], 0)
+        self.assertEqual(self.box.fetches, [])
+
+        self.box.add(_plain(4, 'Your code', 'confirmation code 5678'))
+        stats = self.sync()
+        self.assertEqual((stats['fetched'], stats['last_uid']), (1, 4))
+        self.assertTrue(all(uid_set == '4' for uid_set, _ in self.box.fetches))
+
+    def test_deleted_index_is_recreated(self):
+        self.sync()
+        gw.sql.close_db(self.index, project='mail_index')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.index + suffix):
+                os.remove(self.index + suffix)
+        stats = self.sync()
+        self.assertEqual((stats['fetched'], stats['last_uid']), (3, 3))
+
+    def test_sync_batches_fetches(self):
+        for idx in range(4, 11):
+            self.box.add(_plain(idx, f'note {idx}', 'text'))
+        self.sync(batch=4)
+        header_fetches = [s for s, items in self.box.fetches if 'HEADER' in items]
+        self.assertEqual(header_fetches, ['1,2,3,4', '5,6,7,8', '9,10'])
+
+    def test_new_uidvalidity_rebuilds_the_index(self):
+        self.sync()
+        self.box.uidvalidity = 2
+        self.box.messages = {1: _plain(9, 'Fresh start', 'renumbered')}
+        stats = self.sync()
+        self.assertTrue(stats['reset'])
+        with patch('imaplib.IMAP4_SSL', FakeIMAP):
+            results = gw.mail.search(index=self.index)
+        self.assertEqual([r['subject'] for r in results], ['Fresh start'])
+
+    def test_search_and_read_answer_from_the_index(self):
+        with patch('imaplib.IMAP4_SSL', FakeIMAP):
+            results = gw.mail.search('code', index=self.index)
+            self.assertEqual([r['from'] for r in results], ['sender2@example.com'])
+            self.assertEqual(
+                [r['subject'] for r in gw.mail.search(index=self.index, reverse=True)],
+                ['Welcome', 'Your code', 'Monthly report'],
+            )
+            self.assertEqual(gw.mail.search(body_fragment='1234', index=self.index)[0]['subject'], 'Your code')
+            self.assertEqual(gw.mail.search('100%', index=self.index), [])
+            self.assertEqual(len(gw.mail.search(since='2024-01-03', index=self.index)), 2)
+
+            self.box.fetches.clear()
+            content, attachments = gw.mail.read('code', index=self.index)
+            self.assertEqual(content, 'confirmation code 1234')
+            self.assertEqual(attachments, [])
+            self.assertEqual(self.box.fetches, [])
+
+            content, attachments = gw.mail.read('report', index=self.index)
+            self.assertEqual(content, 'see attached')
+            self.assertEqual(attachments, [('report.bin', b'\0' * 50000)])
+
+            self.assertIsNone(gw.mail.read('missing', index=self.index))
+
+
+if __name__ == '__main__':
+    unittest.main()
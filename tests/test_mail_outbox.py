@@ -0,0 +1,173 @@
+import os
+import smtplib
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from email.mime.text import MIMEText
+from unittest.mock import patch
+
+from gway import gw
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough ESMTP (EHLO, AUTH PLAIN, MAIL/RCPT/DATA, QUIT) to count."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        server.sockets.append(self.connection)
+        self.reply("220 localhost ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().split(" ")[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.wfile.write(b"250-localhost\r\n250 AUTH PLAIN\r\n")
+            elif command == "AUTH":
+                server.logins += 1
+                self.reply("235 ok")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 ok")
+            elif command == "DATA":
+                self.reply("354 go ahead")
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    chunk = self.rfile.readline()
+                    if not chunk:
+                        return
+                    data += chunk
+                if server.reject:
+                    server.reject -= 1
+                    self.reply("451 try again later")
+                else:
+                    server.messages.append(data)
+                    self.reply("250 queued")
+            elif command == "QUIT":
+                server.quits += 1
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 unknown")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class PlainSMTP(smtplib.SMTP):
+    """The stand-in has no TLS; everything else is the real client."""
+
+    def starttls(self, *args, **kwargs):
+        return 220, b"skipped"
+
+
+class MailOutboxTests(unittest.TestCase):
+    def setUp(self):
+        self.mail = sys.modules[gw.mail.send.__module__]
+        gw.mail.shutdown_outbox()
+        self.server = _SMTPServer(("127.0.0.1", 0), _SMTPHandler)
+        self.server.connections = self.server.logins = self.server.quits = 0
+        self.server.reject = 0
+        self.server.messages = []
+        self.server.sockets = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.env = {
+            "MAIL_SENDER": "test@example.com",
+            "MAIL_PASSWORD": "secret",
+            "SMTP_SERVER": "127.0.0.1",
+            "SMTP_PORT": str(self.server.server_address[1]),
+        }
+        os.environ.update(self.env)
+        self.smtp = patch("smtplib.SMTP", PlainSMTP)
+        self.smtp.start()
+
+    def tearDown(self):
+        gw.mail.shutdown_outbox()
+        self.smtp.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        for var in [*self.env, "MAIL_OUTBOX"]:
+            os.environ.pop(var, None)
+
+    def test_burst_reuses_one_connection(self):
+        handles = [
+            gw.mail.send(f"alert {i}", body="disk full", to="admin@example.com", threaded=True)
+            for i in range(10)
+        ]
+        self.assertTrue(all(isinstance(h, self.mail.MailHandle) for h in handles))
+        self.assertEqual(handles[0].result(timeout=5), "Email sent successfully to admin@example.com")
+        stats = gw.mail.flush(timeout=5)
+        self.assertEqual((stats["sent"], stats["pending"]), (10, 0))
+        self.assertEqual(len(self.server.messages), 10)
+        self.assertEqual((self.server.connections, self.server.logins), (1, 1))
+
+        # blocking sends use the same connection
+        result = gw.mail.send("again", body="still full", to="admin@example.com", threaded=False)
+        self.assertEqual(result, "Email sent successfully to admin@example.com")
+        self.assertEqual(self.server.connections, 1)
+
+    def test_idle_connection_is_closed_and_reopened(self):
+        with patch.object(self.mail, "SMTP_IDLE_TIMEOUT", 0.05):
+            gw.mail.send("one", body="x", to="a@example.com", threaded=False)
+            deadline = time.monotonic() + 2
+            while self.server.quits == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.server.quits, 1)
+            gw.mail.send("two", body="x", to="a@example.com", threaded=False)
+        self.assertEqual(self.server.connections, 2)
+
+    def test_dropped_connection_is_reopened_transparently(self):
+        gw.mail.send("one", body="x", to="a@example.com", threaded=False)
+        for sock in self.server.sockets:
+            sock.shutdown(socket.SHUT_RDWR)
+        result = gw.mail.send("two", body="x", to="a@example.com", threaded=False)
+        self.assertEqual(result, "Email sent successfully to a@example.com")
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual(len(self.server.messages), 2)
+
+    def test_queued_mail_is_retried_with_backoff(self):
+        self.server.reject = 2
+        with patch.object(self.mail, "RETRY_BACKOFF", 0.01):
+            handle = gw.mail.send("retry", body="x", to="a@example.com", threaded=True)
+            self.assertEqual(handle.result(timeout=5), "Email sent successfully to a@example.com")
+            self.assertEqual(gw.mail.flush()["retried"], 2)
+        self.assertEqual(len(self.server.messages), 1)
+
+    def test_blocking_send_reports_errors_without_retrying(self):
+        self.server.reject = 1
+        result = gw.mail.send("once", body="x", to="a@example.com", threaded=False)
+        self.assertTrue(result.startswith("Error sending email:"))
+        self.assertEqual(self.server.messages, [])
+
+    def test_spooled_mail_survives_a_restart(self):
+        with tempfile.TemporaryDirectory() as spool:
+            os.environ["MAIL_OUTBOX"] = spool
+            msg = MIMEText("left behind", _charset="utf-8")
+            msg["Subject"] = "from the last run"
+            msg["From"] = "test@example.com"
+            msg["To"] = "a@example.com"
+            with open(os.path.join(spool, "0001.eml"), "wb") as handle:
+                handle.write(msg.as_bytes())
+
+            stats = gw.mail.flush(timeout=5)
+            self.assertEqual(stats["sent"], 1)
+            self.assertIn(b"from the last run", self.server.messages[0])
+
+            handle = gw.mail.send("new", body="x", to="a@example.com", threaded=True)
+            handle.result(timeout=5)
+            self.assertEqual(os.listdir(spool), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
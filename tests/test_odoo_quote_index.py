@@ -0,0 +1,98 @@
+import csv
+
+import pytest
+
+from projects import odoo
+
+
+QUOTES = [
+    {'id': 1, 'name': 'SO001', 'state': 'sent', 'partner_id': [10, 'José Pérez'],
+     'create_date': '2024-03-01 09:00:00', 'amount_total': 40000},
+    {'id': 2, 'name': 'SO002', 'state': 'draft', 'partner_id': [10, 'José Pérez'],
+     'create_date': '2024-04-01 09:00:00', 'amount_total': 20000},
+    {'id': 3, 'name': 'SO003', 'state': 'sent', 'partner_id': [11, 'Ana Pérez Ruiz'],
+     'create_date': '2024-01-01 09:00:00', 'amount_total': 10000},
+    {'id': 4, 'name': 'SO004', 'state': 'sent', 'partner_id': [12, 'Comercial Ruiz SA'],
+     'create_date': '2024-05-01 09:00:00', 'amount_total': 70000},
+]
+
+
+class FakeOdoo:
+    """Answers the calls of both lookup modes from QUOTES and counts them."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute_kw(self, *args, model, method, **kwargs):
+        self.calls += 1
+        assert (model, method) == ('sale.order', 'search_count')
+        return len(QUOTES)
+
+    def execute_batch(self, calls):
+        self.calls += len(calls)
+        results = []
+        for model, method, domain, options in calls:
+            term = next((c[2] for c in domain[0] if c[0] == 'partner_id.name'), None)
+            if term is None:
+                offset, limit = options['offset'], options['limit']
+                results.append([dict(q) for q in QUOTES[offset:offset + limit]])
+                continue
+            # ilike on an unaccented database
+            needle = odoo._strip_accents(term).lower()
+            results.append([
+                dict(q) for q in QUOTES
+                if needle in odoo._strip_accents(q['partner_id'][1]).lower()
+            ])
+        return results
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    server = FakeOdoo()
+    monkeypatch.setattr(odoo, "execute_kw", server.execute_kw)
+    monkeypatch.setattr(odoo, "execute_batch", server.execute_batch)
+    return server
+
+
+@pytest.mark.parametrize("name", ["Jose Perez", "José Pérez", "Ana Perez", "Ruiz", "Nobody"])
+def test_index_matches_remote_lookup(fake, name):
+    index = odoo.QuoteIndex.fetch(page_size=3)
+    assert len(index) == len(QUOTES)
+    assert index.find(name) == odoo._find_quotes_for_customer(name)
+
+
+def test_prefetch_annotates_without_per_row_requests(fake, tmp_path, monkeypatch):
+    def per_row(name):
+        raise AssertionError("per-row lookup used")
+
+    monkeypatch.setattr(odoo, "_find_quotes_for_customer", per_row)
+    csv_path = tmp_path / "customers.csv"
+    names = ["José Pérez", "Ana Perez Ruiz", "Nobody"] * 50
+    with csv_path.open('w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Customer"])
+        writer.writerows([name] for name in names)
+
+    result = odoo.add_quote_ids(csvfile=str(csv_path), name_col="Customer", prefetch=True)
+
+    with csv_path.open('r', newline='', encoding='utf-8') as handle:
+        rows = list(csv.reader(handle))
+    assert rows[1:4] == [["José Pérez", "SO001"], ["Ana Perez Ruiz", "SO003"], ["Nobody", "XX"]]
+    assert result['matched_rows'] == 100
+    # one search_count and one page, however many rows
+    assert fake.calls == 2
+
+
+def test_index_is_reused_within_ttl(fake, tmp_path, monkeypatch):
+    path = tmp_path / "work" / "odoo" / "quote_index.json"
+    monkeypatch.setattr(odoo, "_quote_index_path", lambda: path)
+
+    first = odoo.load_quote_index(ttl=60)
+    assert path.exists()
+    calls = fake.calls
+    again = odoo.load_quote_index(ttl="60")
+    assert fake.calls == calls
+    assert again.find("Jose Perez") == first.find("Jose Perez")
+
+    odoo.load_quote_index(ttl=0)
+    assert fake.calls > calls
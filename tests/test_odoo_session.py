@@ -0,0 +1,136 @@
+import socketserver
+import threading
+from xmlrpc import client
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+import pytest
+
+from projects import odoo
+
+
+class _Handler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ("/xmlrpc/2/common", "/xmlrpc/2/object")
+    protocol_version = "HTTP/1.1"  # keep-alive, like Odoo behind a proxy
+
+    def setup(self):
+        super().setup()
+        self.server.stats["connections"] += 1
+
+    def do_POST(self):
+        self.server.stats["requests"] += 1
+        super().do_POST()
+
+
+class _Server(socketserver.ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+
+
+class FakeOdoo:
+    """Stand-in for Odoo's XML-RPC endpoints that counts round-trips."""
+
+    def __init__(self, *, multicall):
+        self.server = _Server(("127.0.0.1", 0), requestHandler=_Handler,
+                              logRequests=False, allow_none=True)
+        self.server.stats = {"connections": 0, "requests": 0}
+        self.logins = 0
+        self.uid = 7
+        self.server.register_function(self.authenticate, "authenticate")
+        self.server.register_function(self.execute_kw, "execute_kw")
+        if multicall:
+            self.server.register_multicall_functions()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def stats(self):
+        return self.server.stats
+
+    def authenticate(self, db, user, password, env):
+        self.logins += 1
+        return self.uid if password == "pw" else False
+
+    def execute_kw(self, db, uid, password, model, method, *args):
+        if uid != self.uid:
+            raise client.Fault(3, "odoo.exceptions.AccessDenied: Access Denied")
+        if model == "boom":
+            raise ValueError("no such model")
+        return [model, method, list(args)]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+@pytest.fixture
+def fake():
+    server = FakeOdoo(multicall=True)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def plain():
+    server = FakeOdoo(multicall=False)
+    yield server
+    server.close()
+
+
+def test_session_authenticates_once_and_keeps_the_connection(fake):
+    session = odoo.OdooSession(fake.url, "db", "admin", "pw")
+    for i in range(5):
+        assert session.execute("res.partner", "read", [i]) == ["res.partner", "read", [[i]]]
+    assert fake.logins == 1
+    assert fake.stats["requests"] == 6
+    # one connection for /common, one for /object
+    assert fake.stats["connections"] == 2
+
+
+def test_session_logs_in_again_after_an_access_fault(fake):
+    session = odoo.OdooSession(fake.url, "db", "admin", "pw")
+    session.execute("res.partner", "read", [1])
+    fake.uid = 8  # e.g. the database was restored
+    assert session.execute("res.partner", "read", [1])[0] == "res.partner"
+    assert fake.logins == 2
+    assert session.uid == 8
+
+
+def test_wrong_password_is_not_retried_forever(fake):
+    session = odoo.OdooSession(fake.url, "db", "admin", "nope")
+    with pytest.raises(client.Fault, match="AccessDenied"):
+        session.execute("res.partner", "read", [1])
+    assert fake.logins == 1
+
+
+def test_batch_uses_one_multicall_request(fake):
+    session = odoo.OdooSession(fake.url, "db", "admin", "pw")
+    session.authenticate()
+    before = fake.stats["requests"]
+    calls = [("sale.order", "read", [i], {"fields": ["name"]}) for i in range(10)]
+    results = session.batch(calls)
+    assert results == [["sale.order", "read", [[i], {"fields": ["name"]}]] for i in range(10)]
+    assert fake.stats["requests"] - before == 1
+    assert session.multicall_supported is True
+    with pytest.raises(client.Fault, match="no such model"):
+        session.batch([("res.partner", "read", [1]), ("boom", "read", [1])])
+    assert session.multicall_supported is True
+
+
+def test_batch_without_multicall_runs_on_a_bounded_pool(plain):
+    session = odoo.OdooSession(plain.url, "db", "admin", "pw", workers=3)
+    calls = [("sale.order", "read", [i]) for i in range(9)]
+    assert [r[2] for r in session.batch(calls)] == [[[i]] for i in range(9)]
+    assert session.multicall_supported is False
+    assert plain.logins == 1
+    # 1 login + 1 rejected multicall + 9 calls, over at most 1 + 3 connections
+    assert plain.stats["requests"] == 11
+    assert plain.stats["connections"] <= 5
+
+
+def test_get_session_is_shared_per_user(fake):
+    first = odoo.get_session(url=fake.url, db_name="db", username="admin", password="pw")
+    again = odoo.get_session(url=fake.url, db_name="db", username="admin", password="pw")
+    other = odoo.get_session(url=fake.url, db_name="db", username="sales", password="pw")
+    assert first is again
+    assert other is not first
@@ -0,0 +1,58 @@
+# file: tests/test_profiling.py
+
+import os
+import tempfile
+import unittest
+
+from gway.profiling import StartupProfiler, folded_stacks, parse_importtime, profile_startup
+
+# Generous enough for cold interpreters without cached bytecode.
+IMPORT_BUDGET_MS = 1000
+
+
+class StartupProfilerTests(unittest.TestCase):
+    def test_parse_importtime_nests_children(self):
+        lines = [
+            "import time: self [us] | cumulative | imported package\n",
+            "import time:        10 |         10 |     gway.sigils\n",
+            "import time:        20 |         30 |   gway.gateway\n",
+            "import time:         5 |         35 | gway\n",
+            "import time:         7 |          7 | json\n",
+        ]
+        roots = parse_importtime(lines)
+        self.assertEqual([n["name"] for n in roots], ["gway", "json"])
+        gateway = roots[0]["children"][0]
+        self.assertEqual(gateway["name"], "gway.gateway")
+        self.assertEqual(gateway["children"][0]["total_us"], 10)
+        phases = [{"stack": ["cli"], "seconds": 0.003}, {"stack": ["cli", "argparse"], "seconds": 0.001}]
+        self.assertEqual(
+            folded_stacks(roots, phases),
+            [
+                "import;gway 5",
+                "import;gway;gway.gateway 20",
+                "import;gway;gway.gateway;gway.sigils 10",
+                "import;json 7",
+                "phase;cli 2000",
+                "phase;cli;argparse 1000",
+            ],
+        )
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = StartupProfiler()
+        with profiler.phase("cli"):
+            pass
+        self.assertEqual(profiler.phases, [])
+
+    def test_hello_world_stays_within_import_budget(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = profile_startup(["hello-world"], output_dir=tmp)
+            self.assertEqual(summary["returncode"], 0)
+            self.assertEqual(summary["deferred_loaded"], [])
+            self.assertLess(summary["import_ms"], IMPORT_BUDGET_MS)
+            self.assertIn("cli;gateway init", summary["phases"])
+            self.assertIn("cli;project resolution", summary["phases"])
+            self.assertTrue(os.path.getsize(summary["folded"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
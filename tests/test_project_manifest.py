@@ -0,0 +1,139 @@
+# tests/test_project_manifest.py
+
+import os
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+
+from gway import Gateway
+from gway.manifest import ProjectManifest, scan_module
+
+
+class ProjectManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.projects = self.root / "projects"
+        (self.projects / "lazyproj").mkdir(parents=True)
+        (self.projects / "lazyproj" / "lazyproj.py").write_text(textwrap.dedent("""
+            def root_func(x: int = 1):
+                \"\"\"Root level.\"\"\"
+                return x * 2
+        """))
+        (self.projects / "lazyproj" / "heavy.py").write_text(textwrap.dedent("""
+            import os as _os
+            _os.environ["GWAY_LAZY_HEAVY_IMPORTED"] = "1"
+
+            def crunch(value):
+                return f"crunched {value}"
+
+            async def later():
+                return None
+        """))
+        os.environ.pop("GWAY_LAZY_HEAVY_IMPORTED", None)
+        self.saved_manifest = Gateway._manifest
+        Gateway._manifest = ProjectManifest(self.root / "work" / "manifest.json")
+        self.gw = Gateway(project_path=str(self.projects))
+
+    def tearDown(self):
+        Gateway._manifest = self.saved_manifest
+        for name in ("lazyproj", "lazyproj_heavy"):
+            sys.modules.pop(name, None)
+        os.environ.pop("GWAY_LAZY_HEAVY_IMPORTED", None)
+        self.tmp.cleanup()
+
+    def test_scan_module_reads_functions_without_import(self):
+        entry = scan_module(str(self.projects / "lazyproj" / "heavy.py"))
+        self.assertEqual(set(entry["functions"]), {"crunch", "later"})
+        self.assertEqual(entry["functions"]["crunch"]["signature"], "(value)")
+        self.assertTrue(entry["functions"]["later"]["async"])
+        self.assertNotIn("GWAY_LAZY_HEAVY_IMPORTED", os.environ)
+
+    def test_scan_module_sees_assigned_getattr_and_aliases(self):
+        path = self.projects / "lazyproj" / "alias.py"
+        path.write_text(
+            "import os.path as _path\n"
+            "from os.path import basename, join as _join\n"
+            "__getattr__ = lambda name: name\n"
+            "def run(x):\n"
+            "    return x\n"
+            "go = run\n"
+            "split = _path.split\n"
+            "LIMIT = 3\n"
+        )
+        entry = scan_module(str(path))
+        self.assertTrue(entry["getattr"])
+        self.assertEqual(set(entry["functions"]), {"run", "go"})
+        self.assertEqual(entry["functions"]["go"]["signature"], "(x)")
+        self.assertEqual(entry["aliases"], ["basename", "split"])
+
+    def test_aliased_names_resolve_on_a_cold_project(self):
+        (self.projects / "lazyproj" / "heavy.py").write_text(
+            "import os.path as _path\n"
+            "def crunch(value):\n"
+            "    return f'crunched {value}'\n"
+            "grind = crunch\n"
+            "tail = _path.basename\n"
+        )
+        project = self.gw.load_project("lazyproj")
+        self.assertIn("grind", dir(project.heavy))
+        self.assertEqual(project.heavy.grind("x"), "crunched x")
+        self.assertEqual(project.heavy.tail("/a/b.txt"), "b.txt")
+
+    def test_submodules_import_on_first_use(self):
+        project = self.gw.load_project("lazyproj")
+        self.assertNotIn("GWAY_LAZY_HEAVY_IMPORTED", os.environ)
+        self.assertIn("crunch", dir(project.heavy))
+
+        self.assertEqual(project.root_func(x=3), 6)
+        self.assertNotIn("GWAY_LAZY_HEAVY_IMPORTED", os.environ)
+
+        self.assertEqual(project.heavy.crunch("data"), "crunched data")
+        self.assertEqual(os.environ.get("GWAY_LAZY_HEAVY_IMPORTED"), "1")
+
+    def test_manifest_is_persisted_and_invalidated_on_change(self):
+        self.gw.load_project("lazyproj")
+        manifest_path = self.root / "work" / "manifest.json"
+        self.assertTrue(manifest_path.is_file())
+
+        heavy = self.projects / "lazyproj" / "heavy.py"
+        reloaded = ProjectManifest(manifest_path)
+        self.assertIn("crunch", reloaded.entry(str(heavy))["functions"])
+
+        heavy.write_text("def fresh():\n    return 'new'\n")
+        stamp = time.time() + 5
+        os.utime(heavy, (stamp, stamp))
+        self.assertEqual(set(reloaded.entry(str(heavy))["functions"]), {"fresh"})
+
+    def test_unknown_names_fall_back_to_import(self):
+        (self.projects / "lazyproj" / "extra.py").write_text(
+            "from os.path import basename\n"
+        )
+        project = self.gw.load_project("lazyproj")
+        self.assertEqual(project.extra.basename("/a/b.txt"), "b.txt")
+        with self.assertRaises(AttributeError):
+            project.extra.missing
+
+    def test_unknown_names_do_not_import_pending_modules(self):
+        project = self.gw.load_project("lazyproj")
+        self.assertFalse(hasattr(project.heavy, "typo"))
+        self.assertFalse(hasattr(project, "typo"))
+        self.assertNotIn("GWAY_LAZY_HEAVY_IMPORTED", os.environ)
+
+    def test_completion_walk_skips_modules_that_fail_to_import(self):
+        from projects.cli import _walk
+
+        (self.projects / "lazyproj" / "broken.py").write_text(
+            "import gway_missing_dependency\n\ndef run():\n    pass\n"
+        )
+        project = self.gw.load_project("lazyproj")
+        commands = _walk(project, ["lazyproj"])
+        self.assertIn(["lazyproj", "heavy", "crunch"], commands)
+        self.assertNotIn(["lazyproj", "broken", "run"], commands)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# tests/test_registry.py
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gway import Gateway
+from gway.manifest import ProjectManifest
+from gway.registry import ProjectRegistry
+
+
+class ProjectRegistryTests(unittest.TestCase):
+    def test_concurrent_loads_run_the_loader_once(self):
+        registry = ProjectRegistry(hot_reload=False)
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(1)
+            return object(), None
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.load("p", loader)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+        self.assertEqual(registry.stats()[0]["loads"], 1)
+
+    def test_failed_loads_are_not_cached(self):
+        registry = ProjectRegistry(hot_reload=False)
+
+        def loader():
+            raise FileNotFoundError("nope")
+
+        with self.assertRaises(FileNotFoundError):
+            registry.load("p", loader)
+        self.assertNotIn("p", registry)
+        self.assertEqual(registry.stats(), [])
+
+
+class GatewayHotReloadTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.projects = self.root / "projects"
+        self.projects.mkdir()
+        self.source = self.projects / "reloadproj.py"
+        self.source.write_text("def version():\n    return 1\n")
+        self.saved_manifest = Gateway._manifest
+        Gateway._manifest = ProjectManifest(self.root / "work" / "manifest.json")
+        self.gw = Gateway(project_path=str(self.projects))
+
+    def tearDown(self):
+        Gateway._manifest = self.saved_manifest
+        sys.modules.pop("reloadproj", None)
+        self.tmp.cleanup()
+
+    def test_edited_project_is_swapped_in(self):
+        self.gw.hot_reload(interval=0)
+        old = self.gw.reloadproj
+        self.assertEqual(old.version(), 1)
+
+        self.source.write_text("def version():\n    return 2\n")
+        stamp = time.time() + 5
+        os.utime(self.source, (stamp, stamp))
+
+        new = self.gw.reloadproj
+        self.assertIsNot(new, old)
+        self.assertEqual(new.version(), 2)
+        # Callers holding the previous namespace keep working.
+        self.assertEqual(old.version(), 1)
+        stats = {s["project"]: s for s in self.gw.project_stats()}
+        self.assertEqual(stats["reloadproj"]["loads"], 1)
+        self.assertEqual(stats["reloadproj"]["reloads"], 1)
+        self.assertEqual(stats["reloadproj"]["path"], str(self.source))
+
+    def test_projects_are_not_rechecked_without_hot_reload(self):
+        self.gw.hot_reload(False)
+        first = self.gw.reloadproj
+        with patch("gway.registry._source_stamps") as stamps:
+            self.assertIs(self.gw.reloadproj, first)
+        stamps.assert_not_called()
+
+    def test_child_gateways_share_loaded_projects(self):
+        project = self.gw.reloadproj
+        self.assertIs(self.gw.child(role="x").reloadproj, project)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# file: tests/test_routing.py
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from gway import gw
+from gway.console import normalize_token
+from gway.routing import RouteCache, ROUTES
+
+
+class Dynamic(SimpleNamespace):
+    """Namespace counting the misses that reach ``__getattr__``."""
+
+    def __getattr__(self, name):
+        self.__dict__.setdefault("probes", []).append(name)
+        raise AttributeError(f"no attribute {name!r}")
+
+
+class RouteCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.routes = RouteCache()
+        self.root = Dynamic(tools=Dynamic(build_all=lambda: "built"))
+
+    def resolve(self, *tokens):
+        return self.routes.resolve(self.root, tokens, normalize_token)
+
+    def test_composite_names_resolve_and_are_replayed(self):
+        obj, remaining, path, _ = self.resolve("tools", "build", "all")
+        self.assertEqual(obj(), "built")
+        self.assertEqual((remaining, path), ([], ["tools", "build", "all"]))
+        probes = list(self.root.tools.probes)
+
+        obj, _, _, _ = self.resolve("tools", "build", "all")
+        self.assertEqual(obj(), "built")
+        self.assertEqual(self.root.tools.probes, probes)
+        self.assertEqual(self.routes.hits, 1)
+
+    def test_missing_names_are_not_probed_again(self):
+        _, remaining, path, error = self.resolve("nope", "x")
+        self.assertEqual((remaining, path), (["nope", "x"], []))
+        self.assertIsInstance(error, AttributeError)
+        probes = list(self.root.probes)
+        # A different line sharing the missing name only hits the cache
+        self.resolve("nope", "y")
+        self.assertEqual(self.root.probes, probes + ["nope_y"])
+
+    def test_names_set_after_a_miss_are_found(self):
+        self.resolve("late")
+        self.root.late = lambda: "here"
+        obj, _, path, error = self.resolve("late")
+        self.assertEqual((obj(), path, error), ("here", ["late"], None))
+
+    def test_replayed_routes_read_patched_attributes(self):
+        self.resolve("tools", "build_all")
+        with patch.object(self.root.tools, "build_all", lambda: "patched"):
+            obj, _, _, _ = self.resolve("tools", "build_all")
+            self.assertEqual(obj(), "patched")
+
+    def test_invalidate_clears_routes_and_misses(self):
+        self.resolve("nope")
+        self.routes.invalidate()
+        self.assertEqual(self.routes.stats()["routes"], 0)
+        self.assertEqual(self.routes.stats()["missing"], 0)
+
+
+class GatewayRoutingTests(unittest.TestCase):
+    def test_missing_project_is_searched_once(self):
+        ROUTES.invalidate()
+        with patch.object(gw, "load_project", side_effect=FileNotFoundError) as load:
+            for _ in range(3):
+                ROUTES.resolve(gw, ["no_such_project_xyz"], normalize_token)
+        self.assertEqual(load.call_count, 1)
+
+    def test_loading_a_project_invalidates_routes(self):
+        ROUTES.resolve(gw, ["no_such_project_xyz"], normalize_token)
+        self.assertGreater(ROUTES.stats()["routes"], 0)
+        gw._cache.pop("b64", None)
+        gw.load_project("b64")
+        self.assertEqual(ROUTES.stats()["routes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+# tests/test_scheduler.py
+
+import threading
+import time
+import unittest
+
+from gway import Gateway
+from gway.runner import watch_url
+from gway.scheduler import Scheduler
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.errors = []
+        self.scheduler = Scheduler(
+            name="test-scheduler", on_error=lambda task, exc: self.errors.append(exc)
+        )
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def schedule(self, func, interval, **options):
+        return self.scheduler.schedule(func, interval, **options)
+
+    def test_tasks_share_one_timer_thread_and_report_stats(self):
+        calls = []
+        first = self.schedule(lambda: calls.append("a"), 0.05, name="a")
+        second = self.schedule(lambda: calls.append("b"), 0.05, name="b")
+        self.assertTrue(wait_for(lambda: first.runs >= 3 and second.runs >= 3))
+        timers = [t for t in threading.enumerate() if t.name == "test-scheduler"]
+        self.assertEqual(len(timers), 1)
+        stats = {s["name"]: s for s in self.scheduler.stats()}
+        self.assertGreaterEqual(stats["a"]["runs"], 3)
+        self.assertEqual(stats["a"]["failures"], 0)
+        self.assertIsNotNone(stats["a"]["avg_ms"])
+
+    def test_cancel_stops_further_runs(self):
+        task = self.schedule(lambda: None, 0.02)
+        self.assertTrue(wait_for(lambda: task.runs >= 1))
+        task.cancel()
+        time.sleep(0.05)
+        runs = task.runs
+        time.sleep(0.15)
+        self.assertEqual(task.runs, runs)
+        self.assertFalse(task.is_alive())
+        self.assertEqual(self.scheduler.stats(), [])
+
+    def test_slow_runs_do_not_overlap_and_missed_slots_are_skipped(self):
+        active = []
+        peak = []
+
+        def slow():
+            active.append(1)
+            peak.append(len(active))
+            time.sleep(0.15)
+            active.pop()
+
+        task = self.schedule(slow, 0.03)
+        self.assertTrue(wait_for(lambda: task.runs >= 2))
+        self.assertEqual(max(peak), 1)
+        self.assertGreater(task.skipped, 0)
+
+    def test_catchup_runs_missed_slots(self):
+        release = threading.Event()
+        calls = []
+
+        def job():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                release.wait(2)
+
+        task = self.schedule(job, 0.05, missed="catchup")
+        time.sleep(0.3)
+        release.set()
+        self.assertTrue(wait_for(lambda: task.runs >= 5))
+        self.assertEqual(task.skipped, 0)
+
+    def test_backoff_delays_retries_after_failures(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        task = self.schedule(fail, 0.02, backoff=4, max_backoff=10)
+        self.assertTrue(wait_for(lambda: task.runs >= 2))
+        time.sleep(0.3)
+        # 0.02 * 4 ** 2 = 0.32s before the third attempt
+        self.assertEqual(task.runs, 2)
+        self.assertEqual(task.consecutive_failures, 2)
+        self.assertEqual(task.stats()["last_error"], "boom")
+        self.assertEqual(len(self.errors), 2)
+
+    def test_run_now_skips_the_wait(self):
+        task = self.schedule(lambda: None, 60, delay=60)
+        time.sleep(0.05)
+        self.assertEqual(task.runs, 0)
+        task.run_now()
+        self.assertTrue(wait_for(lambda: task.runs == 1, timeout=1))
+        self.assertGreater(task.stats()["next_in"], 50)
+
+    def test_full_pool_starts_extra_threads_and_reports_it(self):
+        release = threading.Event()
+        saturated = []
+        scheduler = Scheduler(
+            workers=1, name="tiny-scheduler",
+            on_saturated=lambda task, workers: saturated.append((task.name, workers)),
+        )
+        try:
+            scheduler.schedule(release.wait, 60, name="hung")
+            self.assertTrue(wait_for(lambda: scheduler._busy == 1))
+            quick = scheduler.schedule(lambda: None, 0.02, name="quick")
+            self.assertTrue(wait_for(lambda: quick.runs >= 3))
+            self.assertEqual(saturated, [("quick", 1)])
+            self.assertGreaterEqual(scheduler.overflows, 3)
+        finally:
+            release.set()
+            scheduler.stop()
+
+    def test_dedicated_tasks_never_use_the_pool(self):
+        threads = []
+        task = self.schedule(
+            lambda: threads.append(threading.current_thread().name), 0.02,
+            name="slow", dedicated=True,
+        )
+        self.assertTrue(wait_for(lambda: task.runs >= 2))
+        self.assertTrue(all(name == "test-scheduler-slow" for name in threads))
+        self.assertEqual(self.scheduler.overflows, 0)
+        self.assertTrue(task.stats()["dedicated"])
+
+
+class RunnerScheduleTests(unittest.TestCase):
+    def setUp(self):
+        self.gw = Gateway()
+
+    def tearDown(self):
+        self.gw._scheduler.stop()
+        self.gw._event_loop.stop()
+
+    def test_every_returns_a_cancellable_task(self):
+        calls = []
+        task = self.gw.every(calls.append, "tick", interval=0.02)
+        try:
+            self.assertIn(task, self.gw._async_threads)
+            self.assertTrue(wait_for(lambda: len(calls) >= 2))
+            self.assertEqual(calls[:2], ["tick", "tick"])
+            self.assertIs(self.gw.child(role="x")._scheduler, self.gw._scheduler)
+        finally:
+            task.cancel()
+        self.assertFalse(task.is_alive())
+
+    def test_setting_a_url_watch_cancels_its_task(self):
+        scheduler = Scheduler()
+        stop = watch_url("http://127.0.0.1:9/", lambda: None, interval=60,
+                         event="up", scheduler=scheduler)
+        self.assertEqual(len(scheduler.stats()), 1)
+        stop.set()
+        self.assertEqual(scheduler.stats(), [])
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
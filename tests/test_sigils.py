@@ -1,7 +1,10 @@
 # file: tests/test_sigils.py
 
+import os
 import unittest
 from gway import Gateway, Sigil, Spool, gw, __
+from gway.structs import IndexedDict
+from gway.sigils import CompiledSigil, compile_sigil
 
 
 class SigilTests(unittest.TestCase):
@@ -229,6 +232,85 @@ class SigilModelFallbackTests(unittest.TestCase):
         self.assertEqual(self.manager.calls, [])
 
 
+class CompiledSigilTests(unittest.TestCase):
+    def test_template_segments(self):
+        compiled = CompiledSigil("Hi [name|Guest], you owe [amount]!")
+        self.assertEqual(
+            [seg if isinstance(seg, str) else seg.key for seg in compiled.segments],
+            ["Hi ", "name", ", you owe ", "amount", "!"],
+        )
+        self.assertEqual(compiled.placeholders[0].fallback_source, "Guest")
+        self.assertEqual(compiled.resolve({"amount": 3}.get), "Hi Guest, you owe 3!")
+
+    def test_compile_sigil_is_cached_by_text(self):
+        self.assertIs(compile_sigil("[a.b] and [c]"), compile_sigil("[a.b] and [c]"))
+        self.assertIsNot(compile_sigil("[a]"), compile_sigil("[b]"))
+
+    def test_nested_and_quoted_placeholders(self):
+        data = {"key": "inner", "inner": "value"}
+        self.assertEqual(compile_sigil("[[key]]").resolve(data.get), "[inner]")
+        self.assertEqual(compile_sigil("x=['lit']").resolve(data.get), "x=lit")
+        self.assertEqual(compile_sigil("%[gw.key]").resolve(data.get), "inner")
+
+    def test_plain_text_returned_unchanged(self):
+        self.assertEqual(compile_sigil("no sigils here").resolve({}.get), "no sigils here")
+
+
+class ResolverIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.saved = dict(gw.context)
+
+    def tearDown(self):
+        gw.context.clear()
+        gw.context.update(self.saved)
+        gw.results.clear()
+        os.environ.pop("GW_INDEX_TEST_KEY", None)
+
+    def test_indexed_dict_tracks_mutations(self):
+        data = IndexedDict({"Alpha-Key": 1})
+        self.assertEqual(data.normalized("alpha_key"), ["Alpha-Key"])
+        version = data.version
+        data["ALPHA_KEY"] = 2
+        del data["Alpha-Key"]
+        data.update(beta=3)
+        self.assertEqual(data.normalized("alpha_key"), ["ALPHA_KEY"])
+        self.assertEqual(data.normalized("beta"), ["beta"])
+        self.assertEqual(data.version, version + 3)
+        data.clear()
+        self.assertEqual(data.normalized("beta"), ())
+
+    def test_indexed_dict_pickles_and_copies(self):
+        import copy
+        import pickle
+
+        gw.context["Pickle-Key"] = {"nested": 1}
+        for clone in (pickle.loads(pickle.dumps(gw.context)), copy.copy(gw.context)):
+            self.assertIsInstance(clone, IndexedDict)
+            self.assertEqual(clone, gw.context)
+            self.assertEqual(clone.normalized("pickle_key"), ["Pickle-Key"])
+
+    def test_find_variant_matches_per_variant_lookup(self):
+        gw.context["some-key"] = "ctx"
+        gw.results.insert("SOME_KEY", "res")
+        # The exact spelling wins before other variants, results before context
+        self.assertEqual(gw.find_variant("some-key"), "ctx")
+        self.assertEqual(gw.find_variant("some_key"), "ctx")
+        self.assertEqual(gw.find_variant("SOME_KEY"), "res")
+        self.assertIsNone(gw.find_variant("missing-key"))
+
+    def test_find_variant_reads_environment_live(self):
+        os.environ["GW_INDEX_TEST_KEY"] = "one"
+        self.assertEqual(gw.find_variant("gw-index-test-key"), "one")
+        os.environ["GW_INDEX_TEST_KEY"] = "two"
+        self.assertEqual(gw.find_variant("gw_index_test_key"), "two")
+
+    def test_sigil_resolves_against_gateway(self):
+        gw.context["plan-user"] = "Ada"
+        self.assertEqual(Sigil("%[plan_user|Guest]").resolve(gw), "Ada")
+        gw.context["INFO"] = IndexedDict({"Display-Name": "Ada L."})
+        self.assertEqual(gw.resolve("[INFO.display_name]"), "Ada L.")
+
+
 class SpoolTests(unittest.TestCase):
     def setUp(self):
         self.mapping = {"A": "apple", "B": "banana", "C": "cucumber"}
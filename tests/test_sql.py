@@ -4,6 +4,9 @@ import unittest
 import tempfile
 import shutil
 import os
+import json
+import sys
+import sqlite3
 import threading
 import time
 from gway import gw
@@ -96,6 +99,55 @@ class SqlTests(unittest.TestCase):
         rows = gw.sql.execute("SELECT count(*) FROM writers", connection=self.conn)
         self.assertEqual(rows[0][0], 10)
 
+    def test_execute_wait_false_returns_future(self):
+        """Fire-and-forget writes return futures and are group-committed."""
+        gw.sql.execute(
+            "CREATE TABLE futures (id INTEGER PRIMARY KEY, v INT)",
+            connection=self.conn
+        )
+        futures = [
+            gw.sql.execute(
+                "INSERT INTO futures (v) VALUES (?)",
+                connection=self.conn, args=(i,), wait=False
+            )
+            for i in range(50)
+        ]
+        for future in futures:
+            self.assertIsNone(future.result(timeout=5))
+        rows = gw.sql.execute("SELECT count(*), sum(v) FROM futures", connection=self.conn)
+        self.assertEqual(tuple(rows[0]), (50, sum(range(50))))
+
+    def test_batched_write_errors_reach_their_waiter(self):
+        """A failing statement in a batch does not affect its neighbours."""
+        gw.sql.execute(
+            "CREATE TABLE uniq (k TEXT PRIMARY KEY)", connection=self.conn
+        )
+        previous = gw.sql.configure_writer()
+        gw.sql.configure_writer(latency=0.05)
+        try:
+            ok1 = gw.sql.execute("INSERT INTO uniq VALUES (?)", args=("a",),
+                                 connection=self.conn, wait=False)
+            dup = gw.sql.execute("INSERT INTO uniq VALUES (?)", args=("a",),
+                                 connection=self.conn, wait=False)
+            ok2 = gw.sql.execute("INSERT INTO uniq VALUES (?)", args=("b",),
+                                 connection=self.conn, wait=False)
+            ok1.result(timeout=5)
+            ok2.result(timeout=5)
+            with self.assertRaises(Exception) as cm:
+                dup.result(timeout=5)
+        finally:
+            gw.sql.configure_writer(**previous)
+        self.assertIn("INSERT INTO uniq", str(cm.exception))
+        rows = gw.sql.execute("SELECT k FROM uniq ORDER BY k", connection=self.conn)
+        self.assertEqual([r[0] for r in rows], ["a", "b"])
+
+    def test_benchmark_execute(self):
+        """benchmark_execute inserts the requested rows."""
+        result = gw.sql.benchmark_execute(2000, datafile="work/test_bench.sqlite")
+        self.assertEqual(result["rows"], 2000)
+        self.assertGreater(result["rows_per_sec"], 0)
+        os.remove(gw.resource("work/test_bench.sqlite"))
+
     def test_load_csv(self):
         """Can load a simple CSV into a table using gw.sql.load_csv."""
         # Write a temp CSV file
@@ -316,5 +368,325 @@ class SqlTests(unittest.TestCase):
 
         os.remove(log_path)
 
+    def test_parse_log_json_lines(self):
+        """JSON log lines are stored field by field without a mask."""
+        log_path = gw.resource("work/test_gw_json.log")
+        entry = {
+            "time": "12:34:56", "level": "INFO", "name": "gw", "func": "wrap",
+            "file": "gateway.py", "line": 10, "msg": "[timed] fetch took 0.250s",
+            "log_id": "abcd", "thread": "1234", "function": "mail_fetch",
+            "duration": 0.25,
+        }
+        with open(log_path, "w", encoding="utf-8") as f:
+            f.write("not json\n")
+            f.write(json.dumps(entry) + "\n")
+
+        stop_event = threading.Event()
+        t = threading.Thread(
+            target=gw.sql.parse_log,
+            kwargs=dict(
+                log_location=log_path,
+                table="gw_json_log",
+                connection=self.conn,
+                start_at_end=False,
+                poll_interval=0.1,
+                stop_event=stop_event,
+                log_format="json",
+            ),
+            daemon=True,
+        )
+        t.start()
+        time.sleep(0.3)
+        stop_event.set()
+        t.join(1)
+
+        rows = gw.sql.execute(
+            "SELECT function, subject, duration, line FROM gw_json_log",
+            connection=self.conn,
+        )
+        self.assertEqual([tuple(row) for row in rows], [("mail_fetch", None, "0.25", "10")])
+
+        os.remove(log_path)
+
+
+class SqlPoolTests(unittest.TestCase):
+    DB_A = "work/test_pool_a.sqlite"
+    DB_B = "work/test_pool_b.sqlite"
+
+    def setUp(self):
+        gw.sql.close_db(all=True)
+        for db in (self.DB_A, self.DB_B):
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(f"{gw.resource(db)}{suffix}"):
+                    os.remove(f"{gw.resource(db)}{suffix}")
+
+    def tearDown(self):
+        gw.sql.close_db(all=True)
+
+    def _stats(self, project):
+        return next(s for s in gw.sql.pool_stats() if s["project"] == project)
+
+    def test_released_connection_is_reused_by_other_threads(self):
+        def work():
+            conn = gw.sql.open_db(self.DB_A, project="pool_reuse")
+            gw.sql.execute("SELECT 1", connection=conn)
+            gw.sql.close_db(self.DB_A, project="pool_reuse")
+
+        for _ in range(5):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+        stats = self._stats("pool_reuse")
+        self.assertEqual(stats["open"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 4)
+
+    def test_pool_is_bounded_and_waits(self):
+        gw.sql.open_db(self.DB_A, project="pool_bound", pool_size=1, pool_timeout=5)
+        acquired = []
+
+        def borrow():
+            conn = gw.sql.open_db(self.DB_A, project="pool_bound")
+            acquired.append(conn)
+            gw.sql.close_db(self.DB_A, project="pool_bound")
+
+        t = threading.Thread(target=borrow)
+        t.start()
+        time.sleep(0.2)
+        self.assertEqual(acquired, [])
+        gw.sql.close_db(self.DB_A, project="pool_bound")
+        t.join(2)
+        self.assertEqual(len(acquired), 1)
+        stats = self._stats("pool_bound")
+        self.assertEqual(stats["open"], 1)
+        self.assertEqual(stats["waits"], 1)
+
+    def test_full_pool_overflows_instead_of_failing(self):
+        gw.sql.open_db(self.DB_A, project="pool_soft", pool_size=1, pool_timeout=0.05)
+        results = []
+
+        def borrow():
+            with gw.sql.open_db(self.DB_A, project="pool_soft") as cur:
+                cur.execute("SELECT 1")
+                results.append(cur.fetchone()[0])
+            gw.sql.close_db(self.DB_A, project="pool_soft")
+
+        t = threading.Thread(target=borrow)
+        t.start()
+        t.join(2)
+        self.assertEqual(results, [1])
+        stats = self._stats("pool_soft")
+        self.assertEqual(stats["overflows"], 1)
+        self.assertEqual(stats["open"], 1)
+
+    def test_live_leases_do_not_make_new_threads_wait(self):
+        hold = threading.Event()
+        opened = []
+
+        def work():
+            gw.sql.open_db(self.DB_A, project="pool_live", pool_size=2)
+            opened.append(True)
+            hold.wait(5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        try:
+            deadline = time.monotonic() + 2
+            while len(opened) < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(opened), 4)
+            stats = self._stats("pool_live")
+            self.assertEqual(stats["waits"], 0)
+            self.assertEqual(stats["overflows"], 2)
+        finally:
+            hold.set()
+            for t in threads:
+                t.join()
+
+    def test_close_db_invalidates_the_handle(self):
+        conn = gw.sql.open_db(self.DB_A, project="pool_invalid")
+        gw.sql.close_db(self.DB_A, project="pool_invalid")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.cursor()
+        again = gw.sql.open_db(self.DB_A, project="pool_invalid")
+        self.assertEqual(gw.sql.execute("SELECT 1", connection=again), [(1,)])
+
+    def test_pragmas_follow_dbopts(self):
+        conn = gw.sql.open_db(self.DB_A, project="pool_pragmas", cache_size=-4000)
+        self.assertEqual(gw.sql.execute("PRAGMA journal_mode", connection=conn)[0][0], "wal")
+        self.assertEqual(gw.sql.execute("PRAGMA synchronous", connection=conn)[0][0], 1)
+        self.assertEqual(gw.sql.execute("PRAGMA cache_size", connection=conn)[0][0], -4000)
+        with self.assertRaises(ValueError):
+            gw.sql.open_db(self.DB_A, project="pool_bad", journal_mode="sideways")
+
+    def test_each_database_gets_its_own_writer(self):
+        threads = {}
+
+        def record(db, project):
+            conn = gw.sql.open_db(db, project=project)
+            gw.sql.execute("CREATE TABLE IF NOT EXISTS t (v TEXT)", connection=conn)
+            gw.sql.execute("INSERT INTO t VALUES (?)", args=(db,), connection=conn)
+            module = sys.modules[gw.sql.execute.__module__]
+            threads[db] = module._writer_for(conn).thread
+            gw.sql.close_db(db, project=project)
+
+        record(self.DB_A, "writer_a")
+        record(self.DB_B, "writer_b")
+        self.assertIsNot(threads[self.DB_A], threads[self.DB_B])
+        self.assertTrue(all(t.is_alive() for t in threads.values()))
+
+    def test_replaced_file_is_not_served_from_pool(self):
+        conn = gw.sql.open_db(self.DB_A, project="pool_stale")
+        gw.sql.execute("CREATE TABLE old (v INT)", connection=conn)
+        gw.sql.close_db(self.DB_A, project="pool_stale")
+        os.remove(gw.resource(self.DB_A))
+
+        conn = gw.sql.open_db(self.DB_A, project="pool_stale")
+        rows = gw.sql.execute(
+            "SELECT name FROM sqlite_master WHERE name='old'", connection=conn
+        )
+        self.assertEqual(rows, [])
+        self.assertEqual(self._stats("pool_stale")["open"], 1)
+
+
+
+class SqlIngestTests(unittest.TestCase):
+    DB = "work/test_ingest.sqlite"
+
+    def setUp(self):
+        gw.sql.close_db(all=True)
+        if os.path.exists(gw.resource(self.DB)):
+            os.remove(gw.resource(self.DB))
+        self.conn = gw.sql.open_db(self.DB, project="ingest")
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        gw.sql.close_db(all=True)
+        shutil.rmtree(self.tmpdir)
+
+    def _columns(self, table):
+        rows = gw.sql.execute(f'PRAGMA table_info("{table}")', connection=self.conn)
+        return {r[1]: r[2] for r in rows}
+
+    def test_types_inferred_over_sample_window(self):
+        with open(os.path.join(self.tmpdir, "nums.csv"), "w", encoding="utf-8") as f:
+            f.write("a,b,c\n1,1,\n2,2.5,x\n")
+            for i in range(50):
+                f.write(f"{i},{i},\n")
+        stats = gw.sql.load_csv(connection=self.conn, folder=self.tmpdir, chunk_size=7)
+        self.assertEqual(self._columns("nums"), {"a": "INTEGER", "b": "REAL", "c": "TEXT"})
+        self.assertEqual(stats[0]["rows"], 52)
+        self.assertGreater(stats[0]["rows_per_sec"], 0)
+        count = gw.sql.execute("SELECT count(*) FROM nums", connection=self.conn)[0][0]
+        self.assertEqual(count, 52)
+
+        gw.sql.load_csv(connection=self.conn, folder=self.tmpdir, sample=1, force=True)
+        self.assertEqual(self._columns("nums")["b"], "INTEGER")
+
+    def test_parallel_workers_load_every_file(self):
+        for sub, name in (("", "one"), ("nested", "two-x")):
+            folder = os.path.join(self.tmpdir, sub)
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"{name}.csv"), "w", encoding="utf-8") as f:
+                f.write("k,v\n")
+                f.writelines(f"{i},v{i}\n" for i in range(200))
+        stats = gw.sql.load_csv(connection=self.conn, folder=self.tmpdir, workers=2)
+        self.assertEqual(sorted(s["table"] for s in stats), ["nested_two_x", "one"])
+        for table in ("one", "nested_two_x"):
+            rows = gw.sql.execute(f'SELECT count(*), max(k) FROM "{table}"', connection=self.conn)
+            self.assertEqual(tuple(rows[0]), (200, 199))
+            self.assertEqual(self._columns(table)["k"], "INTEGER")
+        # Existing tables are skipped unless forced
+        self.assertEqual(gw.sql.load_csv(connection=self.conn, folder=self.tmpdir, workers=2), [])
+
+    def test_excel_is_read_row_by_row(self):
+        import openpyxl
+        from unittest.mock import patch
+        path = os.path.join(self.tmpdir, "book.xlsx")
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Sheet A"
+        ws.append(["n", "when"])
+        ws.append([1, "2024-01-01"])
+        ws.append([2.5, None])
+        wb.save(path)
+
+        with patch("pandas.read_excel", side_effect=AssertionError("whole book read")):
+            stats = gw.sql.load_excel(connection=self.conn, file=path)
+        self.assertEqual(stats[0]["table"], "book_Sheet_A")
+        self.assertEqual(self._columns("book_Sheet_A"), {"n": "REAL", "when": "TEXT"})
+        rows = gw.sql.execute('SELECT n FROM "book_Sheet_A" ORDER BY n', connection=self.conn)
+        self.assertEqual([r[0] for r in rows], [1.0, 2.5])
+
+
+    def test_cdv_load_ignores_changes_between_passes(self):
+        from unittest.mock import patch
+        path = os.path.join(self.tmpdir, "live.cdv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("a:v=1\nb:v=2\na:v=3\n")
+        parse = gw.cdv.parse_records
+        passes = []
+
+        def parse_and_mutate(lines):
+            yield from parse(lines)
+            if not passes:
+                # After the first pass: append a new id, then compact the file.
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("c:v=4\n")
+                replacement = path + ".new"
+                with open(replacement, "w", encoding="utf-8") as f:
+                    f.write("z:v=9\n")
+                os.replace(replacement, path)
+            passes.append(True)
+
+        with patch.object(gw.cdv, "parse_records", parse_and_mutate):
+            gw.sql.load_cdv(connection=self.conn, file=path)
+        rows = gw.sql.execute("SELECT id, v FROM live ORDER BY id", connection=self.conn)
+        self.assertEqual([tuple(r) for r in rows], [("a", 3), ("b", 2)])
+
+    def test_autoload_reingests_only_changed_sources(self):
+        from unittest.mock import patch
+        module = sys.modules[gw.sql.execute.__module__]
+        first = os.path.join(self.tmpdir, "first.csv")
+        second = os.path.join(self.tmpdir, "second.cdv")
+        with open(first, "w", encoding="utf-8") as f:
+            f.write("a\n1\n")
+        with open(second, "w", encoding="utf-8") as f:
+            f.write("x:v=1\n")
+
+        summary = gw.sql.autoload(connection=self.conn, folder=self.tmpdir)
+        self.assertEqual(sorted(s["table"] for s in summary["loaded"]), ["first", "second"])
+
+        with patch.object(module, "_file_hash", side_effect=AssertionError("hashed")):
+            summary = gw.sql.autoload(connection=self.conn, folder=self.tmpdir)
+        self.assertEqual((summary["loaded"], summary["unchanged"]), ([], 2))
+
+        with open(first, "w", encoding="utf-8") as f:
+            f.write("a\n1\n2\n")
+        stamp = time.time() + 5
+        os.utime(first, (stamp, stamp))
+        os.remove(second)
+        summary = gw.sql.autoload(connection=self.conn, folder=self.tmpdir)
+        self.assertEqual([s["table"] for s in summary["loaded"]], ["first"])
+        self.assertEqual(summary["removed"], ["second"])
+        self.assertEqual(
+            gw.sql.execute("SELECT count(*) FROM first", connection=self.conn)[0][0], 2
+        )
+        tables = {r[0] for r in gw.sql.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'", connection=self.conn)}
+        self.assertNotIn("second", tables)
+
+    def test_autoload_touched_but_identical_file_is_not_reloaded(self):
+        path = os.path.join(self.tmpdir, "same.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("a\n1\n")
+        gw.sql.autoload(connection=self.conn, folder=self.tmpdir)
+        stamp = time.time() + 5
+        os.utime(path, (stamp, stamp))
+        summary = gw.sql.autoload(connection=self.conn, folder=self.tmpdir)
+        self.assertEqual((summary["loaded"], summary["unchanged"]), ([], 1))
+
+
 if __name__ == "__main__":
     unittest.main()
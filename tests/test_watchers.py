@@ -0,0 +1,90 @@
+# tests/test_watchers.py
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from gway.watchers import inotify_available, watch_paths
+
+
+class WatchPathsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.file = os.path.join(self.root, "lock.txt")
+        with open(self.file, "w") as f:
+            f.write("one")
+        self.watches = []
+
+    def tearDown(self):
+        for watch in self.watches:
+            watch.set()
+            watch.thread.join(1)
+        self.tmp.cleanup()
+
+    def watch(self, paths, **kwargs):
+        batches = []
+        fired = threading.Event()
+
+        def handler(changed):
+            batches.append(changed)
+            fired.set()
+            return False
+
+        self.watches.append(watch_paths(paths, handler, **kwargs))
+        return batches, fired
+
+    def _new_nested_file_is_reported(self, backend):
+        batches, fired = self.watch([self.root], backend=backend, interval=0.05)
+        nested = os.path.join(self.root, "a", "b")
+        os.makedirs(nested)
+        target = os.path.join(nested, "new.txt")
+        with open(target, "w") as f:
+            f.write("x")
+        self.assertTrue(fired.wait(2))
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and not any(target in b for b in batches):
+            time.sleep(0.01)
+        self.assertTrue(any(target in b for b in batches))
+
+    @unittest.skipUnless(inotify_available(), "inotify is Linux only")
+    def test_inotify_reports_files_in_new_subdirectories(self):
+        self._new_nested_file_is_reported("inotify")
+        self.assertEqual(self.watches[0].backend, "inotify")
+
+    def test_polling_reports_files_in_new_subdirectories(self):
+        self._new_nested_file_is_reported("poll")
+
+    def test_hash_mode_ignores_touch_without_edit(self):
+        _, fired = self.watch([self.file], hash=True, interval=0.05)
+        stamp = time.time() + 5
+        os.utime(self.file, (stamp, stamp))
+        self.assertFalse(fired.wait(0.3))
+        with open(self.file, "w") as f:
+            f.write("two")
+        self.assertTrue(fired.wait(2))
+
+    def test_file_created_after_start_sets_the_baseline(self):
+        late = os.path.join(self.root, "late.txt")
+        _, fired = self.watch([late], interval=0.05)
+        with open(late, "w") as f:
+            f.write("first")
+        self.assertFalse(fired.wait(0.3))
+        with open(late, "a") as f:
+            f.write(" and more")
+        self.assertTrue(fired.wait(2))
+
+    def test_handler_returning_true_ends_the_watch(self):
+        watch = watch_paths([self.file], lambda changed: True, interval=0.05)
+        self.watches.append(watch)
+        with open(self.file, "w") as f:
+            f.write("changed")
+        watch.thread.join(2)
+        self.assertFalse(watch.thread.is_alive())
+        self.assertTrue(watch.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()